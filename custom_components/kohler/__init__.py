@@ -25,6 +25,14 @@ from .const import (
 )
 from .coordinator import KohlerDataUpdateCoordinator
 from .entity_helpers import build_outlet_descriptors, normalize_mac_address
+from .http_api import async_setup_http_api
+from .performance import profile_from_options
+from .push import async_setup_push, async_unload_push
+from .services import async_setup_services
+from .transport import async_drop_request_budget, async_get_probe
+from .sessions import async_get_sessions_store
+from .usage import async_get_usage_store
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,6 +67,10 @@ CONFIG_SCHEMA = vol.Schema(
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Kohler component."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    async_setup_http_api(hass)
+
     if DOMAIN not in config:
         return True
 
@@ -86,9 +98,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return False
 
     host: str = entry.data.get(CONF_HOST)
-    api = Kohler(kohler_host=host, timeout=10.0)
+    api = Kohler(
+        kohler_host=host,
+        timeout=profile_from_options(entry.options).request_timeout,
+    )
 
     coordinator = KohlerDataUpdateCoordinator(hass, api=api, conf=entry)
+    coordinator.async_seed_values(async_get_probe(hass, host, pop=True))
+    await coordinator.async_load_usage()
+    await coordinator.async_load_sessions()
 
     try:
         await coordinator.async_config_entry_first_refresh()
@@ -117,15 +135,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _async_update_outlet_entity_names(hass, entry, coordinator)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_setup_push(hass, entry, coordinator)
 
     async def _async_delayed_refresh(_now):
         await coordinator.async_request_refresh()
 
     async_call_later(hass, 2, _async_delayed_refresh)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options or host to the running coordinator without reloading."""
+    coordinator: KohlerDataUpdateCoordinator | None = hass.data.get(DATA_KOHLER)
+    if coordinator is None:
+        return
+
+    coordinator.async_apply_profile(profile_from_options(entry.options))
+    async_setup_push(hass, entry, coordinator)
+
+    host: str = entry.data[CONF_HOST]
+    if host == coordinator.host:
+        return
+
+    coordinator.async_set_host(host)
+    normalized_mac = normalize_mac_address(coordinator.macAddress())
+    device_registry = dr.async_get(hass)
+    if normalized_mac is not None and (
+        device := device_registry.async_get_device(
+            identifiers={(DOMAIN, normalized_mac)}
+        )
+    ):
+        device_registry.async_update_device(
+            device.id, configuration_url=f"http://{host}"
+        )
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate older config entries and entity IDs."""
     if entry.version > 3:
@@ -226,7 +273,14 @@ def _async_update_outlet_entity_names(
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    async_unload_push(hass, entry)
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        if DATA_KOHLER in hass.data:
-            hass.data.pop(DATA_KOHLER)
+        if (coordinator := hass.data.pop(DATA_KOHLER, None)) is not None:
+            async_drop_request_budget(hass, coordinator.host)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the learned usage pattern and session history with the entry."""
+    await async_get_usage_store(hass, entry.entry_id).async_remove()
+    await async_get_sessions_store(hass, entry.entry_id).async_remove()
@@ -58,8 +58,9 @@ class KohlerMassageButton(KohlerButton):
 
     async def async_press(self) -> None:
         """Press the button."""
-        await self.coordinator.massage_toggle()
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace("button.massage_toggle", self.entity_id):
+            await self.coordinator.massage_toggle()
+            await self.coordinator.async_request_post_command_refresh()
 
 
 class KohlerSyncTimeButton(KohlerButton):
@@ -72,8 +73,9 @@ class KohlerSyncTimeButton(KohlerButton):
 
     async def async_press(self) -> None:
         """Press the button."""
-        await self.coordinator.sync_time()
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace("button.sync_time", self.entity_id):
+            await self.coordinator.sync_time()
+            await self.coordinator.async_request_post_command_refresh()
 
 
 class KohlerResetControllerFaultsButton(KohlerButton):
@@ -88,8 +90,11 @@ class KohlerResetControllerFaultsButton(KohlerButton):
 
     async def async_press(self) -> None:
         """Press the button."""
-        await self.coordinator.reset_controller_faults()
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "button.reset_controller_faults", self.entity_id
+        ):
+            await self.coordinator.reset_controller_faults()
+            await self.coordinator.async_request_post_command_refresh()
 
 
 class KohlerResetKonnectFaultsButton(KohlerButton):
@@ -102,8 +107,11 @@ class KohlerResetKonnectFaultsButton(KohlerButton):
 
     async def async_press(self) -> None:
         """Press the button."""
-        await self.coordinator.reset_konnect_faults()
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "button.reset_konnect_faults", self.entity_id
+        ):
+            await self.coordinator.reset_konnect_faults()
+            await self.coordinator.async_request_post_command_refresh()
 
 
 class KohlerCheckUpdatesButton(KohlerButton):
@@ -116,5 +124,6 @@ class KohlerCheckUpdatesButton(KohlerButton):
 
     async def async_press(self) -> None:
         """Press the button."""
-        await self.coordinator.check_updates()
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace("button.check_updates", self.entity_id):
+            await self.coordinator.check_updates()
+            await self.coordinator.async_request_post_command_refresh()
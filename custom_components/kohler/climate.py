@@ -106,9 +106,14 @@ class KohlerThermostat(CoordinatorEntity, ClimateEntity):
     async def async_set_temperature(self, **kwargs):
         """Set new target temperatures."""
         temp = kwargs.get(ATTR_TEMPERATURE)
-        if temp is not None:
-            await self.coordinator.setTargetTemperature(temp)
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "climate.set_temperature",
+            self.entity_id,
+            expect=lambda: self.coordinator.getTargetTemperature() == temp,
+        ):
+            if temp is not None:
+                await self.coordinator.setTargetTemperature(temp)
+            await self.coordinator.async_request_post_command_refresh()
 
     @property
     def min_temp(self):
@@ -154,19 +159,35 @@ class KohlerThermostat(CoordinatorEntity, ClimateEntity):
     async def async_set_hvac_mode(self, mode):
         """Set operation mode."""
         self._hvac_mode = mode
-        if mode == HVACMode.OFF:
-            await self.coordinator.turnOffShower()
-        else:
-            await self.coordinator.turnOnShower(self.coordinator.getTargetTemperature())
-        await self.coordinator.async_request_post_command_refresh()
+        shower_on = mode != HVACMode.OFF
+        with self.coordinator.tracer.trace(
+            "climate.set_hvac_mode",
+            self.entity_id,
+            expect=lambda: self.coordinator.isShowerOn() == shower_on,
+        ):
+            if not shower_on:
+                await self.coordinator.turnOffShower()
+            else:
+                await self.coordinator.turnOnShower(
+                    self.coordinator.getTargetTemperature()
+                )
+            await self.coordinator.async_request_post_command_refresh()
 
     async def async_turn_on(self):
-        await self.coordinator.turnOnShower(self.coordinator.getTargetTemperature())
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "climate.turn_on", self.entity_id, expect=self.coordinator.isShowerOn
+        ):
+            await self.coordinator.turnOnShower(self.coordinator.getTargetTemperature())
+            await self.coordinator.async_request_post_command_refresh()
 
     async def async_turn_off(self):
-        await self.coordinator.turnOffShower()
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "climate.turn_off",
+            self.entity_id,
+            expect=lambda: not self.coordinator.isShowerOn(),
+        ):
+            await self.coordinator.turnOffShower()
+            await self.coordinator.async_request_post_command_refresh()
 
     @property
     def icon(self):
@@ -3,24 +3,58 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import ipaddress
 import logging
+import secrets
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST
+from homeassistant.components import webhook
+from homeassistant.const import CONF_HOST, CONF_WEBHOOK_ID
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.network import NoURLAvailableError
 from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
 
 from kohler import Kohler, KohlerError
 
-from .const import CONF_ACCEPT_LIABILITY_TERMS, DOMAIN
+from .const import (
+    CONF_ACCEPT_LIABILITY_TERMS,
+    CONF_FRESHNESS_SLA,
+    CONF_HEDGE_READS,
+    CONF_PERFORMANCE_PROFILE,
+    CONF_PHASE_LOCK,
+    CONF_PREDICTIVE_POLLING,
+    CONF_PUSH_INGEST,
+    CONF_PUSH_SECRET,
+    DOMAIN,
+)
 from .entity_helpers import normalize_mac_address
+from .performance import (
+    PROFILE_BALANCED,
+    PROFILE_CUSTOM,
+    PROFILES,
+    PerformanceProfile,
+    profile_from_options,
+)
+from .transport import (
+    TIMEOUT_FLOOR_SECONDS,
+    async_cache_probe,
+    async_get_probe,
+    async_get_request_budget,
+)
 
 _LOGGER = logging.getLogger(__package__)
 
+SCAN_CONCURRENCY = 64
+SCAN_MAX_HOSTS = 1024
+SCAN_CONNECT_TIMEOUT_SECONDS = 0.75
+SCAN_PROBE_TIMEOUT_SECONDS = 3.0
+
 
 class KohlerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a Kohler config flow."""
@@ -30,6 +64,15 @@ class KohlerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         """Initialize the config flow."""
         self._discovered_host: str | None = None
+        self._scan_results: dict[str, str] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> KohlerOptionsFlowHandler:
+        """Return the options flow handler."""
+        return KohlerOptionsFlowHandler()
 
     async def async_step_user(self, user_input: dict | None = None) -> FlowResult:
         """Handle a flow initialized by the user."""
@@ -46,6 +89,15 @@ class KohlerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
             if not user_input[CONF_ACCEPT_LIABILITY_TERMS]:
                 errors[CONF_ACCEPT_LIABILITY_TERMS] = "accept_terms"
+            elif "/" in host:
+                network = _parse_scan_network(host)
+                if network is None:
+                    errors[CONF_HOST] = "invalid_network"
+                else:
+                    self._scan_results = await self._async_scan_network(network)
+                    if self._scan_results:
+                        return await self.async_step_scan()
+                    errors[CONF_HOST] = "no_devices_found"
             else:
                 unique_id = await self.test_connection(host)
                 if unique_id is None:
@@ -54,7 +106,7 @@ class KohlerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     await self.async_set_unique_id(unique_id, raise_on_progress=False)
                     self._abort_if_unique_id_configured(
                         updates=user_input,
-                        reload_on_update=True,
+                        reload_on_update=False,
                     )
                     return self.async_create_entry(title=host, data=user_input)
 
@@ -69,6 +121,68 @@ class KohlerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_scan(self, user_input: dict | None = None) -> FlowResult:
+        """Let the user pick a controller found by scanning a network range."""
+        if user_input is not None:
+            host = user_input[CONF_HOST]
+            await self.async_set_unique_id(
+                self._scan_results[host], raise_on_progress=False
+            )
+            self._abort_if_unique_id_configured(
+                updates={CONF_HOST: host},
+                reload_on_update=False,
+            )
+            return self.async_create_entry(
+                title=host,
+                data={CONF_HOST: host, CONF_ACCEPT_LIABILITY_TERMS: True},
+            )
+
+        controllers = {
+            host: f"{host} ({mac})" for host, mac in self._scan_results.items()
+        }
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=vol.Schema({vol.Required(CONF_HOST): vol.In(controllers)}),
+        )
+
+    async def _async_scan_network(
+        self, network: ipaddress.IPv4Network
+    ) -> dict[str, str]:
+        """Probe every host in a network concurrently and return controller MACs."""
+        semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+        configured = self._async_current_ids()
+
+        async def _async_probe(host: str) -> tuple[str, str | None]:
+            async with semaphore:
+                if not await _async_port_open(host):
+                    return host, None
+                try:
+                    mac = await self._async_probe_mac(
+                        host,
+                        client_timeout=SCAN_PROBE_TIMEOUT_SECONDS,
+                        timeout=SCAN_PROBE_TIMEOUT_SECONDS,
+                        budgeted=False,
+                    )
+                except (KohlerError, OSError, ValueError) as ex:
+                    _LOGGER.debug("%s is not a Kohler DTV+: %s", host, ex)
+                    return host, None
+                return host, mac
+
+        # One misbehaving host shouldn't abort the whole scan.
+        results = await asyncio.gather(
+            *(_async_probe(str(address)) for address in network.hosts()),
+            return_exceptions=True,
+        )
+        controllers: dict[str, str] = {}
+        for result in results:
+            if isinstance(result, BaseException):
+                _LOGGER.debug("Error probing for a Kohler DTV+: %r", result)
+                continue
+            host, mac = result
+            if mac is not None and mac not in configured:
+                controllers[host] = mac
+        return controllers
+
     async def async_step_dhcp(self, discovery_info: DhcpServiceInfo) -> FlowResult:
         """Handle a flow initialized by DHCP discovery."""
         host = discovery_info.ip
@@ -80,7 +194,7 @@ class KohlerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(discovered_mac, raise_on_progress=False)
             self._abort_if_unique_id_configured(
                 updates={CONF_HOST: host},
-                reload_on_update=True,
+                reload_on_update=False,
             )
 
         if await self.test_connection(host) is None:
@@ -101,10 +215,190 @@ class KohlerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     async def test_connection(self, host: str) -> str | None:
         """Test connection to the Kohler device and return its MAC address."""
         try:
-            api = Kohler(kohler_host=host, timeout=5.0)
-            async with asyncio.timeout(10.0):
-                values = await api.values()
-            return normalize_mac_address(values.get("MAC"))
+            return await self._async_probe_mac(host)
         except (KohlerError, OSError, asyncio.TimeoutError) as ex:
             _LOGGER.error("Error connecting to Kohler DTV+ %s", ex)
             return None
+
+    async def _async_probe_mac(
+        self,
+        host: str,
+        client_timeout: float = 5.0,
+        timeout: float = 10.0,
+        budgeted: bool = True,
+    ) -> str | None:
+        """Fetch the controller's values, or reuse a recent probe, for its MAC.
+
+        Network scans pass ``budgeted=False`` so probing hosts that turn out
+        not to be controllers doesn't leave a request budget behind for each.
+        Only controllers' responses are cached.
+        """
+        if (values := async_get_probe(self.hass, host)) is not None:
+            return normalize_mac_address(values.get("MAC"))
+
+        api = Kohler(kohler_host=host, timeout=client_timeout)
+        if budgeted:
+            await async_get_request_budget(self.hass, host).async_acquire()
+        async with asyncio.timeout(timeout):
+            values = await api.values()
+        if not isinstance(values, dict):
+            return None
+        if (mac := normalize_mac_address(values.get("MAC"))) is not None:
+            async_cache_probe(self.hass, host, values)
+        return mac
+
+
+def _parse_scan_network(value: str) -> ipaddress.IPv4Network | None:
+    """Return the IPv4 network to scan, or None if it is invalid or too large."""
+    try:
+        network = ipaddress.ip_network(value.strip(), strict=False)
+    except ValueError:
+        return None
+    if not isinstance(network, ipaddress.IPv4Network):
+        return None
+    if network.num_addresses > SCAN_MAX_HOSTS:
+        return None
+    return network
+
+
+async def _async_port_open(host: str) -> bool:
+    """Return whether the host accepts HTTP connections."""
+    try:
+        async with asyncio.timeout(SCAN_CONNECT_TIMEOUT_SECONDS):
+            _, writer = await asyncio.open_connection(host, 80)
+    except OSError, TimeoutError:
+        return False
+
+    writer.close()
+    with contextlib.suppress(OSError):
+        await writer.wait_closed()
+    return True
+
+
+class KohlerOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Kohler options."""
+
+    def __init__(self) -> None:
+        """Initialize the options flow."""
+        self._options: dict = {}
+
+    async def async_step_init(self, user_input: dict | None = None) -> FlowResult:
+        """Manage the Kohler options."""
+        options = self.config_entry.options
+        if user_input is not None:
+            self._options = user_input
+            if user_input[CONF_PERFORMANCE_PROFILE] == PROFILE_CUSTOM:
+                return await self.async_step_performance()
+            return await self._async_finish()
+
+        data_schema = {
+            vol.Optional(
+                CONF_FRESHNESS_SLA,
+                default=options.get(CONF_FRESHNESS_SLA, 0),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            vol.Optional(
+                CONF_HEDGE_READS,
+                default=options.get(CONF_HEDGE_READS, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_PREDICTIVE_POLLING,
+                default=options.get(CONF_PREDICTIVE_POLLING, True),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_PHASE_LOCK,
+                default=options.get(CONF_PHASE_LOCK, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_PERFORMANCE_PROFILE,
+                default=options.get(CONF_PERFORMANCE_PROFILE, PROFILE_BALANCED),
+            ): vol.In([*PROFILES, PROFILE_CUSTOM]),
+            vol.Optional(
+                CONF_PUSH_INGEST,
+                default=options.get(CONF_PUSH_INGEST, False),
+            ): cv.boolean,
+        }
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(data_schema),
+        )
+
+    async def async_step_performance(
+        self, user_input: dict | None = None
+    ) -> FlowResult:
+        """Manage the custom performance profile."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if user_input["active_interval"] > user_input["idle_interval"]:
+                errors["active_interval"] = "active_interval_too_long"
+            else:
+                self._options = {**self._options, **user_input}
+                return await self._async_finish()
+
+        if user_input is not None:
+            current = PerformanceProfile(**user_input)
+        else:
+            current = profile_from_options(self.config_entry.options)
+        data_schema = {
+            vol.Required("idle_interval", default=current.idle_interval): _seconds(
+                5, 3600
+            ),
+            vol.Required("active_interval", default=current.active_interval): _seconds(
+                1, 600
+            ),
+            vol.Required("active_tail", default=current.active_tail): _seconds(0, 3600),
+            vol.Required(
+                "quick_shower_debounce", default=current.quick_shower_debounce
+            ): _seconds(0, 5),
+            vol.Required(
+                "post_command_refresh_delay",
+                default=current.post_command_refresh_delay,
+            ): _seconds(0, 30),
+            vol.Required("request_timeout", default=current.request_timeout): _seconds(
+                TIMEOUT_FLOOR_SECONDS, 60
+            ),
+        }
+
+        return self.async_show_form(
+            step_id="performance",
+            data_schema=vol.Schema(data_schema),
+            errors=errors,
+        )
+
+    async def async_step_push(self, user_input: dict | None = None) -> FlowResult:
+        """Show where a relay should push snapshots and the key to sign them."""
+        if user_input is not None:
+            return self.async_create_entry(data=self._options)
+
+        webhook_id = self._options[CONF_WEBHOOK_ID]
+        try:
+            webhook_url = webhook.async_generate_url(self.hass, webhook_id)
+        except NoURLAvailableError:
+            webhook_url = webhook.async_generate_path(webhook_id)
+        return self.async_show_form(
+            step_id="push",
+            description_placeholders={
+                "webhook_url": webhook_url,
+                "secret": self._options[CONF_PUSH_SECRET],
+            },
+        )
+
+    async def _async_finish(self) -> FlowResult:
+        """Save the options, first showing the push webhook if it is enabled."""
+        # Keep the webhook and key stable, even while push is turned off, so
+        # the relay doesn't need updating.
+        options = self.config_entry.options
+        for key in (CONF_WEBHOOK_ID, CONF_PUSH_SECRET):
+            if options.get(key):
+                self._options[key] = options[key]
+        if not self._options.get(CONF_PUSH_INGEST):
+            return self.async_create_entry(data=self._options)
+
+        self._options.setdefault(CONF_WEBHOOK_ID, webhook.async_generate_id())
+        self._options.setdefault(CONF_PUSH_SECRET, secrets.token_hex(32))
+        return await self.async_step_push()
+
+
+def _seconds(minimum: float, maximum: float) -> vol.All:
+    """Return a validator for a duration option in seconds."""
+    return vol.All(vol.Coerce(float), vol.Range(min=minimum, max=maximum))
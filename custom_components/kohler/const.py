@@ -1,9 +1,27 @@
 """Kohler CONSTANTS"""
 
 CONF_ACCEPT_LIABILITY_TERMS = "accept_liability_terms"
+CONF_FRESHNESS_SLA = "freshness_sla"
+CONF_HEDGE_READS = "hedge_reads"
+CONF_PERFORMANCE_PROFILE = "performance_profile"
+CONF_PHASE_LOCK = "phase_lock"
+CONF_PREDICTIVE_POLLING = "predictive_polling"
+CONF_PUSH_INGEST = "push_ingest"
+CONF_PUSH_SECRET = "push_secret"
 
 DOMAIN = "kohler"
 DATA_KOHLER = "kohler"
+DATA_PROBE_CACHE = "kohler_probe_cache"
+DATA_PUSH_WEBHOOKS = "kohler_push_webhooks"
+DATA_REQUEST_BUDGETS = "kohler_request_budgets"
+EVENT_HOT_WATER_READY = "kohler_hot_water_ready"
+EVENT_KOHLER = "kohler_event"
 MANUFACTURER = "Kohler"
 MODEL = "K-99695"
 DEFAULT_NAME = "Kohler DTV+"
+
+SERVICE_GET_STATE = "get_state"
+SERVICE_MEMORY_SNAPSHOT = "memory_snapshot"
+SERVICE_PROFILE = "profile"
+
+WS_TYPE_SUBSCRIBE = "kohler/subscribe"
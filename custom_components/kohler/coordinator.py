@@ -1,42 +1,92 @@
 """DataUpdateCoordinator for the Kohler integration."""
 
 import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+import contextlib
 from dataclasses import dataclass
 import functools
 import logging
 import time
 from datetime import datetime, timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_DEVICE_ID, CONF_HOST, CONF_TYPE, UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
 from homeassistant.util import dt as dt_util
 
 from kohler import Kohler, KohlerError
 
+from .const import (
+    CONF_FRESHNESS_SLA,
+    CONF_HEDGE_READS,
+    CONF_PHASE_LOCK,
+    CONF_PREDICTIVE_POLLING,
+    DOMAIN,
+    EVENT_HOT_WATER_READY,
+    EVENT_KOHLER,
+)
 from .entity_helpers import (
     DEFAULT_DATE_FORMAT,
     DEFAULT_TIME_FORMAT,
+    build_outlet_descriptors,
     format_kohler_datetime,
+    normalize_mac_address,
     translate_auto_purge_setting,
     translate_cold_water_setting,
     translate_connection_status,
     translate_max_run_time_setting,
 )
+from .events import TYPE_HOT_WATER_READY, EventSnapshot, diff_snapshots
+from .freshness import FreshnessTracker
+from .lifecycle import WARM_UP_POLL_INTERVAL_SECONDS, ShowerLifecycle
+from .metrics import POLL_ENDPOINT, ApiMetrics, LoopBudgetMonitor
+from .performance import PerformanceProfile, profile_from_options
+from .sessions import (
+    SESSION_SAVE_DELAY_SECONDS,
+    SessionTracker,
+    async_get_sessions_store,
+)
+from .tracing import (
+    CommandTrace,
+    CommandTracer,
+    active_traces,
+    mark_command_done,
+    record_span,
+    use_traces,
+)
+from .transport import (
+    DECODE_EXECUTOR_THRESHOLD_BYTES,
+    IDEMPOTENT_ENDPOINTS,
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    RETRY_ATTEMPTS,
+    RETRY_BUDGET_SECONDS,
+    AdaptiveTimeouts,
+    HostResolver,
+    SingleFlight,
+    async_drop_request_budget,
+    async_get_request_budget,
+    decode_text_payload,
+    payload_fingerprint,
+    retry_delay,
+)
+from .usage import SAVE_DELAY_SECONDS, UsageHistogram, async_get_usage_store
 
 
 def api_command(func):
-    """Wrap an API command with a timeout and error handling."""
+    """Wrap an API command with the API lock and error handling."""
 
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
         try:
             coordinator = args[0]
-            async with coordinator._api_lock:
-                async with asyncio.timeout(10.0):
-                    return await func(*args, **kwargs)
+            async with coordinator._async_hold_api_lock():
+                return await func(*args, **kwargs)
         except asyncio.TimeoutError as err:
             raise HomeAssistantError(
                 f"Timeout communicating with Kohler API: {err}"
@@ -56,8 +106,18 @@ def api_command(func):
 _LOGGER = logging.getLogger(__name__)
 
 DATE_TIME_SETTING_INDEX = 2
-QUICK_SHOWER_DEBOUNCE_SECONDS = 0.35
-POST_COMMAND_REFRESH_DELAY_SECONDS = 1.0
+# While a relay pushes snapshots, poll this rarely. Polling resumes its normal
+# interval once no push has arrived for this long.
+PUSH_FALLBACK_INTERVAL_SECONDS = 120.0
+READ_ENDPOINTS = frozenset(
+    {"values", "system_info", "controller_error_logs", "konnect_error_logs"}
+)
+# Endpoint -> key of its response in fingerprints and the coordinator data.
+FINGERPRINT_KEYS = {"values": "values", "system_info": "sysInfo"}
+# Only fetched by the poll, which holds the API lock, so they get one quick
+# retry for a dropped packet instead of the full backoff that commands get.
+POLLED_ENDPOINTS = frozenset({"values", "system_info"})
+POLL_RETRY_ATTEMPTS = 2
 
 
 @dataclass(slots=True)
@@ -76,12 +136,13 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
 
     def __init__(self, hass: HomeAssistant, api: Kohler, conf: ConfigEntry):
         """Init Kohler data object."""
+        profile = profile_from_options(conf.options)
         super().__init__(
             hass,
             _LOGGER,
             name="Kohler Data Coordinator",
-            update_interval=timedelta(seconds=15),
-            always_update=True,
+            update_interval=timedelta(seconds=profile.idle_interval),
+            always_update=False,
         )
         self.api = api
         self.config_entry = conf
@@ -95,35 +156,684 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
         self._pending_quick_shower: QuickShowerState | None = None
         self._pending_quick_shower_task: asyncio.Task[None] | None = None
         self._pending_quick_shower_waiters: list[asyncio.Future[None]] = []
+        self._pending_quick_shower_traces: list[tuple[CommandTrace, float]] = []
         self._post_command_refresh_task: asyncio.Task[None] | None = None
+        self._max_age_refresh_task: asyncio.Task[None] | None = None
         self._selected_outlet_state: dict[int, int] = {1: 0, 2: 0}
+        self.metrics = ApiMetrics()
+        self.tracer = CommandTracer()
+        self.loop_monitor = LoopBudgetMonitor()
+        self.freshness = FreshnessTracker()
+        self.profile = profile
+        self.usage = UsageHistogram()
+        self._usage_store = async_get_usage_store(hass, conf.entry_id)
+        self.sessions = SessionTracker()
+        self._sessions_store = async_get_sessions_store(hass, conf.entry_id)
+        self._shower_was_on: bool | None = None
+        self._phase_period: float | None = None
+        self.lifecycle = ShowerLifecycle()
+        self._last_event_snapshot: EventSnapshot | None = None
+        self._device_id: str | None = None
+        self._last_push: float | None = None
+        # Relay timestamp of the last accepted push; kept here so replay
+        # protection survives the push webhook being re-registered.
+        self.last_push_timestamp: float | None = None
+        self.timeouts = AdaptiveTimeouts(ceiling=profile.request_timeout)
+        self.host: str = conf.data[CONF_HOST]
+        self.resolver = HostResolver(hass, self.host)
+        self._address = self.host
+        self.budget = async_get_request_budget(hass, self.host)
+        self.reads = SingleFlight()
+        self.fingerprints: dict[str, str] = {}
+        self._payload_sizes: dict[str, int] = {}
+        self._seed_values: dict[str, Any] | None = None
+        self._last_poll_unchanged = False
+        self._freshness_check_unsub: CALLBACK_TYPE | None = None
+        self._poll_listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_add_poll_listener(self, poll_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call back after every poll attempt or push, whether or not data changed."""
+        self._poll_listeners.append(poll_callback)
+
+        @callback
+        def _remove_poll_listener() -> None:
+            if poll_callback in self._poll_listeners:
+                self._poll_listeners.remove(poll_callback)
+
+        return _remove_poll_listener
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh, then call the poll listeners once the outcome is applied.
+
+        Listeners run after ``data`` and ``last_update_success`` are updated,
+        so they see the result of the poll that just finished.
+        """
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            self._async_notify_poll_listeners()
+
+    @callback
+    def _async_notify_poll_listeners(self) -> None:
+        """Call the poll listeners."""
+        for poll_callback in list(self._poll_listeners):
+            poll_callback()
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates and time each listener against the budget."""
+        owner = getattr(update_callback, "__self__", None)
+        name = getattr(owner, "entity_id", None) or getattr(
+            update_callback, "__qualname__", repr(update_callback)
+        )
 
-    async def _async_update_data(self):
-        """Fetch data from API endpoint."""
+        @callback
+        def _timed_update_callback() -> None:
+            started = time.perf_counter()
+            try:
+                update_callback()
+            finally:
+                self.loop_monitor.record_entity(name, time.perf_counter() - started)
+
+        return super().async_add_listener(_timed_update_callback, context)
+
+    async def async_shutdown(self) -> None:
+        """Cancel the freshness check and shut down the coordinator."""
+        self._cancel_freshness_check()
+        await super().async_shutdown()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners and record the total fan-out time."""
+        started = time.perf_counter()
+        try:
+            super().async_update_listeners()
+        finally:
+            self.loop_monitor.record_fanout(time.perf_counter() - started)
+
+    @contextlib.asynccontextmanager
+    async def _async_hold_api_lock(self) -> AsyncIterator[None]:
+        """Hold the API lock and record how long it took to acquire."""
+        started = time.monotonic()
+        async with self._api_lock:
+            acquired = time.monotonic()
+            self.metrics.record_lock_wait(acquired - started)
+            record_span("api_lock_wait", started, acquired)
+            yield
+
+    async def _async_call_api(
+        self,
+        endpoint: str,
+        method: Callable[..., Awaitable[Any]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Call an API endpoint, sharing identical concurrent reads."""
+        if endpoint not in READ_ENDPOINTS:
+            try:
+                return await self._async_call_api_with_retry(
+                    endpoint, method, *args, **kwargs
+                )
+            finally:
+                self.reads.invalidate()
+
+        if args or kwargs:
+            return await self._async_call_api_with_retry(
+                endpoint, method, *args, **kwargs
+            )
+        return await self.reads.async_call(
+            endpoint, lambda: self._async_call_api_with_retry(endpoint, method)
+        )
+
+    async def _async_call_api_with_retry(
+        self,
+        endpoint: str,
+        method: Callable[..., Awaitable[Any]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Call an API endpoint, retrying idempotent operations with jitter.
+
+        Retries share a total deadline of RETRY_BUDGET_SECONDS, including the
+        backoff between attempts.
+        """
+        if endpoint not in IDEMPOTENT_ENDPOINTS:
+            return await self._async_call_api_once(endpoint, method, *args, **kwargs)
+
+        attempts = (
+            POLL_RETRY_ATTEMPTS if endpoint in POLLED_ENDPOINTS else RETRY_ATTEMPTS
+        )
+        attempt = 0
+        async with asyncio.timeout(RETRY_BUDGET_SECONDS):
+            while True:
+                try:
+                    return await self._async_call_api_once(
+                        endpoint, method, *args, **kwargs
+                    )
+                except (KohlerError, OSError) as err:
+                    attempt += 1
+                    if attempt >= attempts:
+                        raise
+                    delay = retry_delay(attempt - 1)
+                    _LOGGER.debug(
+                        "Retrying Kohler %s in %.2fs after error: %r",
+                        endpoint,
+                        delay,
+                        err,
+                    )
+                    self.metrics.record_retry(endpoint)
+                    await asyncio.sleep(delay)
+
+    def _hedge_reads(self) -> bool:
+        """Return whether slow reads should be hedged with a second request."""
+        return bool(self.config_entry.options.get(CONF_HEDGE_READS, False))
+
+    async def _async_hedged_read(
+        self,
+        endpoint: str,
+        method: Callable[..., Awaitable[Any]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a second read if the first is slower than usual; use the first result."""
+        hedge_delay = self.timeouts.hedge_delay(endpoint)
+        primary = asyncio.ensure_future(method(*args, **kwargs))
+        requests = {primary}
         try:
-            async with self._api_lock:
-                async with asyncio.timeout(10):
-                    self._values = await self.api.values()
-                async with asyncio.timeout(10):
-                    self._sysInfo = await self.api.system_info()
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(requests, timeout=hedge_delay)
+                if not done and self.budget.try_acquire(PRIORITY_BACKGROUND):
+                    self.metrics.record_hedge(endpoint)
+                    requests.add(asyncio.ensure_future(method(*args, **kwargs)))
+
+            pending = set(requests)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for request in done:
+                    if request.exception() is None:
+                        return request.result()
+            return primary.result()
+        finally:
+            for request in requests:
+                request.cancel()
+
+    async def _async_call_api_once(
+        self,
+        endpoint: str,
+        method: Callable[..., Awaitable[Any]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Make a single budgeted API request with an adaptive timeout."""
+        read = endpoint in READ_ENDPOINTS
+        await self.budget.async_acquire(
+            PRIORITY_BACKGROUND if read else PRIORITY_COMMAND
+        )
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(self.timeouts.timeout(endpoint)):
+                if read and self._hedge_reads():
+                    result = await self._async_hedged_read(
+                        endpoint, method, *args, **kwargs
+                    )
+                else:
+                    result = await method(*args, **kwargs)
+        except (KohlerError, OSError) as err:
+            failed = time.monotonic()
+            if isinstance(err, TimeoutError):
+                self.timeouts.record_timeout(endpoint)
+            self.metrics.record_failure(endpoint, failed - started, err)
+            record_span(endpoint, started, failed)
+            raise
+        finished = time.monotonic()
+        self.timeouts.record_success(endpoint, finished - started)
+        self.metrics.record_success(endpoint, finished - started)
+        record_span(endpoint, started, finished)
+        if not read:
+            mark_command_done(finished)
+        return result
+
+    async def _async_decode(
+        self,
+        endpoint: str,
+        decode: Callable[[Any], Any],
+        payload: Any,
+        size: int,
+    ) -> Any:
+        """Run a decoding step, in the executor when the payload is large."""
+        offloaded = size > DECODE_EXECUTOR_THRESHOLD_BYTES
+        started = time.perf_counter()
+        if offloaded:
+            result = await self.hass.async_add_executor_job(decode, payload)
+        else:
+            result = decode(payload)
+        self.metrics.record_decode(endpoint, time.perf_counter() - started, offloaded)
+        return result
+
+    async def _async_fingerprint(self, endpoint: str, payload: Any) -> str:
+        """Fingerprint a response, sized by its previous encoding.
+
+        A reused cached response, such as values during warm-up polls, keeps
+        its fingerprint instead of being encoded and hashed again.
+        """
+        key = FINGERPRINT_KEYS[endpoint]
+        cached = self._values if key == "values" else self._sysInfo
+        if payload is cached and (fingerprint := self.fingerprints.get(key)):
+            return fingerprint
+        fingerprint, size = await self._async_decode(
+            endpoint,
+            payload_fingerprint,
+            payload,
+            self._payload_sizes.get(endpoint, 0),
+        )
+        self._payload_sizes[endpoint] = size
+        return fingerprint
+
+    async def async_get_error_log(self, endpoint: str) -> Any:
+        """Fetch and decode the controller or Konnect error log."""
+        method = (
+            self.api.controller_error_logs
+            if endpoint == "controller_error_logs"
+            else self.api.konnect_error_logs
+        )
+        payload = await self._async_call_api(endpoint, method)
+        if not isinstance(payload, str | bytes):
+            return payload
+        return await self._async_decode(
+            endpoint, decode_text_payload, payload, len(payload)
+        )
+
+    @callback
+    def async_seed_values(self, values: dict[str, Any] | None) -> None:
+        """Use a recent values() response for the next poll instead of fetching it."""
+        self._seed_values = values
+
+    @callback
+    def async_set_host(self, host: str) -> None:
+        """Point the coordinator at a controller's new host without a reload."""
+        if host == self.host:
+            return
+
+        _LOGGER.info("Kohler controller moved from %s to %s", self.host, host)
+        async_drop_request_budget(self.hass, self.host)
+        self.host = host
+        self.resolver = HostResolver(self.hass, host)
+        self.budget = async_get_request_budget(self.hass, host)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    async def _async_update_address(self) -> None:
+        """Retarget the API client when the host resolves to a new address."""
+        address = await self.resolver.async_resolve()
+        if address == self._address:
+            return
+
+        _LOGGER.debug("Kohler API now using %s for %s", address, self.host)
+        self._address = address
+        self.api = Kohler(kohler_host=address, timeout=self.profile.request_timeout)
+        self.reads.invalidate()
+
+    @callback
+    def async_apply_profile(self, profile: PerformanceProfile) -> None:
+        """Switch to a new performance profile without a reload."""
+        if profile == self.profile:
+            return
+
+        _LOGGER.debug("Kohler coordinator applying %s", profile)
+        self.profile = profile
+        self._phase_period = None
+        self.timeouts.ceiling = profile.request_timeout
+        self.api = Kohler(kohler_host=self._address, timeout=profile.request_timeout)
+        self.update_interval = self._poll_interval()
+        self._schedule_refresh()
+
+    def _poll_interval(self) -> timedelta:
+        """Return the poll interval for the current shower state and profile."""
+        profile = self.profile
+        if self.push_active():
+            return timedelta(seconds=PUSH_FALLBACK_INTERVAL_SECONDS)
+        if self.lifecycle.purging:
+            return timedelta(seconds=WARM_UP_POLL_INTERVAL_SECONDS)
+        if (
+            self.isShowerOn()
+            or time.time() - self._last_shower_on_time < profile.active_tail
+        ):
+            return timedelta(seconds=profile.active_interval)
+        if self.config_entry.options.get(CONF_PREDICTIVE_POLLING, True):
+            return timedelta(
+                seconds=self.usage.suggest_interval(
+                    dt_util.now(), profile.idle_interval, profile.active_interval
+                )
+            )
+        return timedelta(seconds=profile.idle_interval)
+
+    @callback
+    def _async_phase_lock_next_poll(self) -> None:
+        """Schedule the next poll to find or follow the controller's update phase."""
+        self._phase_period = None
+        if (
+            not self.config_entry.options.get(CONF_PHASE_LOCK)
+            or self.lifecycle.purging
+            or self.push_active()
+        ):
+            return
+
+        period = self.update_interval.total_seconds()
+        delay = self.freshness.phase_delay(period, time.monotonic())
+        self._phase_period = period
+        self.update_interval = timedelta(seconds=delay)
+
+    def push_active(self) -> bool:
+        """Return whether a relay has pushed a snapshot recently."""
+        return (
+            self._last_push is not None
+            and time.monotonic() - self._last_push < PUSH_FALLBACK_INTERVAL_SECONDS
+        )
+
+    async def async_ingest_push(
+        self,
+        values: dict[str, Any] | None,
+        sys_info: dict[str, Any] | None,
+        delta: bool = False,
+    ) -> None:
+        """Apply a snapshot or delta pushed by a relay as if it had been polled.
+
+        A snapshot replaces the cached payloads it includes. A delta only
+        updates the keys it includes.
+        """
+        async with self._async_hold_api_lock():
+            if delta:
+                values = {**self._values, **(values or {})}
+                sys_info = {**self._sysInfo, **(sys_info or {})}
+            else:
+                values = self._values if values is None else values
+                sys_info = self._sysInfo if sys_info is None else sys_info
+            fingerprints = {
+                "values": await self._async_fingerprint("values", values),
+                "sysInfo": await self._async_fingerprint("system_info", sys_info),
+            }
+            self._last_push = time.monotonic()
+            changed = self.data is None or fingerprints != self.fingerprints
+            if changed:
+                self.fingerprints = fingerprints
+                self._values = values
+                self._sysInfo = sys_info
                 self._mapOutlets()
                 self._sync_selected_outlet_state()
+                self._async_update_lifecycle()
+                self._async_fire_snapshot_events()
+                self.freshness.record_push({"values": values, "sysInfo": sys_info})
+            else:
+                self.freshness.record_push({})
+            self._async_update_sessions()
+
+        self._async_track_shower_on()
+        self.update_interval = self._poll_interval()
+        self._async_schedule_freshness_check()
+        if changed:
+            # Also reschedules the fallback poll.
+            self.async_set_updated_data({"values": values, "sysInfo": sys_info})
+        else:
+            self._schedule_refresh()
+        self._async_notify_poll_listeners()
+
+    @callback
+    def _async_track_shower_on(self) -> None:
+        """Remember when the shower was last on and learn from new starts."""
+        shower_on = self.isShowerOn()
+        if shower_on:
+            self._last_shower_on_time = time.time()
+            if self._shower_was_on is False:
+                self._async_record_shower_start()
+        self._shower_was_on = shower_on
+
+    def _lifecycle_target_temperature(self) -> float | None:
+        """Return the setpoint, unless it is above what the valves allow.
+
+        The water never reaches an out-of-range setpoint, so using one would
+        leave the lifecycle heating for the whole shower.
+        """
+        target = self.getTargetTemperature()
+        max_temps = [
+            temp
+            for valve in (1, 2)
+            if self.isValveInstalled(valve)
+            and (temp := self.getMaxTemperatureSetting(valve)) is not None
+        ]
+        if target is None or (max_temps and target > max(max_temps)):
+            return None
+        return target
+
+    @callback
+    def _async_update_lifecycle(self) -> None:
+        """Advance the shower lifecycle and announce when hot water is ready."""
+        transition = self.lifecycle.update(
+            (
+                self.getSystemInfo(f"valve{valve}_Currentstatus")
+                for valve in (1, 2)
+                if self.isValveInstalled(valve)
+            ),
+            self.getCurrentTemperature(),
+            self._lifecycle_target_temperature(),
+        )
+        if transition is None:
+            return
+
+        _LOGGER.debug(
+            "Kohler shower went from %s to %s", transition.previous, transition.state
+        )
+        if transition.hot_water_ready:
+            data = {
+                "temperature": self.getCurrentTemperature(),
+                "warm_up_seconds": round(transition.warm_up_seconds, 1),
+            }
+            self.hass.bus.async_fire(
+                EVENT_HOT_WATER_READY, {"mac": self.macAddress(), **data}
+            )
+            self._async_fire_event(TYPE_HOT_WATER_READY, data)
+
+    def _event_snapshot(self) -> EventSnapshot:
+        """Capture the state that semantic events are derived from."""
+        return EventSnapshot(
+            shower_on=self.isShowerOn(),
+            outlets={
+                (descriptor.valve, descriptor.outlet): descriptor.display_name
+                for descriptor in build_outlet_descriptors(self)
+                if self.isOutletOn(descriptor.valve, descriptor.outlet)
+            },
+            user=str(self.getValue("CurrentUser", "0")),
+            lights={
+                light: self.getValue(f"light{light}_level", 0)
+                for light in (1, 2)
+                if self.getValue(f"light{light}_installed", False)
+            },
+            steam_running=self.isSteamRunning(),
+            connections={
+                key: self.getConnectionStatus(key)
+                for key in self._values
+                if key.endswith("_con_string")
+            },
+        )
+
+    @callback
+    def _async_fire_snapshot_events(self) -> None:
+        """Fire semantic events for what changed since the previous snapshot."""
+        previous = self._last_event_snapshot
+        self._last_event_snapshot = current = self._event_snapshot()
+        if previous is None:
+            return
+        for event_type, data in diff_snapshots(previous, current):
+            self._async_fire_event(event_type, data)
+
+    @callback
+    def _async_fire_event(self, event_type: str, data: dict[str, Any]) -> None:
+        """Fire a typed Kohler event that device triggers can match."""
+        if self._device_id is None:
+            mac = self.macAddress()
+            device = dr.async_get(self.hass).async_get_device(
+                identifiers={(DOMAIN, mac), (DOMAIN, normalize_mac_address(mac))}
+            )
+            self._device_id = None if device is None else device.id
+        self.hass.bus.async_fire(
+            EVENT_KOHLER,
+            {CONF_DEVICE_ID: self._device_id, CONF_TYPE: event_type, **data},
+        )
+
+    async def async_load_usage(self) -> None:
+        """Restore the learned shower usage pattern."""
+        if (data := await self._usage_store.async_load()) is not None:
+            self.usage = UsageHistogram.from_dict(data)
+        if self.usage.since is None:
+            self.usage.since = dt_util.now()
+            self._async_save_usage()
+
+    async def async_load_sessions(self) -> None:
+        """Restore the shower session history."""
+        if (data := await self._sessions_store.async_load()) is not None:
+            self.sessions = SessionTracker.from_dict(data)
+
+    @callback
+    def _async_update_sessions(self) -> None:
+        """Fold the latest snapshot into the current shower session."""
+        finished = self.sessions.update(
+            time.monotonic(),
+            dt_util.now(),
+            self.lifecycle.state,
+            (
+                descriptor.display_name
+                for descriptor in build_outlet_descriptors(self)
+                if self.isOutletOn(descriptor.valve, descriptor.outlet)
+            ),
+            self.getCurrentTemperature(),
+        )
+        if finished is not None:
+            _LOGGER.debug("Kohler shower session ended: %s", finished)
+            self._sessions_store.async_delay_save(
+                self.sessions.as_dict, SESSION_SAVE_DELAY_SECONDS
+            )
+
+    @callback
+    def _async_record_shower_start(self) -> None:
+        """Learn from a shower that started since the previous poll."""
+        self.usage.record_start(dt_util.now())
+        self._async_save_usage()
+
+    @callback
+    def _async_save_usage(self) -> None:
+        """Schedule a debounced save of the usage histogram."""
+        self._usage_store.async_delay_save(self.usage.as_dict, SAVE_DELAY_SECONDS)
+
+    def freshness_sla(self) -> float | None:
+        """Return the configured maximum data age in seconds, if any."""
+        sla = self.config_entry.options.get(CONF_FRESHNESS_SLA)
+        return float(sla) if sla else None
+
+    @callback
+    def _cancel_freshness_check(self) -> None:
+        """Cancel a scheduled freshness SLA check."""
+        if self._freshness_check_unsub is not None:
+            self._freshness_check_unsub()
+            self._freshness_check_unsub = None
+
+    @callback
+    def _async_schedule_freshness_check(self) -> None:
+        """Schedule a poll for when the data would exceed the freshness SLA."""
+        self._cancel_freshness_check()
+        sla = self.freshness_sla()
+        if sla is None:
+            return
+
+        age = self.freshness.data_age()
+        # Once breached, wait a full SLA window so a dead controller isn't hammered.
+        delay = sla - age if age is not None and age < sla else sla
+        self._freshness_check_unsub = async_call_later(
+            self.hass, delay, self._async_check_freshness
+        )
+
+    async def _async_check_freshness(self, _now: datetime) -> None:
+        """Poll immediately if the data is older than the freshness SLA."""
+        self._freshness_check_unsub = None
+        sla = self.freshness_sla()
+        if sla is None:
+            return
+
+        age = self.freshness.data_age()
+        if age is not None and age < sla:
+            self._async_schedule_freshness_check()
+            return
+
+        self.freshness.record_sla_breach()
+        _LOGGER.debug("Kohler data is %ss old (SLA %ss), polling now", age, sla)
+        await self.async_request_refresh()
+
+    async def _async_update_data(self):
+        """Fetch data from API endpoint."""
+        started = time.monotonic()
+        phase_scheduled = self._phase_period is not None
+        target_interval = (
+            self._phase_period
+            if phase_scheduled
+            else self.update_interval.total_seconds()
+        )
+        try:
+            await self._async_update_address()
+            async with self._async_hold_api_lock():
+                if self._seed_values is not None:
+                    values = self._seed_values
+                    self._seed_values = None
+                elif self.lifecycle.purging and self._values:
+                    # Only system info tracks the purge; settings can wait.
+                    values = self._values
+                else:
+                    values = await self._async_call_api("values", self.api.values)
+                sys_info = await self._async_call_api(
+                    "system_info", self.api.system_info
+                )
+                fingerprints = {
+                    "values": await self._async_fingerprint("values", values),
+                    "sysInfo": await self._async_fingerprint("system_info", sys_info),
+                }
+                unchanged = self.data is not None and fingerprints == self.fingerprints
+                self._last_poll_unchanged = unchanged
+                if unchanged:
+                    # Returning the same data object skips the listener fan-out.
+                    self.metrics.record_unchanged_poll()
+                    payloads = {}
+                else:
+                    self.fingerprints = fingerprints
+                    self._values = values
+                    self._sysInfo = sys_info
+                    self._mapOutlets()
+                    self._sync_selected_outlet_state()
+                    self._async_update_lifecycle()
+                    self._async_fire_snapshot_events()
+                    payloads = {"values": values, "sysInfo": sys_info}
+                self.freshness.record_snapshot(
+                    started, target_interval, payloads, phase_scheduled
+                )
+                self._async_update_sessions()
+                self.metrics.record_success(POLL_ENDPOINT, time.monotonic() - started)
+                self.tracer.check_pending(started)
+                if unchanged:
+                    return self.data
                 return {"values": self._values, "sysInfo": self._sysInfo}
-        except (KohlerError, OSError) as err:
-            raise UpdateFailed(f"Error communicating with Kohler API: {err}") from err
         except asyncio.TimeoutError as err:
+            self.metrics.record_failure(POLL_ENDPOINT, time.monotonic() - started, err)
+            self.tracer.check_pending(None)
             raise UpdateFailed(f"Timeout communicating with Kohler API: {err}") from err
+        except (KohlerError, OSError) as err:
+            self.metrics.record_failure(POLL_ENDPOINT, time.monotonic() - started, err)
+            self.tracer.check_pending(None)
+            raise UpdateFailed(f"Error communicating with Kohler API: {err}") from err
         finally:
-            current_time = time.time()
-            if self.isShowerOn():
-                self._last_shower_on_time = current_time
-                self.update_interval = timedelta(seconds=5)
-            else:
-                time_since_last_on = current_time - self._last_shower_on_time
-                if time_since_last_on < 120:
-                    self.update_interval = timedelta(seconds=5)
-                else:
-                    self.update_interval = timedelta(seconds=15)
+            self._async_track_shower_on()
+            self.update_interval = self._poll_interval()
+            self._async_phase_lock_next_poll()
+            self._async_schedule_freshness_check()
 
     def _mapOutlets(self):
         """Map the outlets to the order on the UI."""
@@ -284,6 +994,7 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
     def _clear_pending_quick_shower(self, err: Exception | None = None) -> None:
         """Clear queued quick shower work and resolve all pending callers."""
         self._pending_quick_shower = None
+        self._pending_quick_shower_traces = []
         waiters = self._pending_quick_shower_waiters
         self._pending_quick_shower_waiters = []
         for waiter in waiters:
@@ -297,15 +1008,16 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
     async def _async_send_quick_shower(self, state: QuickShowerState) -> None:
         """Send the latest coalesced quick shower payload."""
         try:
-            async with self._api_lock:
-                async with asyncio.timeout(10.0):
-                    await self.api.quick_shower(
-                        valve_num=1,
-                        valve1_outlet=state.valve1_outlet,
-                        valve1_temp=state.temperature,
-                        valve2_outlet=state.valve2_outlet,
-                        valve2_temp=state.temperature,
-                    )
+            async with self._async_hold_api_lock():
+                await self._async_call_api(
+                    "quick_shower",
+                    self.api.quick_shower,
+                    valve_num=1,
+                    valve1_outlet=state.valve1_outlet,
+                    valve1_temp=state.temperature,
+                    valve2_outlet=state.valve2_outlet,
+                    valve2_temp=state.temperature,
+                )
         except asyncio.TimeoutError as err:
             raise HomeAssistantError(
                 f"Timeout communicating with Kohler API: {err}"
@@ -322,18 +1034,25 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
     async def _async_process_pending_quick_shower(self) -> None:
         """Serialize and debounce quick shower updates."""
         while True:
-            await asyncio.sleep(QUICK_SHOWER_DEBOUNCE_SECONDS)
+            await asyncio.sleep(self.profile.quick_shower_debounce)
 
             state = self._pending_quick_shower
             waiters = self._pending_quick_shower_waiters
+            queued_traces = self._pending_quick_shower_traces
             self._pending_quick_shower = None
             self._pending_quick_shower_waiters = []
+            self._pending_quick_shower_traces = []
 
             if state is None:
                 return
 
+            sending = time.monotonic()
+            for trace, queued in queued_traces:
+                trace.add_span("debounce", queued, sending)
+
             try:
-                await self._async_send_quick_shower(state)
+                with use_traces(tuple(trace for trace, _ in queued_traces)):
+                    await self._async_send_quick_shower(state)
             except Exception as err:
                 for waiter in waiters:
                     if not waiter.done():
@@ -353,6 +1072,10 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
         self._pending_quick_shower = state
         waiter = asyncio.get_running_loop().create_future()
         self._pending_quick_shower_waiters.append(waiter)
+        queued = time.monotonic()
+        self._pending_quick_shower_traces.extend(
+            (trace, queued) for trace in active_traces()
+        )
 
         if (
             self._pending_quick_shower_task is None
@@ -365,25 +1088,55 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
         await waiter
 
     async def async_request_post_command_refresh(
-        self, delay: float = POST_COMMAND_REFRESH_DELAY_SECONDS
+        self, delay: float | None = None
     ) -> None:
         """Coalesce command-triggered refreshes into one delayed poll."""
+        if delay is None:
+            delay = self.profile.post_command_refresh_delay
 
         async def _delayed_refresh() -> None:
             await asyncio.sleep(delay)
             await self.async_request_refresh()
+            if self._last_poll_unchanged:
+                # Commands can change local state, such as the target
+                # temperature, that the controller doesn't echo back.
+                self.async_update_listeners()
 
         task = self._post_command_refresh_task
         if task is None or task.done():
             task = asyncio.create_task(_delayed_refresh())
             self._post_command_refresh_task = task
 
+        started = time.monotonic()
         try:
             await asyncio.shield(task)
         finally:
+            record_span("post_command_refresh", started, time.monotonic())
             if self._post_command_refresh_task is task and task.done():
                 self._post_command_refresh_task = None
 
+    async def async_refresh_if_older(self, max_age: float) -> bool:
+        """Poll now if the data is older than max_age seconds.
+
+        Concurrent callers share one poll. Returns False if that poll failed.
+        """
+        age = self.freshness.data_age()
+        if age is not None and age <= max_age:
+            return True
+
+        task = self._max_age_refresh_task
+        if task is None or task.done():
+            task = asyncio.create_task(self.async_refresh())
+            self._max_age_refresh_task = task
+
+        try:
+            await asyncio.shield(task)
+        finally:
+            if self._max_age_refresh_task is task and task.done():
+                self._max_age_refresh_task = None
+
+        return self.last_update_success
+
     def genValveOutletOpen(self, valve: int, outletOn: int):
         outlet_count = int(self.getValue(f"valve{valve}PortsAvailable", 0))
         if outlet_count < 1:
@@ -411,17 +1164,22 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
     def isSteamInstalled(self) -> bool:
         return self.getValue("steam_installed", False)
 
+    def isSteamRunning(self) -> bool:
+        """Return whether the controller reports steam as running."""
+        state = self.getValue("steam_running")
+        return state is True or state == "True" or state == "On"
+
     @api_command
     async def stop_user(self):
         """Stop arbitrary user profile operations."""
         self._clear_pending_quick_shower()
-        await self.api.stop_user()
+        await self._async_call_api("stop_user", self.api.stop_user)
 
     @api_command
     async def start_user(self, user_id: int):
         """Start a quick shower via a specified user profile."""
         self._clear_pending_quick_shower()
-        await self.api.start_user(user_id)
+        await self._async_call_api("start_user", self.api.start_user, user_id)
 
     def isValveInstalled(self, valve: int) -> bool:
         return self.getValue(f"valve{valve}_installed", False)
@@ -607,7 +1365,7 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
             self._selected_outlet_state[1] = self._current_outlet_state(1)
             self._selected_outlet_state[2] = self._current_outlet_state(2)
         self._clear_pending_quick_shower()
-        await self.api.stop_shower()
+        await self._async_call_api("stop_shower", self.api.stop_shower)
 
     async def openOutlet(self, valveId, outletId):
         _LOGGER.debug("openOutlet valveId=%s outletId=%s", valveId, outletId)
@@ -655,35 +1413,39 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
 
     @api_command
     async def steam_on(self, temp=110, time=15):
-        await self.api.steam_on(temp=temp, time=time)
+        await self._async_call_api("steam_on", self.api.steam_on, temp=temp, time=time)
 
     @api_command
     async def steam_off(self):
-        await self.api.steam_off()
+        await self._async_call_api("steam_off", self.api.steam_off)
 
     @api_command
     async def massage_toggle(self):
-        await self.api.massage_toggle()
+        await self._async_call_api("massage_toggle", self.api.massage_toggle)
 
     @api_command
     async def reset_controller_faults(self):
-        await self.api.reset_controller_faults()
+        await self._async_call_api(
+            "reset_controller_faults", self.api.reset_controller_faults
+        )
 
     @api_command
     async def reset_konnect_faults(self):
-        await self.api.reset_konnect_faults()
+        await self._async_call_api(
+            "reset_konnect_faults", self.api.reset_konnect_faults
+        )
 
     @api_command
     async def light_on(self, light_id, intensity):
-        await self.api.light_on(light_id, intensity)
+        await self._async_call_api("light_on", self.api.light_on, light_id, intensity)
 
     @api_command
     async def light_off(self, light_id):
-        await self.api.light_off(light_id)
+        await self._async_call_api("light_off", self.api.light_off, light_id)
 
     @api_command
     async def check_updates(self):
-        return await self.api.check_updates()
+        return await self._async_call_api("check_updates", self.api.check_updates)
 
     @api_command
     async def sync_time(self):
@@ -697,6 +1459,13 @@ class KohlerDataUpdateCoordinator(DataUpdateCoordinator):
         )
 
         _LOGGER.debug("sync_time %s", formatted_time)
-        await self.api.save_variable(DATE_TIME_SETTING_INDEX, formatted_time)
-        await self.api.save_dt()
+        await self._async_call_api(
+            "save_variable",
+            self.api.save_variable,
+            DATE_TIME_SETTING_INDEX,
+            formatted_time,
+        )
+        await self._async_call_api("save_dt", self.api.save_dt)
         self._values["time"] = formatted_time
+        # The cached values no longer match their fingerprint.
+        self.fingerprints.pop("values", None)
@@ -8,6 +8,7 @@ from typing import Any
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
 from .coordinator import KohlerDataUpdateCoordinator
@@ -34,6 +35,16 @@ async def async_get_config_entry_diagnostics(
         "target_temperature": coordinator._target_temperature,
         "controller_error_log": controller_error_log,
         "konnect_error_log": konnect_error_log,
+        "api_metrics": coordinator.metrics.as_dict(),
+        "api_timeouts": coordinator.timeouts.as_dict(),
+        "request_budget": coordinator.budget.as_dict(),
+        "read_single_flight": coordinator.reads.as_dict(),
+        "command_traces": coordinator.tracer.as_dict(),
+        "loop_budget": coordinator.loop_monitor.as_dict(),
+        "freshness": coordinator.freshness.as_dict(),
+        "usage": coordinator.usage.summary(dt_util.now()),
+        "shower_lifecycle": coordinator.lifecycle.as_dict(),
+        "shower_sessions": coordinator.sessions.as_dict(),
     }
 
 
@@ -43,9 +54,6 @@ async def _async_get_error_log(
 ) -> str | dict[str, str]:
     """Fetch a controller or Konnect error log for diagnostics export."""
     try:
-        async with asyncio.timeout(10):
-            if log_type == "controller":
-                return await coordinator.api.controller_error_logs()
-            return await coordinator.api.konnect_error_logs()
+        return await coordinator.async_get_error_log(f"{log_type}_error_logs")
     except (KohlerError, OSError, asyncio.TimeoutError) as err:
         return {"error": str(err)}
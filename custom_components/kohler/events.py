@@ -0,0 +1,105 @@
+"""Semantic events derived from Kohler snapshot changes."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+TYPE_SHOWER_STARTED = "shower_started"
+TYPE_SHOWER_STOPPED = "shower_stopped"
+TYPE_OUTLET_OPENED = "outlet_opened"
+TYPE_OUTLET_CLOSED = "outlet_closed"
+TYPE_USER_CHANGED = "user_changed"
+TYPE_LIGHT_LEVEL_CHANGED = "light_level_changed"
+TYPE_STEAM_STARTED = "steam_started"
+TYPE_STEAM_STOPPED = "steam_stopped"
+TYPE_CONNECTION_CHANGED = "connection_changed"
+TYPE_HOT_WATER_READY = "hot_water_ready"
+
+EVENT_TYPES = (
+    TYPE_SHOWER_STARTED,
+    TYPE_SHOWER_STOPPED,
+    TYPE_OUTLET_OPENED,
+    TYPE_OUTLET_CLOSED,
+    TYPE_USER_CHANGED,
+    TYPE_LIGHT_LEVEL_CHANGED,
+    TYPE_STEAM_STARTED,
+    TYPE_STEAM_STOPPED,
+    TYPE_CONNECTION_CHANGED,
+    TYPE_HOT_WATER_READY,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class EventSnapshot:
+    """The parts of a controller snapshot that semantic events are derived from."""
+
+    shower_on: bool
+    outlets: Mapping[tuple[int, int], str]
+    user: str
+    lights: Mapping[int, int]
+    steam_running: bool
+    connections: Mapping[str, str | None]
+
+
+def diff_snapshots(
+    previous: EventSnapshot, current: EventSnapshot
+) -> list[tuple[str, dict[str, Any]]]:
+    """Return the semantic events between two snapshots, in a stable order."""
+    events: list[tuple[str, dict[str, Any]]] = []
+
+    if current.shower_on != previous.shower_on:
+        events.append(
+            (TYPE_SHOWER_STARTED if current.shower_on else TYPE_SHOWER_STOPPED, {})
+        )
+
+    for (valve, outlet), name in sorted(current.outlets.items()):
+        if (valve, outlet) not in previous.outlets:
+            events.append(
+                (TYPE_OUTLET_OPENED, {"valve": valve, "outlet": outlet, "name": name})
+            )
+    for (valve, outlet), name in sorted(previous.outlets.items()):
+        if (valve, outlet) not in current.outlets:
+            events.append(
+                (TYPE_OUTLET_CLOSED, {"valve": valve, "outlet": outlet, "name": name})
+            )
+
+    if current.user != previous.user:
+        events.append(
+            (TYPE_USER_CHANGED, {"user": current.user, "previous": previous.user})
+        )
+
+    for light, level in sorted(current.lights.items()):
+        old_level = previous.lights.get(light)
+        if old_level is not None and level != old_level:
+            events.append(
+                (
+                    TYPE_LIGHT_LEVEL_CHANGED,
+                    {"light": light, "level": level, "previous": old_level},
+                )
+            )
+
+    if current.steam_running != previous.steam_running:
+        events.append(
+            (
+                TYPE_STEAM_STARTED if current.steam_running else TYPE_STEAM_STOPPED,
+                {},
+            )
+        )
+
+    for connection, status in sorted(current.connections.items()):
+        old_status = previous.connections.get(connection)
+        if connection in previous.connections and status != old_status:
+            events.append(
+                (
+                    TYPE_CONNECTION_CHANGED,
+                    {
+                        "connection": connection,
+                        "status": status,
+                        "previous": old_status,
+                    },
+                )
+            )
+
+    return events
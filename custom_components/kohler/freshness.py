@@ -0,0 +1,289 @@
+"""Data freshness and poll cadence tracking for the Kohler integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from datetime import datetime
+import time
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .metrics import RollingStats
+
+# A poll is late when the gap since the previous snapshot exceeds this
+# multiple of the interval that was scheduled for it.
+LATE_POLL_FACTOR = 1.5
+
+# The controller's update phase is estimated from short windows between polls
+# in which data changed, folded onto the poll period and binned. While no phase
+# is known and the data is changing, polls alternate between a short and a long
+# delay averaging just over one period, so the short windows sweep across the
+# period at a slightly lower request rate. Probing raises the worst-case
+# staleness to almost two periods, so it stops after a bounded number of probes
+# (for example when the controller doesn't refresh once per poll period) and
+# polls keep the fixed cadence instead.
+PHASE_BINS = 10
+PHASE_PROBE_FRACTION = 0.3
+PHASE_MAX_PROBES = 40
+PHASE_DECAY = 0.97
+PHASE_MIN_OBSERVATIONS = 12
+PHASE_MISS_PENALTY = 0.5
+# Lock only when the peak bin and its neighbours hold this share of the weight.
+PHASE_MIN_CONCENTRATION = 0.45
+# Poll this fraction of a period after the expected update.
+PHASE_LAG_FRACTION = 0.1
+PHASE_HISTORY = 100
+
+PHASE_FREE_RUNNING = "free_running"
+PHASE_PROBING = "probing"
+PHASE_LOCKED = "phase_locked"
+
+_MISSING = object()
+
+
+class PhaseEstimator:
+    """Estimate when within a poll period the controller refreshes its data."""
+
+    def __init__(self, period: float) -> None:
+        """Initialize an estimator for one poll period."""
+        self.period = period
+        self.weights = [0.0] * PHASE_BINS
+        self.observations = 0
+        self.polls: dict[str, deque[float]] = {
+            mode: deque(maxlen=PHASE_HISTORY)
+            for mode in (PHASE_FREE_RUNNING, PHASE_PROBING, PHASE_LOCKED)
+        }
+        self._probes = 0
+        self._changing = False
+        self._scheduled = PHASE_FREE_RUNNING
+
+    def observe_window(self, after: float, before: float, changed: bool) -> None:
+        """Record whether data changed between two poll times.
+
+        A change adds weight to the phases the window covers. No change makes
+        those phases less likely, since the controller didn't refresh then.
+        """
+        self._changing = changed
+        span = before - after
+        # Long windows almost always span an update and say little.
+        if span <= 0 or span > self.period / 2:
+            return
+
+        self.weights = [weight * PHASE_DECAY for weight in self.weights]
+        width = self.period / PHASE_BINS
+        start = after % self.period
+        segments = [(start, min(self.period, start + span))]
+        if start + span > self.period:
+            segments.append((0.0, start + span - self.period))
+        for low, high in segments:
+            for index in range(int(low // width), PHASE_BINS):
+                bin_low = index * width
+                if bin_low >= high:
+                    break
+                overlap = min(high, bin_low + width) - max(low, bin_low)
+                if overlap <= 0:
+                    continue
+                if changed:
+                    self.weights[index] += overlap / span
+                else:
+                    self.weights[index] *= 1 - PHASE_MISS_PENALTY * overlap / width
+        self.observations += 1
+
+    def record_poll(self, poll_started: float, phase_scheduled: bool) -> None:
+        """Remember when a poll ran and how it was scheduled."""
+        mode = self._scheduled if phase_scheduled else PHASE_FREE_RUNNING
+        self.polls[mode].append(poll_started)
+
+    def phase(self) -> float | None:
+        """Return the estimated update offset within the period, once locked."""
+        total = sum(self.weights)
+        if self.observations < PHASE_MIN_OBSERVATIONS or not total:
+            return None
+
+        def _window(index: int) -> float:
+            return sum(
+                self.weights[(index + offset) % PHASE_BINS] for offset in (-1, 0, 1)
+            )
+
+        peak = max(range(PHASE_BINS), key=_window)
+        if _window(peak) / total < PHASE_MIN_CONCENTRATION:
+            return None
+        return (peak + 0.5) * self.period / PHASE_BINS
+
+    def next_delay(self, now: float) -> float:
+        """Return the delay before the next poll."""
+        phase = self.phase()
+        if phase is None and (not self._changing or self._probes >= PHASE_MAX_PROBES):
+            # Unchanged data can't reveal the phase, so keep the fixed cadence.
+            self._scheduled = PHASE_FREE_RUNNING
+            return self.period
+        if phase is None:
+            self._scheduled = PHASE_PROBING
+            self._probes += 1
+            if self._probes % 2:
+                return self.period * PHASE_PROBE_FRACTION
+            return self.period * (2 - PHASE_PROBE_FRACTION) + self.period / PHASE_BINS
+
+        self._scheduled = PHASE_LOCKED
+        delay = (phase + self.period * PHASE_LAG_FRACTION - now) % self.period
+        # Never poll sooner than half a period, so the request rate is kept.
+        if delay < self.period / 2:
+            delay += self.period
+        return delay
+
+    def staleness(self, mode: str) -> RollingStats:
+        """Return how old the controller's data was at each recent poll."""
+        stats = RollingStats(PHASE_HISTORY)
+        if (phase := self.phase()) is not None:
+            for poll_started in self.polls[mode]:
+                stats.observe((poll_started - phase) % self.period)
+        return stats
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the estimate."""
+        phase = self.phase()
+        return {
+            "phase": None if phase is None else round(phase, 3),
+            "observations": self.observations,
+            "probes": self._probes,
+            "staleness": {
+                mode: self.staleness(mode).as_dict()
+                for mode in (PHASE_FREE_RUNNING, PHASE_LOCKED)
+            },
+        }
+
+
+class FreshnessTracker:
+    """Track snapshot age, per-key change times, and the achieved poll cadence."""
+
+    def __init__(self) -> None:
+        """Initialize an empty tracker."""
+        self.fetched: float | None = None
+        self.fetched_at: datetime | None = None
+        self.fetch_lag = RollingStats()
+        self.cadence: dict[float, RollingStats] = {}
+        self.late_polls: dict[float, int] = {}
+        self.sla_breaches = 0
+        self.pushes = 0
+        self.key_changed: dict[str, dict[str, datetime]] = {}
+        self.phases: dict[float, PhaseEstimator] = {}
+        self._previous: dict[str, Mapping[str, Any]] = {}
+        self._last_poll_started: float | None = None
+
+    def record_snapshot(
+        self,
+        poll_started: float,
+        target_interval: float,
+        payloads: Mapping[str, Mapping[str, Any]],
+        phase_scheduled: bool = False,
+    ) -> None:
+        """Record a successful poll and note which keys changed in each payload.
+
+        An empty payloads mapping means the poll returned unchanged data.
+        """
+        now = time.monotonic()
+        now_at = dt_util.utcnow()
+
+        if self.fetched is not None:
+            gap = now - self.fetched
+            stats = self.cadence.get(target_interval)
+            if stats is None:
+                stats = self.cadence[target_interval] = RollingStats()
+            stats.observe(gap)
+            # Phase-scheduled polls are deliberately early or late.
+            if not phase_scheduled and gap > target_interval * LATE_POLL_FACTOR:
+                self.late_polls[target_interval] = (
+                    self.late_polls.get(target_interval, 0) + 1
+                )
+
+        self.fetched = now
+        self.fetched_at = now_at
+        self.fetch_lag.observe(now - poll_started)
+
+        phase = self.phases.get(target_interval)
+        if phase is None:
+            phase = self.phases[target_interval] = PhaseEstimator(target_interval)
+        if self._last_poll_started is not None:
+            phase.observe_window(self._last_poll_started, poll_started, bool(payloads))
+        phase.record_poll(poll_started, phase_scheduled)
+        self._last_poll_started = poll_started
+
+        self._record_changes(payloads, now_at)
+
+    def record_push(self, payloads: Mapping[str, Mapping[str, Any]]) -> None:
+        """Record a pushed snapshot without counting it towards the poll cadence."""
+        now_at = dt_util.utcnow()
+        self.fetched = time.monotonic()
+        self.fetched_at = now_at
+        self.pushes += 1
+        self._record_changes(payloads, now_at)
+
+    def _record_changes(
+        self, payloads: Mapping[str, Mapping[str, Any]], now_at: datetime
+    ) -> None:
+        """Note which keys changed in each payload."""
+        for source, payload in payloads.items():
+            previous = self._previous.get(source, {})
+            changed = self.key_changed.setdefault(source, {})
+            for key, value in payload.items():
+                if previous.get(key, _MISSING) != value:
+                    changed[key] = now_at
+            for key in previous.keys() - payload.keys():
+                changed[key] = now_at
+            self._previous[source] = payload
+
+    def phase_delay(self, period: float, now: float) -> float:
+        """Return a delay that probes for or aligns to the controller's updates."""
+        phase = self.phases.get(period)
+        if phase is None:
+            phase = self.phases[period] = PhaseEstimator(period)
+        return phase.next_delay(now)
+
+    def record_sla_breach(self) -> None:
+        """Count a freshness SLA breach."""
+        self.sla_breaches += 1
+
+    def data_age(self) -> float | None:
+        """Return the seconds since the last successful snapshot."""
+        return None if self.fetched is None else time.monotonic() - self.fetched
+
+    def last_changed(self, key: str, source: str = "values") -> datetime | None:
+        """Return when a key last changed value."""
+        return self.key_changed.get(source, {}).get(key)
+
+    def cadence_summary(self) -> dict[str, dict[str, object]]:
+        """Return achieved poll gaps for each scheduled interval."""
+        return {
+            f"{target:g}s": {
+                **stats.as_dict(),
+                "late": self.late_polls.get(target, 0),
+            }
+            for target, stats in sorted(self.cadence.items())
+        }
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of freshness state."""
+        age = self.data_age()
+        return {
+            "fetched_at": (
+                None if self.fetched_at is None else self.fetched_at.isoformat()
+            ),
+            "data_age": None if age is None else round(age, 3),
+            "fetch_lag": self.fetch_lag.as_dict(),
+            "cadence": self.cadence_summary(),
+            "sla_breaches": self.sla_breaches,
+            "pushes": self.pushes,
+            "phase": {
+                f"{period:g}s": phase.as_dict()
+                for period, phase in sorted(self.phases.items())
+            },
+            "key_changed": {
+                source: {
+                    key: changed_at.isoformat()
+                    for key, changed_at in sorted(changed.items())
+                }
+                for source, changed in self.key_changed.items()
+            },
+        }
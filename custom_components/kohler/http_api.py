@@ -0,0 +1,99 @@
+"""Read-through HTTP cache of the controller's responses."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+import math
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.const import CONTENT_TYPE_JSON
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
+
+from .const import DATA_KOHLER, DOMAIN
+from .coordinator import KohlerDataUpdateCoordinator
+from .transport import bytes_fingerprint
+
+ATTR_MAX_AGE = "max_age"
+HEADER_DATA_AGE = "X-Kohler-Data-Age"
+HEADER_FETCHED_AT = "X-Kohler-Fetched-At"
+
+# Endpoint name -> coordinator attribute holding its cached response.
+ENDPOINTS = {
+    "values": "_values",
+    "system_info": "_sysInfo",
+}
+
+
+@callback
+def async_setup_http_api(hass: HomeAssistant) -> None:
+    """Register the Kohler cache view."""
+    hass.http.register_view(KohlerCacheView(hass))
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return whether an If-None-Match header matches an entity tag."""
+    if not if_none_match:
+        return False
+    candidates = {
+        candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")
+    }
+    return "*" in candidates or etag in candidates
+
+
+class KohlerCacheView(HomeAssistantView):
+    """Serve a controller's cached values and system info."""
+
+    url = f"/api/{DOMAIN}/{{entry_id}}/{{endpoint}}"
+    name = f"api:{DOMAIN}:cache"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(
+        self, request: web.Request, entry_id: str, endpoint: str
+    ) -> web.Response:
+        """Return a cached response, polling first if it is older than max_age."""
+        coordinator = self.hass.data.get(DATA_KOHLER)
+        if (
+            not isinstance(coordinator, KohlerDataUpdateCoordinator)
+            or coordinator.config_entry.entry_id != entry_id
+            or endpoint not in ENDPOINTS
+        ):
+            return self.json_message("Not found", HTTPStatus.NOT_FOUND)
+
+        if (max_age := request.query.get(ATTR_MAX_AGE)) is not None:
+            try:
+                max_age_seconds = float(max_age)
+            except ValueError:
+                max_age_seconds = math.nan
+            if not max_age_seconds >= 0:
+                return self.json_message(
+                    "max_age must be a non-negative number", HTTPStatus.BAD_REQUEST
+                )
+            if not await coordinator.async_refresh_if_older(max_age_seconds):
+                return self.json_message(
+                    "Unable to refresh data from the Kohler controller",
+                    HTTPStatus.SERVICE_UNAVAILABLE,
+                )
+
+        # Tag the bytes actually served, so local writes to the cache can't
+        # leave a stale tag behind.
+        body = json_bytes(getattr(coordinator, ENDPOINTS[endpoint]))
+        headers = {
+            hdrs.CACHE_CONTROL: "no-cache",
+            hdrs.ETAG: f'"{bytes_fingerprint(body)}"',
+        }
+        freshness = coordinator.freshness
+        if (age := freshness.data_age()) is not None:
+            headers[hdrs.AGE] = str(int(age))
+            headers[HEADER_DATA_AGE] = f"{age:.3f}"
+        if freshness.fetched_at is not None:
+            headers[HEADER_FETCHED_AT] = freshness.fetched_at.isoformat()
+        if etag_matches(request.headers.get(hdrs.IF_NONE_MATCH), headers[hdrs.ETAG]):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        return web.Response(body=body, content_type=CONTENT_TYPE_JSON, headers=headers)
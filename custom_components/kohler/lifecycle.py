@@ -0,0 +1,131 @@
+"""Shower lifecycle tracking for the Kohler integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+import time
+
+from homeassistant.util import dt as dt_util
+
+# Poll system info this often while a valve purges cold water. Heating isn't
+# polled faster, since it has no controller-side end like a purge does.
+WARM_UP_POLL_INTERVAL_SECONDS = 1.0
+# Without a purge, the water is ready within this many degrees of the setpoint.
+READY_TEMPERATURE_TOLERANCE = 1.0
+
+
+class ShowerState(StrEnum):
+    """Lifecycle states of a shower."""
+
+    OFF = "off"
+    PURGING = "purging"
+    HEATING = "heating"
+    RUNNING = "running"
+
+
+WARM_UP_STATES = frozenset({ShowerState.PURGING, ShowerState.HEATING})
+
+
+@dataclass(slots=True)
+class ShowerTransition:
+    """A change between lifecycle states."""
+
+    previous: ShowerState | None
+    state: ShowerState
+    hot_water_ready: bool
+    warm_up_seconds: float | None
+
+
+class ShowerLifecycle:
+    """Follow a shower from start through purge and running to stop.
+
+    A valve reporting ``PurgeActive`` is purging cold water. Once the purge
+    ends the water is hot. A shower started without a purge is heating until
+    it reaches the setpoint.
+    """
+
+    def __init__(self) -> None:
+        """Initialize before the first snapshot is seen."""
+        self.state: ShowerState | None = None
+        self.state_since: datetime | None = None
+        self.hot_water_ready_at: datetime | None = None
+        self.last_warm_up_seconds: float | None = None
+        self._warm_up_started: float | None = None
+
+    @property
+    def purging(self) -> bool:
+        """Return whether a valve is purging cold water."""
+        return self.state == ShowerState.PURGING
+
+    def update(
+        self,
+        statuses: Iterable[str | None],
+        temperature: float | None,
+        target: float | None,
+    ) -> ShowerTransition | None:
+        """Advance the state machine from a snapshot and return any transition."""
+        statuses = set(statuses)
+        if "PurgeActive" in statuses:
+            state = ShowerState.PURGING
+        elif "On" not in statuses:
+            state = ShowerState.OFF
+        elif self.state in (ShowerState.PURGING, ShowerState.RUNNING):
+            state = ShowerState.RUNNING
+        elif (
+            temperature is not None
+            and target is not None
+            and temperature < target - READY_TEMPERATURE_TOLERANCE
+        ):
+            state = ShowerState.HEATING
+        else:
+            state = ShowerState.RUNNING
+
+        previous = self.state
+        if state == previous:
+            return None
+
+        now = time.monotonic()
+        self.state = state
+        self.state_since = dt_util.utcnow()
+
+        warm_up_seconds = None
+        hot_water_ready = False
+        if state in WARM_UP_STATES:
+            if previous not in WARM_UP_STATES:
+                self._warm_up_started = now
+        elif (
+            state == ShowerState.RUNNING
+            and previous in WARM_UP_STATES
+            and self._warm_up_started is not None
+        ):
+            # Only a purge ending or reaching the setpoint means hot water.
+            hot_water_ready = True
+            warm_up_seconds = now - self._warm_up_started
+            self.last_warm_up_seconds = warm_up_seconds
+            self.hot_water_ready_at = self.state_since
+        if state not in WARM_UP_STATES:
+            self._warm_up_started = None
+
+        return ShowerTransition(previous, state, hot_water_ready, warm_up_seconds)
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the lifecycle."""
+        return {
+            "state": self.state,
+            "state_since": (
+                None if self.state_since is None else self.state_since.isoformat()
+            ),
+            "hot_water_ready_at": (
+                None
+                if self.hot_water_ready_at is None
+                else self.hot_water_ready_at.isoformat()
+            ),
+            "last_warm_up_seconds": (
+                None
+                if self.last_warm_up_seconds is None
+                else round(self.last_warm_up_seconds, 1)
+            ),
+        }
@@ -73,7 +73,7 @@ class KohlerLight(CoordinatorEntity, LightEntity):
 
     def _update_state(self):
         """Update local state from coordinator before writing to HA state machine."""
-        brightness_level = self.coordinator.getValue(f"{self._device_id}_level", 0)
+        brightness_level = self._current_level()
         self._attr_brightness = self.to_hass_level(brightness_level)
         self._attr_is_on = brightness_level > 0
 
@@ -81,13 +81,27 @@ class KohlerLight(CoordinatorEntity, LightEntity):
         """Instruct the light to turn on."""
         brightness = kwargs.get(ATTR_BRIGHTNESS, self.brightness or 255)
         intensity = self.to_kohler_level(brightness)
-        await self.coordinator.light_on(self._light_id, intensity)
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "light.turn_on",
+            self.entity_id,
+            expect=lambda: self._current_level() == intensity,
+        ):
+            await self.coordinator.light_on(self._light_id, intensity)
+            await self.coordinator.async_request_post_command_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Instruct the light to turn off."""
-        await self.coordinator.light_off(self._light_id)
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "light.turn_off",
+            self.entity_id,
+            expect=lambda: self._current_level() == 0,
+        ):
+            await self.coordinator.light_off(self._light_id)
+            await self.coordinator.async_request_post_command_refresh()
+
+    def _current_level(self) -> int:
+        """Return the light level last reported by the controller."""
+        return self.coordinator.getValue(f"{self._device_id}_level", 0)
 
     def to_kohler_level(self, level):
         """Convert the given Home Assistant light level (0-255) to Kohler (0-100)."""
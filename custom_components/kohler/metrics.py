@@ -0,0 +1,365 @@
+"""Request latency and error metrics for the Kohler integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+import time
+
+from kohler import KohlerError
+
+_LOGGER = logging.getLogger(__name__)
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+POLL_ENDPOINT = "poll"
+
+ROLLING_WINDOW_SIZE = 100
+FANOUT_BUDGET_SECONDS = 0.05
+ENTITY_BUDGET_SECONDS = 0.01
+BUDGET_WARNING_INTERVAL_SECONDS = 300.0
+SLOWEST_ENTITY_COUNT = 5
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with cheap percentile estimates."""
+
+    __slots__ = ("buckets", "count", "counts", "max", "total")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record a single duration in seconds."""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return the bucket upper bound containing the given percentile."""
+        if not self.count:
+            return None
+
+        rank = percentile / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                if index < len(self.buckets):
+                    return min(self.buckets[index], self.max)
+                break
+        return self.max
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean observed duration."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the histogram."""
+        buckets = {
+            f"le_{bound}": count
+            for bound, count in zip(self.buckets, self.counts, strict=False)
+        }
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "max": round(self.max, 6),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "buckets": buckets,
+        }
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Outcome counters and latency for a single API endpoint."""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    success: int = 0
+    timeout: int = 0
+    kohler_error: int = 0
+    os_error: int = 0
+    retries: int = 0
+    hedges: int = 0
+    decode: LatencyHistogram = field(default_factory=LatencyHistogram)
+    decode_offloaded: int = 0
+    last_success: float | None = None
+
+    @property
+    def failures(self) -> int:
+        """Return the number of failed calls."""
+        return self.timeout + self.kohler_error + self.os_error
+
+    @property
+    def total(self) -> int:
+        """Return the number of completed calls."""
+        return self.success + self.failures
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the endpoint metrics."""
+        return {
+            "success": self.success,
+            "timeout": self.timeout,
+            "kohler_error": self.kohler_error,
+            "os_error": self.os_error,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "decode": self.decode.as_dict(),
+            "decode_offloaded": self.decode_offloaded,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class ApiMetrics:
+    """Per-endpoint API metrics collected by the coordinator."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.lock_wait = LatencyHistogram()
+        self.unchanged_polls = 0
+
+    def endpoint(self, name: str) -> EndpointMetrics:
+        """Return the metrics for an endpoint, creating them on first use."""
+        metrics = self.endpoints.get(name)
+        if metrics is None:
+            metrics = self.endpoints[name] = EndpointMetrics()
+        return metrics
+
+    def record_success(self, name: str, duration: float) -> None:
+        """Record a successful call."""
+        metrics = self.endpoint(name)
+        metrics.latency.observe(duration)
+        metrics.success += 1
+        metrics.last_success = time.monotonic()
+
+    def record_failure(self, name: str, duration: float, err: BaseException) -> None:
+        """Record a failed call, classified by error type."""
+        metrics = self.endpoint(name)
+        metrics.latency.observe(duration)
+        if isinstance(err, TimeoutError):
+            metrics.timeout += 1
+        elif isinstance(err, KohlerError):
+            metrics.kohler_error += 1
+        else:
+            metrics.os_error += 1
+
+    def record_retry(self, name: str) -> None:
+        """Record that a failed call is being retried."""
+        self.endpoint(name).retries += 1
+
+    def record_hedge(self, name: str) -> None:
+        """Record that a slow read was hedged with a second request."""
+        self.endpoint(name).hedges += 1
+
+    def record_decode(self, name: str, duration: float, offloaded: bool) -> None:
+        """Record how long it took to decode or fingerprint a response."""
+        metrics = self.endpoint(name)
+        metrics.decode.observe(duration)
+        if offloaded:
+            metrics.decode_offloaded += 1
+
+    def record_unchanged_poll(self) -> None:
+        """Record a poll whose responses matched the previous ones."""
+        self.unchanged_polls += 1
+
+    def record_lock_wait(self, duration: float) -> None:
+        """Record how long a caller waited for the API lock."""
+        self.lock_wait.observe(duration)
+
+    def error_rate(self) -> float | None:
+        """Return the failed share of individual endpoint calls."""
+        total = 0
+        failures = 0
+        for name, metrics in self.endpoints.items():
+            if name == POLL_ENDPOINT:
+                continue
+            total += metrics.total
+            failures += metrics.failures
+        return failures / total if total else None
+
+    def last_success_age(self, name: str = POLL_ENDPOINT) -> float | None:
+        """Return the seconds since the last successful call to an endpoint."""
+        metrics = self.endpoints.get(name)
+        if metrics is None or metrics.last_success is None:
+            return None
+        return time.monotonic() - metrics.last_success
+
+    def summary(self) -> dict[str, float | None]:
+        """Return the headline values exposed as diagnostic sensors."""
+        poll = self.endpoints.get(POLL_ENDPOINT)
+        p50 = poll.latency.percentile(50) if poll is not None else None
+        p95 = poll.latency.percentile(95) if poll is not None else None
+        error_rate = self.error_rate()
+        last_success_age = self.last_success_age()
+        return {
+            "poll_latency_p50": None if p50 is None else round(p50 * 1000),
+            "poll_latency_p95": None if p95 is None else round(p95 * 1000),
+            "api_error_rate": (
+                None if error_rate is None else round(error_rate * 100, 1)
+            ),
+            "last_success_age": (
+                None if last_success_age is None else round(last_success_age)
+            ),
+        }
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of all metrics."""
+        return {
+            "summary": self.summary(),
+            "lock_wait": self.lock_wait.as_dict(),
+            "unchanged_polls": self.unchanged_polls,
+            "endpoints": {
+                name: metrics.as_dict()
+                for name, metrics in sorted(self.endpoints.items())
+            },
+        }
+
+
+class RollingStats:
+    """Statistics over the most recent durations."""
+
+    __slots__ = ("count", "samples")
+
+    def __init__(self, size: int = ROLLING_WINDOW_SIZE) -> None:
+        """Initialize an empty window."""
+        self.samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Record a single duration in seconds."""
+        self.samples.append(seconds)
+        self.count += 1
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the window."""
+        return sum(self.samples) / len(self.samples) if self.samples else None
+
+    @property
+    def max(self) -> float | None:
+        """Return the largest duration in the window."""
+        return max(self.samples) if self.samples else None
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return the nearest-rank percentile of the window."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = max(0, round(percentile / 100 * len(ordered)) - 1)
+        return ordered[min(index, len(ordered) - 1)]
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the window statistics in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": _to_ms(self.mean),
+            "p95_ms": _to_ms(self.percentile(95)),
+            "max_ms": _to_ms(self.max),
+        }
+
+
+class LoopBudgetMonitor:
+    """Track event-loop time spent notifying coordinator listeners."""
+
+    def __init__(
+        self,
+        fanout_budget: float = FANOUT_BUDGET_SECONDS,
+        entity_budget: float = ENTITY_BUDGET_SECONDS,
+    ) -> None:
+        """Initialize the monitor with per-fan-out and per-entity budgets."""
+        self.fanout_budget = fanout_budget
+        self.entity_budget = entity_budget
+        self.fanout = RollingStats()
+        self.entities: dict[str, RollingStats] = {}
+        self.fanout_over_budget = 0
+        self.entity_over_budget = 0
+        self._last_warning: dict[str, float] = {}
+
+    def record_fanout(self, duration: float) -> None:
+        """Record the wall time of one coordinator update fan-out."""
+        self.fanout.observe(duration)
+        if duration > self.fanout_budget:
+            self.fanout_over_budget += 1
+            self._warn(
+                "fanout",
+                "Kohler coordinator update fan-out took %.1f ms (budget %.1f ms); "
+                "slowest entities: %s",
+                duration * 1000,
+                self.fanout_budget * 1000,
+                ", ".join(name for name, _ in self.slowest_entities()),
+            )
+
+    def record_entity(self, name: str, duration: float) -> None:
+        """Record the wall time of one entity's coordinator update handler."""
+        stats = self.entities.get(name)
+        if stats is None:
+            stats = self.entities[name] = RollingStats()
+        stats.observe(duration)
+        if duration > self.entity_budget:
+            self.entity_over_budget += 1
+            self._warn(
+                name,
+                "Kohler entity %s took %.1f ms to handle a coordinator update "
+                "(budget %.1f ms)",
+                name,
+                duration * 1000,
+                self.entity_budget * 1000,
+            )
+
+    def slowest_entities(
+        self, limit: int = SLOWEST_ENTITY_COUNT
+    ) -> list[tuple[str, RollingStats]]:
+        """Return the entities with the highest mean update time."""
+        return sorted(
+            self.entities.items(),
+            key=lambda item: item[1].mean or 0.0,
+            reverse=True,
+        )[:limit]
+
+    def _warn(self, key: str, message: str, *args: object) -> None:
+        """Log a budget warning at most once per interval for each key."""
+        now = time.monotonic()
+        last = self._last_warning.get(key)
+        if last is not None and now - last < BUDGET_WARNING_INTERVAL_SECONDS:
+            return
+        self._last_warning[key] = now
+        _LOGGER.warning(message, *args)
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the loop budget stats."""
+        return {
+            "fanout_budget_ms": self.fanout_budget * 1000,
+            "entity_budget_ms": self.entity_budget * 1000,
+            "fanout": self.fanout.as_dict(),
+            "fanout_over_budget": self.fanout_over_budget,
+            "entity_over_budget": self.entity_over_budget,
+            "slowest_entities": {
+                name: stats.as_dict() for name, stats in self.slowest_entities()
+            },
+        }
+
+
+def _to_ms(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 3)
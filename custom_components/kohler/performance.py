@@ -0,0 +1,67 @@
+"""Performance profiles for the Kohler integration."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from typing import Any
+
+from .const import CONF_PERFORMANCE_PROFILE
+
+PROFILE_BALANCED = "balanced"
+PROFILE_CONSERVATIVE = "conservative"
+PROFILE_RESPONSIVE = "responsive"
+PROFILE_CUSTOM = "custom"
+
+
+@dataclass(frozen=True, slots=True)
+class PerformanceProfile:
+    """Polling, debounce, and timeout settings applied by the coordinator.
+
+    Field names double as the option keys used by the custom profile.
+    """
+
+    idle_interval: float = 15.0
+    active_interval: float = 5.0
+    active_tail: float = 120.0
+    quick_shower_debounce: float = 0.35
+    post_command_refresh_delay: float = 1.0
+    request_timeout: float = 10.0
+
+
+PROFILES: dict[str, PerformanceProfile] = {
+    PROFILE_BALANCED: PerformanceProfile(),
+    PROFILE_CONSERVATIVE: PerformanceProfile(
+        idle_interval=30.0,
+        active_interval=10.0,
+        active_tail=60.0,
+        quick_shower_debounce=0.5,
+        post_command_refresh_delay=2.0,
+        request_timeout=15.0,
+    ),
+    PROFILE_RESPONSIVE: PerformanceProfile(
+        idle_interval=10.0,
+        active_interval=2.0,
+        active_tail=180.0,
+        quick_shower_debounce=0.2,
+        post_command_refresh_delay=0.5,
+        request_timeout=5.0,
+    ),
+}
+
+PROFILE_FIELDS = tuple(field.name for field in fields(PerformanceProfile))
+
+
+def profile_from_options(options: Mapping[str, Any]) -> PerformanceProfile:
+    """Return the performance profile selected in a config entry's options."""
+    name = options.get(CONF_PERFORMANCE_PROFILE, PROFILE_BALANCED)
+    if name != PROFILE_CUSTOM:
+        return PROFILES.get(name, PROFILES[PROFILE_BALANCED])
+
+    return PerformanceProfile(
+        **{
+            key: float(options[key])
+            for key in PROFILE_FIELDS
+            if options.get(key) is not None
+        }
+    )
@@ -0,0 +1,268 @@
+"""On-demand profiling scoped to the Kohler integration."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import gc
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .coordinator import KohlerDataUpdateCoordinator, QuickShowerState
+
+_LOGGER = logging.getLogger(__name__)
+
+# Matches this integration's package and the kohler client library.
+PROFILE_SCOPE = re.compile(r"[\\/]kohler[\\/]")
+
+TRACEMALLOC_FRAMES = 10
+TRACEMALLOC_FILTERS = (
+    tracemalloc.Filter(True, f"*{os.sep}kohler{os.sep}*", all_frames=True),
+)
+
+_PROFILE_LOCK = asyncio.Lock()
+
+
+async def async_run_cpu_profile(
+    hass: HomeAssistant,
+    coordinator: KohlerDataUpdateCoordinator,
+    duration: float,
+    cycles: int | None,
+    top: int,
+) -> dict[str, Any]:
+    """Profile for a number of coordinator cycles or seconds, whichever is first."""
+    if _PROFILE_LOCK.locked():
+        raise HomeAssistantError("A Kohler profile is already running")
+
+    async with _PROFILE_LOCK:
+        cycles_done = 0
+        finished = asyncio.Event()
+
+        @callback
+        def _async_poll_finished() -> None:
+            nonlocal cycles_done
+            cycles_done += 1
+            if cycles is not None and cycles_done >= cycles:
+                finished.set()
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            raise HomeAssistantError(f"Unable to start profiler: {err}") from err
+
+        remove_listener = coordinator.async_add_poll_listener(_async_poll_finished)
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(duration):
+                await finished.wait()
+        except TimeoutError:
+            pass
+        finally:
+            profiler.disable()
+            remove_listener()
+
+        elapsed = time.monotonic() - started
+        stamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+        pstats_path = hass.config.path(f"kohler_profile.{stamp}.pstats")
+        summary_path = hass.config.path(f"kohler_profile.{stamp}.txt")
+        functions = await hass.async_add_executor_job(
+            _write_profile, profiler, pstats_path, summary_path, top
+        )
+
+    _LOGGER.info(
+        "Kohler profile of %d cycles over %.1fs written to %s",
+        cycles_done,
+        elapsed,
+        summary_path,
+    )
+    return {
+        "pstats": pstats_path,
+        "summary": summary_path,
+        "cycles": cycles_done,
+        "duration": round(elapsed, 3),
+        "functions": functions,
+    }
+
+
+def _write_profile(
+    profiler: cProfile.Profile, pstats_path: str, summary_path: str, top: int
+) -> int:
+    """Write integration-scoped pstats and a cumulative-time summary."""
+    stats = pstats.Stats(profiler)
+    stats.stats = {
+        func: (
+            cc,
+            nc,
+            tt,
+            ct,
+            {
+                caller: timing
+                for caller, timing in callers.items()
+                if PROFILE_SCOPE.search(caller[0])
+            },
+        )
+        for func, (cc, nc, tt, ct, callers) in stats.stats.items()
+        if PROFILE_SCOPE.search(func[0])
+    }
+    stats.dump_stats(pstats_path)
+
+    output = io.StringIO()
+    summary = pstats.Stats(pstats_path, stream=output)
+    summary.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    with open(summary_path, "w", encoding="utf-8") as file:
+        file.write(output.getvalue())
+    return len(stats.stats)
+
+
+async def async_run_memory_snapshot(
+    hass: HomeAssistant,
+    coordinator: KohlerDataUpdateCoordinator,
+    interval: float,
+    top: int,
+) -> dict[str, Any]:
+    """Diff tracemalloc snapshots across an interval and attribute live objects."""
+    if _PROFILE_LOCK.locked():
+        raise HomeAssistantError("A Kohler profile is already running")
+
+    async with _PROFILE_LOCK:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        try:
+            before = await hass.async_add_executor_job(_take_snapshot)
+            await asyncio.sleep(interval)
+            after = await hass.async_add_executor_job(_take_snapshot)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        objects = _live_object_report(coordinator)
+        objects["quick_shower_states"] = await hass.async_add_executor_job(
+            _count_quick_shower_states
+        )
+        growth = await hass.async_add_executor_job(
+            _top_growth_sites, before, after, top
+        )
+
+        stamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+        report_path = hass.config.path(f"kohler_memory.{stamp}.txt")
+        await hass.async_add_executor_job(
+            _write_memory_report, report_path, interval, objects, growth
+        )
+
+    _LOGGER.info("Kohler memory snapshot written to %s", report_path)
+    return {"report": report_path, "objects": objects, "growth": growth}
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    """Take a snapshot limited to allocations made from Kohler code."""
+    return tracemalloc.take_snapshot().filter_traces(TRACEMALLOC_FILTERS)
+
+
+def _top_growth_sites(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int
+) -> list[dict[str, Any]]:
+    """Return the allocation sites that grew the most between snapshots."""
+    sites: list[dict[str, Any]] = []
+    for stat in after.compare_to(before, "traceback")[:top]:
+        frames = list(stat.traceback)
+        origin = next(
+            (
+                frame
+                for frame in reversed(frames)
+                if PROFILE_SCOPE.search(frame.filename)
+            ),
+            frames[-1],
+        )
+        allocated = frames[-1]
+        sites.append(
+            {
+                "origin": f"{origin.filename}:{origin.lineno}",
+                "allocated_at": f"{allocated.filename}:{allocated.lineno}",
+                "size_diff": stat.size_diff,
+                "size": stat.size,
+                "count_diff": stat.count_diff,
+                "count": stat.count,
+            }
+        )
+    return sites
+
+
+def _count_quick_shower_states() -> int:
+    """Count live queued quick shower payloads."""
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, QuickShowerState))
+
+
+def _live_object_report(coordinator: KohlerDataUpdateCoordinator) -> dict[str, Any]:
+    """Summarize pending work and retained payload sizes on the coordinator."""
+    kohler_tasks = [
+        task
+        for task in asyncio.all_tasks()
+        if not task.done()
+        and PROFILE_SCOPE.search(
+            getattr(getattr(task.get_coro(), "cr_code", None), "co_filename", "")
+        )
+    ]
+    return {
+        "pending_quick_shower_waiters": len(coordinator._pending_quick_shower_waiters),
+        "pending_tasks": len(kohler_tasks),
+        "pending_task_names": sorted(
+            task.get_coro().__qualname__ for task in kohler_tasks
+        ),
+        "values_bytes": deep_sizeof(coordinator._values),
+        "values_keys": len(coordinator._values),
+        "sys_info_bytes": deep_sizeof(coordinator._sysInfo),
+        "sys_info_keys": len(coordinator._sysInfo),
+    }
+
+
+def deep_sizeof(obj: object, seen: set[int] | None = None) -> int:
+    """Return the retained size of a payload, following containers."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_sizeof(key, seen) + deep_sizeof(value, seen)
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def _write_memory_report(
+    path: str,
+    interval: float,
+    objects: dict[str, Any],
+    growth: list[dict[str, Any]],
+) -> None:
+    """Write a human-readable memory report."""
+    lines = [f"Kohler memory snapshot over {interval:.0f}s", "", "Live objects:"]
+    lines.extend(f"  {key}: {value}" for key, value in objects.items())
+    lines.extend(["", "Top growth sites:"])
+    lines.extend(
+        (
+            f"  {site['size_diff']:+d} B ({site['count_diff']:+d} blocks) "
+            f"{site['origin']} -> {site['allocated_at']}"
+        )
+        for site in growth
+    )
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
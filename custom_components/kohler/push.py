@@ -0,0 +1,130 @@
+"""Webhook ingest of snapshots pushed by a relay."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+from http import HTTPStatus
+import logging
+import math
+import time
+from typing import Any
+
+from aiohttp import web
+import voluptuous as vol
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
+
+from .const import CONF_PUSH_INGEST, CONF_PUSH_SECRET, DATA_PUSH_WEBHOOKS, DOMAIN
+from .coordinator import KohlerDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Kohler-Signature"
+SIGNATURE_PREFIX = "sha256="
+# Reject pushes whose timestamp is this far from Home Assistant's clock.
+MAX_CLOCK_SKEW_SECONDS = 300
+
+PUSH_TYPE_SNAPSHOT = "snapshot"
+PUSH_TYPE_DELTA = "delta"
+
+
+def _finite(value: float) -> float:
+    """Reject NaN and infinite timestamps, which defeat the replay check."""
+    if not math.isfinite(value):
+        raise vol.Invalid("timestamp must be finite")
+    return value
+
+
+PUSH_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required("timestamp"): vol.All(vol.Coerce(float), _finite),
+            vol.Optional("type", default=PUSH_TYPE_SNAPSHOT): vol.In(
+                (PUSH_TYPE_SNAPSHOT, PUSH_TYPE_DELTA)
+            ),
+            vol.Optional("values"): dict,
+            vol.Optional("system_info"): dict,
+        }
+    ),
+    vol.Any(
+        vol.Schema({vol.Required("values"): dict}, extra=vol.ALLOW_EXTRA),
+        vol.Schema({vol.Required("system_info"): dict}, extra=vol.ALLOW_EXTRA),
+        msg="expected values or system_info",
+    ),
+)
+
+
+def sign_payload(secret: str, body: bytes) -> str:
+    """Return the signature header value for a request body."""
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"{SIGNATURE_PREFIX}{digest}"
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Return whether a signature header matches a request body."""
+    return signature is not None and hmac.compare_digest(
+        sign_payload(secret, body), signature
+    )
+
+
+@callback
+def async_setup_push(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: KohlerDataUpdateCoordinator,
+) -> None:
+    """Register the push webhook if it is enabled in the entry's options."""
+    async_unload_push(hass, entry)
+    options = entry.options
+    if not options.get(CONF_PUSH_INGEST) or not options.get(CONF_WEBHOOK_ID):
+        return
+
+    webhook_id: str = options[CONF_WEBHOOK_ID]
+    secret: str = options[CONF_PUSH_SECRET]
+
+    async def _async_handle_push(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        body = await request.read()
+        if not verify_signature(secret, body, request.headers.get(SIGNATURE_HEADER)):
+            _LOGGER.warning("Rejected a Kohler push with a bad signature")
+            return web.Response(status=HTTPStatus.UNAUTHORIZED)
+
+        try:
+            push: dict[str, Any] = PUSH_SCHEMA(json_loads(body))
+        except (*JSON_DECODE_EXCEPTIONS, vol.Invalid) as err:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text=str(err))
+
+        timestamp = push["timestamp"]
+        last_timestamp = coordinator.last_push_timestamp
+        if abs(time.time() - timestamp) > MAX_CLOCK_SKEW_SECONDS or (
+            last_timestamp is not None and timestamp <= last_timestamp
+        ):
+            # Replayed or reordered pushes would roll the state back.
+            return web.Response(status=HTTPStatus.CONFLICT)
+        coordinator.last_push_timestamp = timestamp
+
+        await coordinator.async_ingest_push(
+            push.get("values"),
+            push.get("system_info"),
+            delta=push["type"] == PUSH_TYPE_DELTA,
+        )
+        return web.Response(status=HTTPStatus.NO_CONTENT)
+
+    webhook.async_register(
+        hass, DOMAIN, "Kohler push", webhook_id, _async_handle_push, local_only=True
+    )
+    hass.data.setdefault(DATA_PUSH_WEBHOOKS, {})[entry.entry_id] = webhook_id
+
+
+@callback
+def async_unload_push(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Unregister the entry's push webhook, if any."""
+    webhook_id = hass.data.get(DATA_PUSH_WEBHOOKS, {}).pop(entry.entry_id, None)
+    if webhook_id is not None:
+        webhook.async_unregister(hass, webhook_id)
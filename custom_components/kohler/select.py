@@ -76,11 +76,22 @@ class KohlerUserPresetSelect(CoordinatorEntity, SelectEntity):
     async def async_select_option(self, option: str) -> None:
         """Change the selected active profile."""
         if option == "System Default":
-            await self.coordinator.stop_user()
+            user_id = "0"
         else:
             user_id = next(
                 (k for k, v in self._options_map.items() if v == option), "1"
             )
-            await self.coordinator.start_user(int(user_id))
 
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "select.select_option",
+            self.entity_id,
+            expect=lambda: (
+                str(self.coordinator.getValue("CurrentUser", "0")) == user_id
+            ),
+        ):
+            if user_id == "0":
+                await self.coordinator.stop_user()
+            else:
+                await self.coordinator.start_user(int(user_id))
+
+            await self.coordinator.async_request_post_command_refresh()
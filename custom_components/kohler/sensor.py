@@ -1,13 +1,28 @@
 """Sensor platform for Kohler integration."""
 
-from homeassistant.components.sensor import SensorEntity
+from datetime import datetime, timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.const import CONF_HOST, EntityCategory
+from homeassistant.const import CONF_HOST, PERCENTAGE, EntityCategory, UnitOfTime
 from homeassistant.core import callback
+from homeassistant.helpers.event import (
+    async_track_time_change,
+    async_track_time_interval,
+)
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, MANUFACTURER, MODEL, DEFAULT_NAME
 from .coordinator import KohlerDataUpdateCoordinator
+from .lifecycle import ShowerState
+
+# How often the Data Age sensor recomputes the age between polls.
+DATA_AGE_REFRESH_INTERVAL = timedelta(seconds=5)
 
 VERSION_SENSORS = [
     ("User Interface 1 Graphics", "amulet_version_string"),
@@ -34,6 +49,34 @@ CONNECTION_STATUS_SENSORS = [
     ("WaterTile 2 Connection", "watertile2_con_string", "mdi:shower"),
 ]
 
+API_METRIC_SENSORS = [
+    (
+        "Poll Latency P50",
+        "poll_latency_p50",
+        "mdi:timer-outline",
+        UnitOfTime.MILLISECONDS,
+    ),
+    (
+        "Poll Latency P95",
+        "poll_latency_p95",
+        "mdi:timer-alert-outline",
+        UnitOfTime.MILLISECONDS,
+    ),
+    ("API Error Rate", "api_error_rate", "mdi:alert-circle-outline", PERCENTAGE),
+    (
+        "Last Successful Poll Age",
+        "last_success_age",
+        "mdi:timer-sand",
+        UnitOfTime.SECONDS,
+    ),
+]
+
+
+SHOWER_TODAY_SENSORS = [
+    ("Showers Today", "count", "mdi:counter", None),
+    ("Shower Time Today", "duration", "mdi:timer-outline", UnitOfTime.MINUTES),
+]
+
 
 async def async_setup_entry(hass, config, add_entities):
     """Set up the Kohler Sensor platform."""
@@ -56,6 +99,15 @@ async def async_setup_entry(hass, config, add_entities):
         ):
             sensors.append(KohlerCalibrationCodeSensor(coordinator, valve))
 
+    for name, key, icon, unit in API_METRIC_SENSORS:
+        sensors.append(KohlerApiMetricSensor(coordinator, name, key, icon, unit))
+    sensors.append(KohlerDataAgeSensor(coordinator))
+    sensors.append(KohlerShowerStateSensor(coordinator))
+    sensors.append(KohlerHotWaterReadySensor(coordinator))
+    sensors.append(KohlerLastShowerSensor(coordinator))
+    for name, key, icon, unit in SHOWER_TODAY_SENSORS:
+        sensors.append(KohlerShowerTodaySensor(coordinator, name, key, icon, unit))
+
     add_entities(sensors)
 
 
@@ -170,3 +222,299 @@ class KohlerCalibrationCodeSensor(CoordinatorEntity, SensorEntity):
         """Handle updated data from the coordinator."""
         self._attr_native_value = self.coordinator.getCalibrationCode(self._valve)
         super()._handle_coordinator_update()
+
+
+class KohlerApiMetricSensor(SensorEntity):
+    """Representation of an API latency or error-rate diagnostic sensor.
+
+    Metrics move after every poll attempt, so the sensor follows the poll
+    listener rather than the coordinator's data updates.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: KohlerDataUpdateCoordinator,
+        name: str,
+        key: str,
+        icon: str,
+        unit: str,
+    ):
+        """Initialize the API metric sensor."""
+        self.coordinator = coordinator
+        self._attr_name = name
+        self._attr_unique_id = f"{coordinator.macAddress()}_{key}"
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit
+        if unit != PERCENTAGE:
+            self._attr_device_class = SensorDeviceClass.DURATION
+        self._key = key
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.macAddress())},
+            manufacturer=MANUFACTURER,
+            configuration_url="http://" + coordinator.getConf(CONF_HOST),
+            name=DEFAULT_NAME,
+            model=MODEL,
+            hw_version=self.coordinator.firmwareVersion(),
+            sw_version=self.coordinator.firmwareVersion(),
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh after every poll attempt, including unchanged and failed ones."""
+        await super().async_added_to_hass()
+        self._attr_native_value = self.coordinator.metrics.summary()[self._key]
+        self.async_on_remove(
+            self.coordinator.async_add_poll_listener(self._async_poll_finished)
+        )
+
+    @callback
+    def _async_poll_finished(self) -> None:
+        """Update the metric after a poll attempt."""
+        self._attr_native_value = self.coordinator.metrics.summary()[self._key]
+        self.async_write_ha_state()
+
+
+class KohlerDataAgeSensor(SensorEntity):
+    """Representation of the age of the last successful controller snapshot.
+
+    The age is recomputed on a timer as well as after each poll attempt, so it
+    keeps growing while polls fail or are far apart.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_name = "Data Age"
+    _attr_icon = "mdi:clock-check-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, coordinator: KohlerDataUpdateCoordinator):
+        """Initialize the data age sensor."""
+        self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.macAddress()}_data_age"
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.macAddress())},
+            manufacturer=MANUFACTURER,
+            configuration_url="http://" + coordinator.getConf(CONF_HOST),
+            name=DEFAULT_NAME,
+            model=MODEL,
+            hw_version=self.coordinator.firmwareVersion(),
+            sw_version=self.coordinator.firmwareVersion(),
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh after every poll attempt and on a timer in between."""
+        await super().async_added_to_hass()
+        self._update_age()
+        self.async_on_remove(
+            self.coordinator.async_add_poll_listener(self._async_refresh_age)
+        )
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_refresh_age, DATA_AGE_REFRESH_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_refresh_age(self, _now: datetime | None = None) -> None:
+        """Recompute the age and write the state."""
+        self._update_age()
+        self.async_write_ha_state()
+
+    def _update_age(self) -> None:
+        """Recompute the age and its attributes."""
+        freshness = self.coordinator.freshness
+        age = freshness.data_age()
+        self._attr_native_value = None if age is None else round(age, 1)
+        self._attr_extra_state_attributes = {
+            "fetched_at": freshness.fetched_at,
+            "fetch_lag_p95_ms": freshness.fetch_lag.as_dict()["p95_ms"],
+            "freshness_sla": self.coordinator.freshness_sla(),
+            "sla_breaches": freshness.sla_breaches,
+            "cadence": freshness.cadence_summary(),
+        }
+
+
+class KohlerShowerStateSensor(CoordinatorEntity, SensorEntity):
+    """Representation of the shower lifecycle state."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Shower State"
+    _attr_icon = "mdi:shower-head"
+    _attr_device_class = SensorDeviceClass.ENUM
+
+    def __init__(self, coordinator: KohlerDataUpdateCoordinator):
+        """Initialize the shower state sensor."""
+        super().__init__(coordinator)
+        self.coordinator = coordinator
+        self._attr_options = [state.value for state in ShowerState]
+        self._attr_unique_id = f"{coordinator.macAddress()}_shower_state"
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.macAddress())},
+            manufacturer=MANUFACTURER,
+            configuration_url="http://" + coordinator.getConf(CONF_HOST),
+            name=DEFAULT_NAME,
+            model=MODEL,
+            hw_version=self.coordinator.firmwareVersion(),
+            sw_version=self.coordinator.firmwareVersion(),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        lifecycle = self.coordinator.lifecycle
+        self._attr_native_value = lifecycle.state
+        self._attr_extra_state_attributes = {
+            "state_since": lifecycle.state_since,
+            "last_warm_up_seconds": lifecycle.as_dict()["last_warm_up_seconds"],
+        }
+        super()._handle_coordinator_update()
+
+
+class KohlerHotWaterReadySensor(CoordinatorEntity, SensorEntity):
+    """Representation of when the shower water last became hot."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Hot Water Ready"
+    _attr_icon = "mdi:water-thermometer"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(self, coordinator: KohlerDataUpdateCoordinator):
+        """Initialize the hot water ready sensor."""
+        super().__init__(coordinator)
+        self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.macAddress()}_hot_water_ready"
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.macAddress())},
+            manufacturer=MANUFACTURER,
+            configuration_url="http://" + coordinator.getConf(CONF_HOST),
+            name=DEFAULT_NAME,
+            model=MODEL,
+            hw_version=self.coordinator.firmwareVersion(),
+            sw_version=self.coordinator.firmwareVersion(),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._attr_native_value = self.coordinator.lifecycle.hot_water_ready_at
+        super()._handle_coordinator_update()
+
+
+class KohlerLastShowerSensor(CoordinatorEntity, SensorEntity):
+    """Representation of the most recently finished shower."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Last Shower"
+    _attr_icon = "mdi:shower"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, coordinator: KohlerDataUpdateCoordinator):
+        """Initialize the last shower sensor."""
+        super().__init__(coordinator)
+        self.coordinator = coordinator
+        self._attr_unique_id = f"{coordinator.macAddress()}_last_shower"
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.macAddress())},
+            manufacturer=MANUFACTURER,
+            configuration_url="http://" + coordinator.getConf(CONF_HOST),
+            name=DEFAULT_NAME,
+            model=MODEL,
+            hw_version=self.coordinator.firmwareVersion(),
+            sw_version=self.coordinator.firmwareVersion(),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        session = self.coordinator.sessions.last_session
+        if session is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+        else:
+            temperature = session["temperature"]
+            self._attr_native_value = round(session["duration"] / 60, 1)
+            self._attr_extra_state_attributes = {
+                "started_at": session["started_at"],
+                "ended_at": session["ended_at"],
+                "purge_seconds": session["purge_seconds"],
+                "outlets": session["outlets"],
+                "temperature_min": temperature["min"],
+                "temperature_mean": temperature["mean"],
+                "temperature_max": temperature["max"],
+            }
+        super()._handle_coordinator_update()
+
+
+class KohlerShowerTodaySensor(CoordinatorEntity, SensorEntity):
+    """Representation of today's shower count or total shower time."""
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        coordinator: KohlerDataUpdateCoordinator,
+        name: str,
+        key: str,
+        icon: str,
+        unit: str | None,
+    ):
+        """Initialize the daily shower sensor."""
+        super().__init__(coordinator)
+        self.coordinator = coordinator
+        self._key = key
+        self._attr_name = name
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit
+        if unit is not None:
+            self._attr_device_class = SensorDeviceClass.DURATION
+            self._attr_suggested_display_precision = 1
+        self._attr_unique_id = f"{coordinator.macAddress()}_shower_{key}_today"
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.macAddress())},
+            manufacturer=MANUFACTURER,
+            configuration_url="http://" + coordinator.getConf(CONF_HOST),
+            name=DEFAULT_NAME,
+            model=MODEL,
+            hw_version=self.coordinator.firmwareVersion(),
+            sw_version=self.coordinator.firmwareVersion(),
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Reset to zero at midnight even when no data arrives."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._async_midnight, hour=0, minute=0, second=0
+            )
+        )
+
+    @callback
+    def _async_midnight(self, _now: datetime) -> None:
+        """Start the new day's total."""
+        self._handle_coordinator_update()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        count, seconds = self.coordinator.sessions.today(dt_util.now().date())
+        self._attr_native_value = count if self._key == "count" else seconds / 60
+        super()._handle_coordinator_update()
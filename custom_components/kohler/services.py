@@ -0,0 +1,165 @@
+"""Services for the Kohler integration."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_register_admin_service
+
+from .const import (
+    DATA_KOHLER,
+    DOMAIN,
+    SERVICE_GET_STATE,
+    SERVICE_MEMORY_SNAPSHOT,
+    SERVICE_PROFILE,
+)
+from .coordinator import KohlerDataUpdateCoordinator
+from .profiling import async_run_cpu_profile, async_run_memory_snapshot
+from .snapshot import TOPICS, build_snapshot
+
+ATTR_CYCLES = "cycles"
+ATTR_DURATION = "duration"
+ATTR_INTERVAL = "interval"
+ATTR_MAX_AGE = "max_age"
+ATTR_TOP = "top"
+ATTR_TOPICS = "topics"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+        vol.Optional(ATTR_CYCLES): vol.All(cv.positive_int, vol.Range(min=1)),
+        vol.Optional(ATTR_TOP, default=40): vol.All(
+            cv.positive_int, vol.Range(min=1, max=500)
+        ),
+    }
+)
+
+MEMORY_SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_INTERVAL, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+        vol.Optional(ATTR_TOP, default=25): vol.All(
+            cv.positive_int, vol.Range(min=1, max=500)
+        ),
+    }
+)
+
+GET_STATE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_TOPICS, default=list(TOPICS)): vol.All(
+            cv.ensure_list, [vol.In(TOPICS)], vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_MAX_AGE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=86400)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Kohler services."""
+
+    async def _async_profile(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass)
+        result = await async_run_cpu_profile(
+            hass,
+            coordinator,
+            duration=call.data[ATTR_DURATION],
+            cycles=call.data.get(ATTR_CYCLES),
+            top=call.data[ATTR_TOP],
+        )
+        persistent_notification.async_create(
+            hass,
+            (
+                f"Profiled {result['cycles']} coordinator cycles over "
+                f"{result['duration']}s.\n\n"
+                f"Stats: {result['pstats']}\n\nSummary: {result['summary']}"
+            ),
+            title="Kohler profile complete",
+            notification_id=f"{DOMAIN}_profile",
+        )
+
+    async def _async_memory_snapshot(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass)
+        result = await async_run_memory_snapshot(
+            hass,
+            coordinator,
+            interval=call.data[ATTR_INTERVAL],
+            top=call.data[ATTR_TOP],
+        )
+        objects = result["objects"]
+        persistent_notification.async_create(
+            hass,
+            (
+                f"Live quick shower states: {objects['quick_shower_states']}, "
+                f"pending waiters: {objects['pending_quick_shower_waiters']}, "
+                f"pending tasks: {objects['pending_tasks']}.\n\n"
+                f"Values: {objects['values_bytes']} bytes, "
+                f"system info: {objects['sys_info_bytes']} bytes.\n\n"
+                f"Report: {result['report']}"
+            ),
+            title="Kohler memory snapshot complete",
+            notification_id=f"{DOMAIN}_memory_snapshot",
+        )
+
+    async def _async_get_state(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass)
+        max_age = call.data.get(ATTR_MAX_AGE)
+        if max_age is not None and not await coordinator.async_refresh_if_older(
+            max_age
+        ):
+            raise HomeAssistantError(
+                "Unable to refresh data from the Kohler controller"
+            )
+
+        freshness = coordinator.freshness
+        age = freshness.data_age()
+        return {
+            "fetched_at": (
+                None
+                if freshness.fetched_at is None
+                else freshness.fetched_at.isoformat()
+            ),
+            "data_age": None if age is None else round(age, 3),
+            **build_snapshot(coordinator, dict.fromkeys(call.data[ATTR_TOPICS])),
+        }
+
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA
+    )
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_MEMORY_SNAPSHOT,
+        _async_memory_snapshot,
+        schema=MEMORY_SNAPSHOT_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_STATE,
+        _async_get_state,
+        schema=GET_STATE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _get_coordinator(hass: HomeAssistant) -> KohlerDataUpdateCoordinator:
+    """Return the loaded coordinator or raise if the integration isn't set up."""
+    coordinator = hass.data.get(DATA_KOHLER)
+    if not isinstance(coordinator, KohlerDataUpdateCoordinator):
+        raise HomeAssistantError("The Kohler integration is not loaded")
+    return coordinator
@@ -0,0 +1,201 @@
+"""Shower session records built incrementally from each snapshot."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .lifecycle import ShowerState
+
+STORAGE_VERSION = 1
+SESSION_SAVE_DELAY_SECONDS = 60
+HISTORY_SIZE = 50
+
+
+def async_get_sessions_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store that persists a controller's shower sessions."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.sessions.{entry_id}")
+
+
+class WelfordStats:
+    """Running count, mean, spread, and range in constant memory."""
+
+    __slots__ = ("_m2", "count", "maximum", "mean", "minimum")
+
+    def __init__(self) -> None:
+        """Initialize with no observations."""
+        self.count = 0
+        self.mean = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._m2 = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def stdev(self) -> float | None:
+        """Return the sample standard deviation."""
+        if self.count < 2:
+            return None
+        return math.sqrt(self._m2 / (self.count - 1))
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Return a JSON-friendly summary."""
+        if not self.count:
+            return {"count": 0, "min": None, "mean": None, "max": None, "stdev": None}
+        stdev = self.stdev
+        return {
+            "count": self.count,
+            "min": self.minimum,
+            "mean": round(self.mean, 2),
+            "max": self.maximum,
+            "stdev": None if stdev is None else round(stdev, 2),
+        }
+
+
+@dataclass(slots=True)
+class ShowerSession:
+    """A shower in progress."""
+
+    started_at: datetime
+    started: float
+    purge_seconds: float = 0.0
+    outlet_seconds: dict[str, float] = field(default_factory=dict)
+    temperature: WelfordStats = field(default_factory=WelfordStats)
+
+    def as_dict(self, ended_at: datetime, ended: float) -> dict[str, Any]:
+        """Return the finished session record."""
+        return {
+            "started_at": self.started_at.isoformat(),
+            "ended_at": ended_at.isoformat(),
+            "duration": round(ended - self.started, 1),
+            "purge_seconds": round(self.purge_seconds, 1),
+            "outlets": {
+                name: round(seconds, 1)
+                for name, seconds in sorted(self.outlet_seconds.items())
+            },
+            "temperature": self.temperature.as_dict(),
+        }
+
+
+class SessionTracker:
+    """Build shower session records as snapshots arrive.
+
+    Time between two snapshots is credited to whatever the earlier snapshot
+    showed: purging, or each open outlet. Temperatures are only sampled while
+    the shower is running, so cold purge water doesn't skew them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no history."""
+        self.current: ShowerSession | None = None
+        self.history: deque[dict[str, Any]] = deque(maxlen=HISTORY_SIZE)
+        self.day: date | None = None
+        self.day_count = 0
+        self.day_seconds = 0.0
+        self._last_update: float | None = None
+        self._purging = False
+        self._open_outlets: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> SessionTracker:
+        """Restore a tracker saved by as_dict."""
+        tracker = cls()
+        history = data.get("history")
+        if isinstance(history, list):
+            tracker.history.extend(
+                session for session in history if isinstance(session, dict)
+            )
+        if isinstance(day := data.get("day"), str):
+            try:
+                tracker.day = date.fromisoformat(day)
+            except ValueError:
+                tracker.day = None
+        if tracker.day is not None:
+            tracker.day_count = int(data.get("day_count", 0))
+            tracker.day_seconds = float(data.get("day_seconds", 0.0))
+        return tracker
+
+    @property
+    def last_session(self) -> dict[str, Any] | None:
+        """Return the most recently finished session."""
+        return self.history[-1] if self.history else None
+
+    def today(self, today: date) -> tuple[int, float]:
+        """Return the number and total seconds of showers finished on a day."""
+        if self.day != today:
+            return 0, 0.0
+        return self.day_count, self.day_seconds
+
+    def update(
+        self,
+        now: float,
+        now_at: datetime,
+        state: ShowerState | None,
+        open_outlets: Iterable[str],
+        temperature: float | None,
+    ) -> dict[str, Any] | None:
+        """Fold in a snapshot and return the session record if one just ended.
+
+        ``now`` is a monotonic time and ``now_at`` the same moment in local
+        time.
+        """
+        session = self.current
+        if session is not None and self._last_update is not None:
+            elapsed = now - self._last_update
+            if self._purging:
+                session.purge_seconds += elapsed
+            for name in self._open_outlets:
+                session.outlet_seconds[name] = (
+                    session.outlet_seconds.get(name, 0.0) + elapsed
+                )
+        self._last_update = now
+
+        finished = None
+        if state not in (None, ShowerState.OFF):
+            if session is None:
+                session = self.current = ShowerSession(now_at, now)
+            if state == ShowerState.RUNNING and temperature is not None:
+                session.temperature.observe(temperature)
+            self._purging = state == ShowerState.PURGING
+            self._open_outlets = frozenset(open_outlets)
+            return None
+
+        if session is not None:
+            finished = session.as_dict(now_at, now)
+            self.history.append(finished)
+            today = now_at.date()
+            if self.day != today:
+                self.day = today
+                self.day_count = 0
+                self.day_seconds = 0.0
+            self.day_count += 1
+            self.day_seconds += finished["duration"]
+        self.current = None
+        self._purging = False
+        self._open_outlets = frozenset()
+        return finished
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly representation for storage."""
+        return {
+            "history": list(self.history),
+            "day": None if self.day is None else self.day.isoformat(),
+            "day_count": self.day_count,
+            "day_seconds": round(self.day_seconds, 1),
+        }
@@ -0,0 +1,155 @@
+"""Typed controller snapshots for dashboards, scripts, and external tools."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import TYPE_CHECKING, Any
+
+from .entity_helpers import build_outlet_descriptors
+
+if TYPE_CHECKING:
+    from .coordinator import KohlerDataUpdateCoordinator
+
+TOPIC_LIVE = "live"
+TOPIC_OUTLETS = "outlets"
+TOPIC_SETTINGS = "settings"
+TOPIC_CONNECTIONS = "connections"
+TOPIC_DIAGNOSTICS = "diagnostics"
+
+TOPICS = (
+    TOPIC_LIVE,
+    TOPIC_OUTLETS,
+    TOPIC_SETTINGS,
+    TOPIC_CONNECTIONS,
+    TOPIC_DIAGNOSTICS,
+)
+
+Snapshot = dict[str, dict[str, Any]]
+
+
+def build_snapshot(
+    coordinator: KohlerDataUpdateCoordinator, topics: Iterable[str] = TOPICS
+) -> Snapshot:
+    """Return the coordinator's current state grouped by topic."""
+    return {topic: _BUILDERS[topic](coordinator) for topic in topics}
+
+
+def diff_snapshot(previous: Snapshot, current: Snapshot) -> Snapshot:
+    """Return the keys that changed or disappeared in each topic.
+
+    Topics without changes are left out, so an empty result means nothing
+    changed.
+    """
+    diff: Snapshot = {}
+    for topic, values in current.items():
+        old_values = previous.get(topic, {})
+        changed = {
+            key: value
+            for key, value in values.items()
+            if key not in old_values or old_values[key] != value
+        }
+        removed = sorted(old_values.keys() - values.keys())
+        if changed or removed:
+            diff[topic] = {"changed": changed, "removed": removed}
+    return diff
+
+
+def _live(coordinator: KohlerDataUpdateCoordinator) -> dict[str, Any]:
+    """Return what the shower is doing right now."""
+    live: dict[str, Any] = {
+        "shower_on": coordinator.isShowerOn(),
+        "shower_state": coordinator.lifecycle.state,
+        "current_temperature": coordinator.getCurrentTemperature(),
+        "target_temperature": coordinator.getTargetTemperature(),
+        "temperature_unit": coordinator.unitOfMeasurement(),
+        "user": str(coordinator.getValue("CurrentUser", "0")),
+        "steam_running": coordinator.isSteamRunning(),
+    }
+    for valve in (1, 2):
+        if coordinator.isValveInstalled(valve):
+            live[f"valve{valve}_status"] = coordinator.getSystemInfo(
+                f"valve{valve}_Currentstatus"
+            )
+    for light in (1, 2):
+        if coordinator.getValue(f"light{light}_installed", False):
+            live[f"light{light}_level"] = coordinator.getValue(f"light{light}_level", 0)
+    return live
+
+
+def _outlets(coordinator: KohlerDataUpdateCoordinator) -> dict[str, Any]:
+    """Return each installed outlet's name and whether it is open."""
+    return {
+        f"valve{descriptor.valve}_outlet{descriptor.outlet}": {
+            "name": descriptor.display_name,
+            "open": bool(coordinator.isOutletOn(descriptor.valve, descriptor.outlet)),
+        }
+        for descriptor in build_outlet_descriptors(coordinator)
+    }
+
+
+def _settings(coordinator: KohlerDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the controller's configured settings."""
+    settings: dict[str, Any] = {
+        "units": coordinator.getUnitsSetting(),
+        "date_format": coordinator.getDateFormat(),
+        "time_format": coordinator.getTimeFormat(),
+        "daylight_savings": coordinator.isDaylightSavingsEnabled(),
+    }
+    for valve in (1, 2):
+        if coordinator.isValveInstalled(valve):
+            settings.update(
+                {
+                    f"valve{valve}_{key}": value
+                    for key, value in coordinator.getValveSettingsAttributes(
+                        valve
+                    ).items()
+                    if key != "units"
+                }
+            )
+    return settings
+
+
+def _connections(coordinator: KohlerDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the controller's connection statuses."""
+    return {
+        key: coordinator.getConnectionStatus(key)
+        for key in sorted(coordinator._values)
+        if key.endswith("_con_string")
+    }
+
+
+def _diagnostics(coordinator: KohlerDataUpdateCoordinator) -> dict[str, Any]:
+    """Return how fresh the data is and how polling is going."""
+    freshness = coordinator.freshness
+    lifecycle = coordinator.lifecycle
+    return {
+        "fetched_at": (
+            None if freshness.fetched_at is None else freshness.fetched_at.isoformat()
+        ),
+        "last_update_success": coordinator.last_update_success,
+        "poll_interval": coordinator.update_interval.total_seconds(),
+        "hot_water_ready_at": (
+            None
+            if lifecycle.hot_water_ready_at is None
+            else lifecycle.hot_water_ready_at.isoformat()
+        ),
+        "last_warm_up_seconds": (
+            None
+            if lifecycle.last_warm_up_seconds is None
+            else round(lifecycle.last_warm_up_seconds, 1)
+        ),
+        **{
+            key: value
+            for key, value in coordinator.metrics.summary().items()
+            if key != "last_success_age"
+        },
+    }
+
+
+_BUILDERS: Mapping[str, Callable[[KohlerDataUpdateCoordinator], dict[str, Any]]] = {
+    TOPIC_LIVE: _live,
+    TOPIC_OUTLETS: _outlets,
+    TOPIC_SETTINGS: _settings,
+    TOPIC_CONNECTIONS: _connections,
+    TOPIC_DIAGNOSTICS: _diagnostics,
+}
@@ -51,8 +51,7 @@ class KohlerSteamSwitch(CoordinatorEntity, SwitchEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        state = self.coordinator.getValue("steam_running")
-        self._attr_is_on = state is True or state == "True" or state == "On"
+        self._attr_is_on = self.coordinator.isSteamRunning()
         super()._handle_coordinator_update()
 
     @property
@@ -67,10 +66,20 @@ class KohlerSteamSwitch(CoordinatorEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):
         """Turn Steam on."""
-        await self.coordinator.steam_on(temp=110, time=15)
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "switch.steam_on",
+            self.entity_id,
+            expect=self.coordinator.isSteamRunning,
+        ):
+            await self.coordinator.steam_on(temp=110, time=15)
+            await self.coordinator.async_request_post_command_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Turn Steam off."""
-        await self.coordinator.steam_off()
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "switch.steam_off",
+            self.entity_id,
+            expect=lambda: not self.coordinator.isSteamRunning(),
+        ):
+            await self.coordinator.steam_off()
+            await self.coordinator.async_request_post_command_refresh()
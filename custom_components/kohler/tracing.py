@@ -0,0 +1,191 @@
+"""Command tracing from entity action to confirmed controller state."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterator
+import contextlib
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import logging
+import secrets
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_HISTORY_SIZE = 25
+TRACE_CONFIRM_TIMEOUT_SECONDS = 120.0
+
+OUTCOME_PENDING = "pending"
+OUTCOME_CONFIRMED = "confirmed"
+OUTCOME_COMPLETED = "completed"
+OUTCOME_UNCONFIRMED = "unconfirmed"
+OUTCOME_FAILED = "failed"
+
+_ACTIVE_TRACES: ContextVar[tuple[CommandTrace, ...]] = ContextVar(
+    "kohler_active_traces", default=()
+)
+
+
+@dataclass(slots=True)
+class TraceSpan:
+    """A timed step within a command trace."""
+
+    name: str
+    start: float
+    duration: float
+
+
+@dataclass(slots=True, eq=False)
+class CommandTrace:
+    """Timing of a single entity action through to confirmed state."""
+
+    trace_id: str
+    action: str
+    entity_id: str | None
+    started: float
+    started_at: float
+    expect: Callable[[], bool] | None = None
+    spans: list[TraceSpan] = field(default_factory=list)
+    command_done: float | None = None
+    finished: float | None = None
+    outcome: str = OUTCOME_PENDING
+    error: str | None = None
+
+    def add_span(self, name: str, start: float, end: float) -> None:
+        """Record a span using monotonic start and end times."""
+        self.spans.append(TraceSpan(name, start - self.started, end - start))
+
+    @property
+    def duration(self) -> float | None:
+        """Return the time from action start to the trace outcome."""
+        return None if self.finished is None else self.finished - self.started
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the trace."""
+        return {
+            "trace_id": self.trace_id,
+            "action": self.action,
+            "entity_id": self.entity_id,
+            "started_at": self.started_at,
+            "outcome": self.outcome,
+            "duration": None if self.duration is None else round(self.duration, 4),
+            "error": self.error,
+            "spans": [
+                {
+                    "name": span.name,
+                    "start": round(span.start, 4),
+                    "duration": round(span.duration, 4),
+                }
+                for span in self.spans
+            ],
+        }
+
+
+def active_traces() -> tuple[CommandTrace, ...]:
+    """Return the traces active in the current task context."""
+    return _ACTIVE_TRACES.get()
+
+
+@contextlib.contextmanager
+def use_traces(traces: tuple[CommandTrace, ...]) -> Iterator[None]:
+    """Attribute work in the current context to the given traces."""
+    token = _ACTIVE_TRACES.set(traces)
+    try:
+        yield
+    finally:
+        _ACTIVE_TRACES.reset(token)
+
+
+def record_span(name: str, start: float, end: float) -> None:
+    """Add a span to every trace active in the current context."""
+    for trace in _ACTIVE_TRACES.get():
+        trace.add_span(name, start, end)
+
+
+def mark_command_done(end: float) -> None:
+    """Note that the active traces' command reached the controller."""
+    for trace in _ACTIVE_TRACES.get():
+        trace.command_done = end
+
+
+class CommandTracer:
+    """Create command traces and keep the most recent ones in a ring buffer."""
+
+    def __init__(self, history_size: int = TRACE_HISTORY_SIZE) -> None:
+        """Initialize the tracer."""
+        self.history: deque[CommandTrace] = deque(maxlen=history_size)
+        self._pending: list[CommandTrace] = []
+
+    @contextlib.contextmanager
+    def trace(
+        self,
+        action: str,
+        entity_id: str | None = None,
+        expect: Callable[[], bool] | None = None,
+    ) -> Iterator[CommandTrace]:
+        """Trace an entity action until a poll confirms its expected state."""
+        trace = CommandTrace(
+            trace_id=secrets.token_hex(4),
+            action=action,
+            entity_id=entity_id,
+            started=time.monotonic(),
+            started_at=time.time(),
+            expect=expect,
+        )
+        self._pending.append(trace)
+        try:
+            with use_traces((*_ACTIVE_TRACES.get(), trace)):
+                yield trace
+        except Exception as err:
+            if trace.outcome == OUTCOME_PENDING:
+                trace.error = str(err)
+                self._finish(trace, OUTCOME_FAILED)
+            raise
+
+        if trace.outcome == OUTCOME_PENDING and (
+            trace.expect is None or trace.command_done is None
+        ):
+            self._finish(trace, OUTCOME_COMPLETED)
+
+    def check_pending(self, poll_started: float | None) -> None:
+        """Confirm traces whose expected state shows up in a completed poll."""
+        now = time.monotonic()
+        for trace in list(self._pending):
+            if (
+                poll_started is not None
+                and trace.expect is not None
+                and trace.command_done is not None
+                and poll_started >= trace.command_done
+                and trace.expect()
+            ):
+                trace.add_span("confirmed_by_poll", trace.command_done, now)
+                self._finish(trace, OUTCOME_CONFIRMED)
+            elif now - trace.started > TRACE_CONFIRM_TIMEOUT_SECONDS:
+                self._finish(trace, OUTCOME_UNCONFIRMED)
+
+    def _finish(self, trace: CommandTrace, outcome: str) -> None:
+        """Move a trace into the history ring buffer."""
+        trace.outcome = outcome
+        trace.finished = time.monotonic()
+        trace.expect = None
+        if trace in self._pending:
+            self._pending.remove(trace)
+        self.history.append(trace)
+        _LOGGER.debug(
+            "Command trace %s %s %s in %.3fs: %s",
+            trace.trace_id,
+            trace.action,
+            outcome,
+            trace.duration,
+            ", ".join(
+                f"{span.name}={span.duration * 1000:.0f}ms" for span in trace.spans
+            ),
+        )
+
+    def as_dict(self) -> dict[str, object]:
+        """Return pending and recent traces for diagnostics."""
+        return {
+            "pending": [trace.as_dict() for trace in self._pending],
+            "recent": [trace.as_dict() for trace in reversed(self.history)],
+        }
@@ -0,0 +1,453 @@
+"""Request policies for talking to the Kohler controller."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import hashlib
+import ipaddress
+import logging
+import random
+import socket
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
+
+from .const import DATA_PROBE_CACHE, DATA_REQUEST_BUDGETS
+from .metrics import RollingStats
+
+_LOGGER = logging.getLogger(__name__)
+
+# Operations that leave the controller in the same state however many times
+# they run. Reads, absolute quick shower payloads and light levels, and stops
+# are safe to retry; toggles such as massage_toggle are not.
+IDEMPOTENT_ENDPOINTS = frozenset(
+    {
+        "values",
+        "system_info",
+        "controller_error_logs",
+        "konnect_error_logs",
+        "quick_shower",
+        "light_on",
+        "light_off",
+        "stop_shower",
+    }
+)
+
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY_SECONDS = 0.2
+RETRY_MAX_DELAY_SECONDS = 1.0
+RETRY_BUDGET_SECONDS = 10.0
+HEDGE_PERCENTILE = 95
+
+REQUEST_BUDGET_RATE = 2.0
+REQUEST_BUDGET_BURST = 8
+REQUEST_BUDGET_RESERVE = 3
+
+READ_CACHE_TTL_SECONDS = 0.5
+
+# Payloads larger than this are decoded and fingerprinted in the executor.
+DECODE_EXECUTOR_THRESHOLD_BYTES = 64 * 1024
+
+PROBE_CACHE_TTL_SECONDS = 60.0
+
+RESOLVER_TTL_SECONDS = 300.0
+RESOLVER_TIMEOUT_SECONDS = 5.0
+
+PRIORITY_COMMAND = "command"
+PRIORITY_BACKGROUND = "background"
+
+TIMEOUT_FLOOR_SECONDS = 1.5
+TIMEOUT_CEILING_SECONDS = 10.0
+TIMEOUT_PERCENTILE = 99
+TIMEOUT_MULTIPLIER = 3.0
+TIMEOUT_MIN_SAMPLES = 20
+TIMEOUT_MAX_BACKOFF_STEPS = 4
+
+
+@dataclass(slots=True)
+class EndpointTimeout:
+    """Observed latency and the current timeout for a single endpoint."""
+
+    timeout: float
+    samples: RollingStats = field(default_factory=RollingStats)
+    consecutive_timeouts: int = 0
+
+
+class AdaptiveTimeouts:
+    """Per-endpoint timeouts derived from a rolling latency distribution.
+
+    Until an endpoint has enough successful samples it uses the ceiling. After
+    that its timeout is the chosen percentile times a multiplier, clamped to the
+    floor and ceiling. Each consecutive timeout doubles the value (up to the
+    ceiling) so a controller that has genuinely slowed down isn't cut off forever.
+    """
+
+    def __init__(
+        self,
+        floor: float = TIMEOUT_FLOOR_SECONDS,
+        ceiling: float = TIMEOUT_CEILING_SECONDS,
+        percentile: float = TIMEOUT_PERCENTILE,
+        multiplier: float = TIMEOUT_MULTIPLIER,
+        min_samples: int = TIMEOUT_MIN_SAMPLES,
+    ) -> None:
+        """Initialize the timeout policy."""
+        self.floor = floor
+        self.ceiling = ceiling
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self.endpoints: dict[str, EndpointTimeout] = {}
+
+    def _endpoint(self, name: str) -> EndpointTimeout:
+        """Return the state for an endpoint, creating it on first use."""
+        state = self.endpoints.get(name)
+        if state is None:
+            state = self.endpoints[name] = EndpointTimeout(timeout=self.ceiling)
+        return state
+
+    def timeout(self, name: str) -> float:
+        """Return the timeout to use for the next call to an endpoint."""
+        state = self.endpoints.get(name)
+        if state is None:
+            return self.ceiling
+        steps = min(state.consecutive_timeouts, TIMEOUT_MAX_BACKOFF_STEPS)
+        return min(self.ceiling, state.timeout * 2**steps)
+
+    def record_success(self, name: str, duration: float) -> None:
+        """Record a successful call and recompute the endpoint's timeout."""
+        state = self._endpoint(name)
+        state.samples.observe(duration)
+        state.consecutive_timeouts = 0
+        if len(state.samples.samples) < self.min_samples:
+            return
+        latency = state.samples.percentile(self.percentile) or 0.0
+        state.timeout = min(self.ceiling, max(self.floor, latency * self.multiplier))
+
+    def record_timeout(self, name: str) -> None:
+        """Record a timed-out call so the next attempt waits longer."""
+        self._endpoint(name).consecutive_timeouts += 1
+
+    def hedge_delay(self, name: str) -> float | None:
+        """Return how long to wait before hedging a read, once enough is known."""
+        state = self.endpoints.get(name)
+        if state is None or len(state.samples.samples) < self.min_samples:
+            return None
+        return state.samples.percentile(HEDGE_PERCENTILE)
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the current timeouts."""
+        return {
+            "floor": self.floor,
+            "ceiling": self.ceiling,
+            "percentile": self.percentile,
+            "multiplier": self.multiplier,
+            "endpoints": {
+                name: {
+                    "timeout": round(self.timeout(name), 3),
+                    "samples": len(state.samples.samples),
+                    "latency": state.samples.as_dict(),
+                    "consecutive_timeouts": state.consecutive_timeouts,
+                }
+                for name, state in sorted(self.endpoints.items())
+            },
+        }
+
+
+def bytes_fingerprint(encoded: bytes) -> str:
+    """Return a short content hash of an encoded payload."""
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def payload_fingerprint(payload: object) -> tuple[str, int]:
+    """Return a short content hash of a decoded API response and its size."""
+    encoded = json_bytes(payload)
+    return bytes_fingerprint(encoded), len(encoded)
+
+
+def decode_text_payload(payload: str | bytes) -> Any:
+    """Decode a text response, parsing it as JSON when it looks like JSON."""
+    text = (
+        payload.decode("utf-8", errors="replace")
+        if isinstance(payload, bytes)
+        else payload
+    )
+    stripped = text.lstrip()
+    if stripped[:1] in ("{", "["):
+        try:
+            return json_loads(stripped)
+        except JSON_DECODE_EXCEPTIONS:
+            pass
+    return text
+
+
+def retry_delay(attempt: int) -> float:
+    """Return a full-jitter exponential backoff delay for a retry attempt."""
+    return random.uniform(
+        0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2**attempt)
+    )
+
+
+class RequestBudget:
+    """Token bucket limiting the request rate to a single controller.
+
+    Background work (polls, diagnostics, config flow probes) only spends tokens
+    while more than the reserve is left, so user commands can still go out
+    immediately during a burst of automation or refresh traffic.
+    """
+
+    def __init__(
+        self,
+        rate: float = REQUEST_BUDGET_RATE,
+        burst: int = REQUEST_BUDGET_BURST,
+        reserve: int = REQUEST_BUDGET_RESERVE,
+    ) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self.granted = {PRIORITY_COMMAND: 0, PRIORITY_BACKGROUND: 0}
+        self.throttled = {PRIORITY_COMMAND: 0, PRIORITY_BACKGROUND: 0}
+        self.skipped = 0
+        self.throttle_wait = RollingStats()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _floor(self, priority: str) -> int:
+        """Return the tokens a request of this priority must leave in the bucket."""
+        return self.reserve if priority == PRIORITY_BACKGROUND else 0
+
+    def try_acquire(self, priority: str = PRIORITY_BACKGROUND) -> bool:
+        """Take a token without waiting, or count the request as skipped."""
+        self._refill()
+        if self.tokens - 1 < self._floor(priority):
+            self.skipped += 1
+            return False
+        self.tokens -= 1
+        self.granted[priority] += 1
+        return True
+
+    async def async_acquire(self, priority: str = PRIORITY_BACKGROUND) -> None:
+        """Take a token, waiting for the bucket to refill if needed."""
+        floor = self._floor(priority)
+        started: float | None = None
+        while True:
+            self._refill()
+            if self.tokens - 1 >= floor:
+                break
+            if started is None:
+                started = time.monotonic()
+                self.throttled[priority] += 1
+            await asyncio.sleep((floor + 1 - self.tokens) / self.rate)
+
+        self.tokens -= 1
+        self.granted[priority] += 1
+        if started is not None:
+            self.throttle_wait.observe(time.monotonic() - started)
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the budget."""
+        self._refill()
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "reserve": self.reserve,
+            "tokens": round(self.tokens, 2),
+            "granted": dict(self.granted),
+            "throttled": dict(self.throttled),
+            "skipped": self.skipped,
+            "throttle_wait": self.throttle_wait.as_dict(),
+        }
+
+
+class SingleFlight:
+    """Share one in-flight read between concurrent callers and cache it briefly."""
+
+    def __init__(self, ttl: float = READ_CACHE_TTL_SECONDS) -> None:
+        """Initialize an empty single-flight group."""
+        self.ttl = ttl
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self.shared: dict[str, int] = {}
+        self.cached: dict[str, int] = {}
+
+    async def async_call(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached or in-flight result for the key, or fetch it."""
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            self.cached[key] = self.cached.get(key, 0) + 1
+            return cached[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared[key] = self.shared.get(key, 0) + 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not inflight.cancelled() or (current and current.cancelling()):
+                    raise
+                # The caller that made the request was cancelled; make our own.
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            # Mark the error retrieved so a flight nobody joined doesn't warn.
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        future.set_result(result)
+        self._cache[key] = (time.monotonic(), result)
+        return result
+
+    def invalidate(self) -> None:
+        """Drop cached results, for example after a command changed state."""
+        self._cache.clear()
+
+    @property
+    def saved(self) -> int:
+        """Return how many requests were avoided."""
+        return sum(self.shared.values()) + sum(self.cached.values())
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the requests saved."""
+        return {
+            "ttl": self.ttl,
+            "saved": self.saved,
+            "shared": dict(sorted(self.shared.items())),
+            "cached": dict(sorted(self.cached.items())),
+        }
+
+
+class HostResolver:
+    """Resolve a controller hostname to an address and cache it for a TTL.
+
+    IP addresses are returned as is. If a lookup fails, the last known
+    address keeps being used so a DNS hiccup doesn't take the controller
+    offline.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, host: str, ttl: float = RESOLVER_TTL_SECONDS
+    ) -> None:
+        """Initialize the resolver for a host."""
+        self.hass = hass
+        self.host = host
+        self.ttl = ttl
+        self.address: str | None = None
+        self.resolved: float | None = None
+        self.lookups = 0
+        self.failures = 0
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            self.is_ip = False
+        else:
+            self.is_ip = True
+            self.address = host
+
+    async def async_resolve(self) -> str:
+        """Return the cached address or look the hostname up again."""
+        if self.is_ip:
+            return self.host
+        if (
+            self.address is not None
+            and self.resolved is not None
+            and time.monotonic() - self.resolved < self.ttl
+        ):
+            return self.address
+
+        self.lookups += 1
+        try:
+            async with asyncio.timeout(RESOLVER_TIMEOUT_SECONDS):
+                infos = await self.hass.loop.getaddrinfo(
+                    self.host, None, type=socket.SOCK_STREAM
+                )
+        except (OSError, TimeoutError, UnicodeError) as err:
+            return self._lookup_failed(err)
+        if not infos:
+            return self._lookup_failed("no addresses returned")
+
+        self.address = infos[0][4][0]
+        self.resolved = time.monotonic()
+        return self.address
+
+    def _lookup_failed(self, reason: object) -> str:
+        """Count a failed lookup and fall back to the last known address."""
+        self.failures += 1
+        _LOGGER.debug("Unable to resolve Kohler host %s: %s", self.host, reason)
+        return self.address or self.host
+
+    def as_dict(self) -> dict[str, object]:
+        """Return a JSON-friendly representation of the resolver."""
+        return {
+            "is_ip": self.is_ip,
+            "ttl": self.ttl,
+            "lookups": self.lookups,
+            "failures": self.failures,
+        }
+
+
+@callback
+def async_get_request_budget(hass: HomeAssistant, host: str) -> RequestBudget:
+    """Return the shared request budget for a controller host."""
+    budgets: dict[str, RequestBudget] = hass.data.setdefault(DATA_REQUEST_BUDGETS, {})
+    budget = budgets.get(host)
+    if budget is None:
+        budget = budgets[host] = RequestBudget()
+    return budget
+
+
+@callback
+def async_drop_request_budget(hass: HomeAssistant, host: str) -> None:
+    """Forget the request budget of a host that is no longer in use."""
+    hass.data.get(DATA_REQUEST_BUDGETS, {}).pop(host, None)
+
+
+@callback
+def async_cache_probe(hass: HomeAssistant, host: str, values: dict[str, Any]) -> None:
+    """Remember a setup probe's values() response for a host."""
+    probes: dict[str, tuple[float, dict[str, Any]]] = hass.data.setdefault(
+        DATA_PROBE_CACHE, {}
+    )
+    now = time.monotonic()
+    for expired in [
+        cached_host
+        for cached_host, (cached, _) in probes.items()
+        if now - cached > PROBE_CACHE_TTL_SECONDS
+    ]:
+        del probes[expired]
+    probes[host] = (now, values)
+
+
+@callback
+def async_get_probe(
+    hass: HomeAssistant, host: str, pop: bool = False
+) -> dict[str, Any] | None:
+    """Return a recent setup probe response for a host, if there is one."""
+    probes: dict[str, tuple[float, dict[str, Any]]] = hass.data.get(
+        DATA_PROBE_CACHE, {}
+    )
+    probe = probes.pop(host, None) if pop else probes.get(host)
+    if probe is None or time.monotonic() - probe[0] > PROBE_CACHE_TTL_SECONDS:
+        return None
+    return probe[1]
@@ -0,0 +1,149 @@
+"""Learned shower usage patterns for predictive polling."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY_SECONDS = 300
+
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+
+# Don't change the poll interval until a week of starts has been seen.
+MIN_TRAINING_DAYS = 7
+MIN_TRAINING_STARTS = 5
+
+# A slot is likely when showers start in it at least once every four weeks.
+LIKELY_STARTS_PER_WEEK = 0.25
+LIKELY_LOOKAHEAD_SLOTS = 1
+
+# Poll slowly when nothing has started in the next two hours of past weeks,
+# or when nothing has started at all for two days.
+QUIET_LOOKAHEAD_SLOTS = 4
+QUIET_AFTER = timedelta(days=2)
+QUIET_INTERVAL_SECONDS = 300.0
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def async_get_usage_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store that persists a controller's usage histogram."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.usage.{entry_id}")
+
+
+def usage_slot(when: datetime) -> int:
+    """Return the weekly half-hour slot containing a local time."""
+    return (
+        when.weekday() * SLOTS_PER_DAY + (when.hour * 60 + when.minute) // SLOT_MINUTES
+    )
+
+
+class UsageHistogram:
+    """Count shower starts per weekday and half hour of the day."""
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * SLOTS_PER_WEEK
+        self.starts = 0
+        self.since: datetime | None = None
+        self.last_start: datetime | None = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> UsageHistogram:
+        """Restore a histogram saved by as_dict."""
+        histogram = cls()
+        counts = data.get("counts")
+        if isinstance(counts, list) and len(counts) == SLOTS_PER_WEEK:
+            histogram.counts = [int(count) for count in counts]
+            histogram.starts = sum(histogram.counts)
+        histogram.since = _parse_datetime(data.get("since"))
+        histogram.last_start = _parse_datetime(data.get("last_start"))
+        return histogram
+
+    def record_start(self, when: datetime) -> None:
+        """Count a shower that started at the given local time."""
+        self.counts[usage_slot(when)] += 1
+        self.starts += 1
+        self.last_start = when
+
+    def weeks_observed(self, now: datetime) -> float:
+        """Return how many weeks of history the counts cover, at least one."""
+        if self.since is None:
+            return 1.0
+        return max(1.0, (now - self.since) / timedelta(weeks=1))
+
+    def is_trained(self, now: datetime) -> bool:
+        """Return whether there is enough history to predict from."""
+        return (
+            self.since is not None
+            and now - self.since >= timedelta(days=MIN_TRAINING_DAYS)
+            and self.starts >= MIN_TRAINING_STARTS
+        )
+
+    def rate(self, now: datetime, slots: int) -> float:
+        """Return the highest weekly start rate from now over the next slots."""
+        first = usage_slot(now)
+        peak = max(
+            self.counts[(first + offset) % SLOTS_PER_WEEK] for offset in range(slots)
+        )
+        return peak / self.weeks_observed(now)
+
+    def suggest_interval(self, now: datetime, idle: float, active: float) -> float:
+        """Return the poll interval to use while no shower is running."""
+        if not self.is_trained(now):
+            return idle
+        if self.rate(now, LIKELY_LOOKAHEAD_SLOTS + 1) >= LIKELY_STARTS_PER_WEEK:
+            return active
+        if (
+            self.last_start is not None and now - self.last_start >= QUIET_AFTER
+        ) or not self.rate(now, QUIET_LOOKAHEAD_SLOTS + 1):
+            return max(idle, QUIET_INTERVAL_SECONDS)
+        return idle
+
+    def likely_windows(self, now: datetime) -> list[str]:
+        """Return the slots where a shower is likely to start."""
+        weeks = self.weeks_observed(now)
+        return [
+            f"{_WEEKDAYS[slot // SLOTS_PER_DAY]} "
+            f"{(slot % SLOTS_PER_DAY) * SLOT_MINUTES // 60:02d}:"
+            f"{(slot % SLOTS_PER_DAY) * SLOT_MINUTES % 60:02d}"
+            for slot, count in enumerate(self.counts)
+            if count / weeks >= LIKELY_STARTS_PER_WEEK
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly representation for storage."""
+        return {
+            "counts": self.counts,
+            "since": None if self.since is None else self.since.isoformat(),
+            "last_start": (
+                None if self.last_start is None else self.last_start.isoformat()
+            ),
+        }
+
+    def summary(self, now: datetime) -> dict[str, Any]:
+        """Return a diagnostics summary of the learned pattern."""
+        return {
+            "starts": self.starts,
+            "since": None if self.since is None else self.since.isoformat(),
+            "last_start": (
+                None if self.last_start is None else self.last_start.isoformat()
+            ),
+            "trained": self.is_trained(now),
+            "likely_windows": self.likely_windows(now),
+        }
+
+
+def _parse_datetime(value: Any) -> datetime | None:
+    """Parse a stored ISO timestamp."""
+    return dt_util.parse_datetime(value) if isinstance(value, str) else None
@@ -76,11 +76,7 @@ class KohlerValve(CoordinatorEntity, ValveEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        is_on = self.coordinator.isOutletOn(
-            self._valve, self._outlet
-        ) and self.coordinator.isValveOn(self._valve)
-
-        self._attr_is_closed = not is_on
+        self._attr_is_closed = not self._is_open()
         super()._handle_coordinator_update()
 
     @property
@@ -99,12 +95,24 @@ class KohlerValve(CoordinatorEntity, ValveEntity):
             **self.coordinator.getValveSettingsAttributes(self._valve),
         }
 
+    def _is_open(self) -> bool:
+        """Return whether the coordinator reports this outlet as flowing."""
+        return self.coordinator.isOutletOn(
+            self._valve, self._outlet
+        ) and self.coordinator.isValveOn(self._valve)
+
     async def async_open_valve(self, **kwargs) -> None:
         """Open the valve."""
-        await self.coordinator.openOutlet(self._valve, self._outlet)
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "valve.open", self.entity_id, expect=self._is_open
+        ):
+            await self.coordinator.openOutlet(self._valve, self._outlet)
+            await self.coordinator.async_request_post_command_refresh()
 
     async def async_close_valve(self, **kwargs) -> None:
         """Close the valve."""
-        await self.coordinator.closeOutlet(self._valve, self._outlet)
-        await self.coordinator.async_request_post_command_refresh()
+        with self.coordinator.tracer.trace(
+            "valve.close", self.entity_id, expect=lambda: not self._is_open()
+        ):
+            await self.coordinator.closeOutlet(self._valve, self._outlet)
+            await self.coordinator.async_request_post_command_refresh()
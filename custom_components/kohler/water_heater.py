@@ -104,10 +104,15 @@ class KohlerWaterHeater(CoordinatorEntity, WaterHeaterEntity):
     async def async_set_temperature(self, **kwargs):
         """Set new target temperatures."""
         temp = kwargs.get(ATTR_TEMPERATURE)
-        if temp is not None:
-            await self.coordinator.setTargetTemperature(temp)
+        with self.coordinator.tracer.trace(
+            "water_heater.set_temperature",
+            self.entity_id,
+            expect=lambda: self.coordinator.getTargetTemperature() == temp,
+        ):
+            if temp is not None:
+                await self.coordinator.setTargetTemperature(temp)
 
-        await self.coordinator.async_request_post_command_refresh()
+            await self.coordinator.async_request_post_command_refresh()
 
     @property
     def min_temp(self):
@@ -144,12 +149,20 @@ class KohlerWaterHeater(CoordinatorEntity, WaterHeaterEntity):
 
     async def async_set_operation_mode(self, operation_mode):
         """Set operation mode."""
-        if operation_mode == STATE_ON:
-            await self.coordinator.turnOnShower(self.coordinator.getTargetTemperature())
-        else:
-            await self.coordinator.turnOffShower()
-
-        await self.coordinator.async_request_post_command_refresh()
+        shower_on = operation_mode == STATE_ON
+        with self.coordinator.tracer.trace(
+            "water_heater.set_operation_mode",
+            self.entity_id,
+            expect=lambda: self.coordinator.isShowerOn() == shower_on,
+        ):
+            if shower_on:
+                await self.coordinator.turnOnShower(
+                    self.coordinator.getTargetTemperature()
+                )
+            else:
+                await self.coordinator.turnOffShower()
+
+            await self.coordinator.async_request_post_command_refresh()
 
     @property
     def icon(self):
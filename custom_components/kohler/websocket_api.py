@@ -0,0 +1,69 @@
+"""WebSocket API for the Kohler integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_KOHLER, WS_TYPE_SUBSCRIBE
+from .coordinator import KohlerDataUpdateCoordinator
+from .snapshot import TOPICS, build_snapshot, diff_snapshot
+
+ATTR_TOPICS = "topics"
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the Kohler WebSocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SUBSCRIBE,
+        vol.Optional(ATTR_TOPICS, default=list(TOPICS)): vol.All(
+            [vol.In(TOPICS)], vol.Length(min=1)
+        ),
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send a snapshot of the requested topics, then only what changes."""
+    coordinator = hass.data.get(DATA_KOHLER)
+    if not isinstance(coordinator, KohlerDataUpdateCoordinator):
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            "The Kohler integration is not loaded",
+        )
+        return
+
+    topics = tuple(dict.fromkeys(msg[ATTR_TOPICS]))
+    last = build_snapshot(coordinator, topics)
+
+    @callback
+    def _async_send_diff() -> None:
+        nonlocal last
+        current = build_snapshot(coordinator, topics)
+        diff = diff_snapshot(last, current)
+        last = current
+        if diff:
+            connection.send_message(
+                websocket_api.event_message(msg["id"], {"diff": diff})
+            )
+
+    # Poll listeners run after every poll and push, including ones that only
+    # move diagnostics, so data listeners would just build the diff twice.
+    connection.subscriptions[msg["id"]] = coordinator.async_add_poll_listener(
+        _async_send_diff
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"snapshot": last}))
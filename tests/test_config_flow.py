@@ -1,13 +1,27 @@
 """Test the Kohler config flow."""
 
+import ipaddress
 from unittest.mock import AsyncMock, patch
 
 from homeassistant import config_entries, data_entry_flow
-from homeassistant.const import CONF_HOST
+from homeassistant.const import CONF_HOST, CONF_WEBHOOK_ID
 from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.kohler.const import DOMAIN, CONF_ACCEPT_LIABILITY_TERMS
+from custom_components.kohler.config_flow import KohlerFlowHandler
+from custom_components.kohler.const import (
+    DOMAIN,
+    CONF_ACCEPT_LIABILITY_TERMS,
+    CONF_FRESHNESS_SLA,
+    CONF_HEDGE_READS,
+    CONF_PERFORMANCE_PROFILE,
+    CONF_PHASE_LOCK,
+    CONF_PREDICTIVE_POLLING,
+    CONF_PUSH_INGEST,
+    CONF_PUSH_SECRET,
+    DATA_PROBE_CACHE,
+    DATA_REQUEST_BUDGETS,
+)
 
 
 async def test_form_valid(hass):
@@ -134,3 +148,241 @@ async def test_dhcp_updates_existing_entry_by_unique_id(hass):
     assert result["type"] == data_entry_flow.FlowResultType.ABORT
     assert result["reason"] == "already_configured"
     assert entry.data[CONF_HOST] == "192.0.2.30"
+
+
+async def test_options_flow_sets_freshness_sla(hass):
+    """The options flow should store the freshness SLA."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Kohler",
+        data={
+            CONF_HOST: "192.0.2.10",
+            CONF_ACCEPT_LIABILITY_TERMS: True,
+        },
+        unique_id="00:11:22:33:44:55",
+        version=3,
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_FRESHNESS_SLA: 20}
+    )
+
+    assert result2["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options == {
+        CONF_FRESHNESS_SLA: 20,
+        CONF_HEDGE_READS: False,
+        CONF_PREDICTIVE_POLLING: True,
+        CONF_PHASE_LOCK: False,
+        CONF_PERFORMANCE_PROFILE: "balanced",
+        CONF_PUSH_INGEST: False,
+    }
+
+
+async def test_options_flow_custom_performance_profile(hass):
+    """Choosing a custom profile should ask for and validate each value."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Kohler",
+        data={
+            CONF_HOST: "192.0.2.10",
+            CONF_ACCEPT_LIABILITY_TERMS: True,
+        },
+        unique_id="00:11:22:33:44:55",
+        version=3,
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_PERFORMANCE_PROFILE: "custom"}
+    )
+    assert result2["type"] == data_entry_flow.FlowResultType.FORM
+    assert result2["step_id"] == "performance"
+
+    custom = {
+        "idle_interval": 20,
+        "active_interval": 30,
+        "active_tail": 60,
+        "quick_shower_debounce": 0.2,
+        "post_command_refresh_delay": 0.5,
+        "request_timeout": 6,
+    }
+    result3 = await hass.config_entries.options.async_configure(
+        result["flow_id"], custom
+    )
+    assert result3["errors"] == {"active_interval": "active_interval_too_long"}
+
+    result4 = await hass.config_entries.options.async_configure(
+        result["flow_id"], {**custom, "active_interval": 4}
+    )
+
+    assert result4["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_PERFORMANCE_PROFILE] == "custom"
+    assert entry.options["active_interval"] == 4.0
+    assert entry.options["request_timeout"] == 6.0
+
+
+async def test_options_flow_push_ingest_keeps_webhook(hass):
+    """Enabling push should show the webhook and keep it across edits and opt-outs."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Kohler",
+        data={
+            CONF_HOST: "192.0.2.10",
+            CONF_ACCEPT_LIABILITY_TERMS: True,
+        },
+        unique_id="00:11:22:33:44:55",
+        version=3,
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_PUSH_INGEST: True}
+    )
+    assert result2["type"] == data_entry_flow.FlowResultType.FORM
+    assert result2["step_id"] == "push"
+
+    result3 = await hass.config_entries.options.async_configure(result["flow_id"], {})
+    assert result3["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    webhook_id = entry.options[CONF_WEBHOOK_ID]
+    secret = entry.options[CONF_PUSH_SECRET]
+    assert result2["description_placeholders"]["secret"] == secret
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_PUSH_INGEST: True, CONF_FRESHNESS_SLA: 30}
+    )
+    await hass.config_entries.options.async_configure(result["flow_id"], {})
+    assert entry.options[CONF_WEBHOOK_ID] == webhook_id
+    assert entry.options[CONF_PUSH_SECRET] == secret
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_PUSH_INGEST: False}
+    )
+    assert entry.options[CONF_WEBHOOK_ID] == webhook_id
+    assert entry.options[CONF_PUSH_SECRET] == secret
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_PUSH_INGEST: True}
+    )
+    await hass.config_entries.options.async_configure(result["flow_id"], {})
+    assert entry.options[CONF_WEBHOOK_ID] == webhook_id
+    assert entry.options[CONF_PUSH_SECRET] == secret
+
+
+async def test_connection_probe_is_reused(hass):
+    """A second probe of the same host should reuse the cached values."""
+    api = AsyncMock()
+    api.values.return_value = {"MAC": "00-11-22-33-44-55"}
+    flow = KohlerFlowHandler()
+    flow.hass = hass
+
+    with patch("custom_components.kohler.config_flow.Kohler", return_value=api):
+        first = await flow.test_connection("192.0.2.40")
+        second = await flow.test_connection("192.0.2.40")
+
+    assert first == second == "00:11:22:33:44:55"
+    api.values.assert_awaited_once()
+
+
+async def test_network_scan_lists_controllers(hass):
+    """Scanning a network range should offer the controllers it finds."""
+
+    async def _port_open(host):
+        return host in ("192.0.2.5", "192.0.2.9")
+
+    async def _probe_mac(self, host, **kwargs):
+        return "00:11:22:33:44:55" if host == "192.0.2.5" else None
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    with (
+        patch(
+            "custom_components.kohler.config_flow._async_port_open",
+            side_effect=_port_open,
+        ),
+        patch(
+            "custom_components.kohler.config_flow.KohlerFlowHandler._async_probe_mac",
+            new=_probe_mac,
+        ),
+        patch(
+            "custom_components.kohler.async_setup_entry",
+            return_value=True,
+        ),
+    ):
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {CONF_HOST: "192.0.2.0/28", CONF_ACCEPT_LIABILITY_TERMS: True},
+        )
+        assert result2["type"] == data_entry_flow.FlowResultType.FORM
+        assert result2["step_id"] == "scan"
+
+        result3 = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_HOST: "192.0.2.5"}
+        )
+        await hass.async_block_till_done()
+
+    assert result3["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert result3["data"] == {
+        CONF_HOST: "192.0.2.5",
+        CONF_ACCEPT_LIABILITY_TERMS: True,
+    }
+    assert result3["result"].unique_id == "00:11:22:33:44:55"
+
+
+async def test_network_scan_skips_hosts_that_are_not_controllers(hass):
+    """Odd responses shouldn't abort a scan or leave budgets and probes behind."""
+    responses = {
+        "192.0.2.1": {"MAC": "00-11-22-33-44-55"},
+        "192.0.2.2": ["not", "a", "controller"],
+        "192.0.2.3": {"status": "ok"},
+        "192.0.2.4": RuntimeError("unexpected"),
+    }
+
+    def _kohler(kohler_host, timeout):
+        api = AsyncMock()
+        api.values.side_effect = [responses[kohler_host]]
+        return api
+
+    async def _port_open(host):
+        return host in responses
+
+    flow = KohlerFlowHandler()
+    flow.hass = hass
+    with (
+        patch("custom_components.kohler.config_flow.Kohler", side_effect=_kohler),
+        patch(
+            "custom_components.kohler.config_flow._async_port_open",
+            side_effect=_port_open,
+        ),
+    ):
+        controllers = await flow._async_scan_network(
+            ipaddress.ip_network("192.0.2.0/29")
+        )
+
+    assert controllers == {"192.0.2.1": "00:11:22:33:44:55"}
+    assert DATA_REQUEST_BUDGETS not in hass.data
+    assert set(hass.data[DATA_PROBE_CACHE]) == {"192.0.2.1"}
+
+
+async def test_network_scan_rejects_large_ranges(hass):
+    """Ranges over the scan limit should be rejected without probing."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_HOST: "10.0.0.0/16", CONF_ACCEPT_LIABILITY_TERMS: True},
+    )
+
+    assert result2["type"] == data_entry_flow.FlowResultType.FORM
+    assert result2["errors"] == {CONF_HOST: "invalid_network"}
@@ -3,12 +3,36 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import AsyncMock
+from datetime import timedelta
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
 
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 import pytest
 
 from custom_components.kohler import coordinator as coordinator_module
+from custom_components.kohler.const import (
+    CONF_HEDGE_READS,
+    CONF_PHASE_LOCK,
+    EVENT_HOT_WATER_READY,
+    EVENT_KOHLER,
+)
 from custom_components.kohler.coordinator import KohlerDataUpdateCoordinator
+from custom_components.kohler.freshness import FreshnessTracker
+from custom_components.kohler.lifecycle import ShowerLifecycle, ShowerState
+from custom_components.kohler.metrics import ApiMetrics
+from custom_components.kohler.performance import PerformanceProfile
+from custom_components.kohler.sessions import SessionTracker
+from custom_components.kohler.tracing import CommandTracer
+from custom_components.kohler.usage import UsageHistogram
+from custom_components.kohler.transport import (
+    AdaptiveTimeouts,
+    HostResolver,
+    RequestBudget,
+    SingleFlight,
+)
 
 
 def test_get_installed_valve_outlets_includes_highest_open_port():
@@ -30,11 +54,36 @@ def test_get_installed_valve_outlets_includes_highest_open_port():
 def _build_command_test_coordinator() -> KohlerDataUpdateCoordinator:
     coordinator = object.__new__(KohlerDataUpdateCoordinator)
     coordinator.api = AsyncMock()
+    coordinator.config_entry = SimpleNamespace(options={})
     coordinator._api_lock = asyncio.Lock()
+    coordinator.metrics = ApiMetrics()
+    coordinator.tracer = CommandTracer()
+    coordinator.profile = PerformanceProfile()
+    coordinator.usage = UsageHistogram()
+    coordinator._usage_store = Mock()
+    coordinator.sessions = SessionTracker()
+    coordinator._sessions_store = Mock()
+    coordinator._shower_was_on = None
+    coordinator._phase_period = None
+    coordinator.lifecycle = ShowerLifecycle()
+    coordinator._last_event_snapshot = None
+    coordinator._device_id = "device-1"
+    coordinator._last_push = None
+    coordinator.timeouts = AdaptiveTimeouts()
+    coordinator.budget = RequestBudget()
+    coordinator.reads = SingleFlight()
     coordinator._pending_quick_shower = None
     coordinator._pending_quick_shower_task = None
     coordinator._pending_quick_shower_waiters = []
+    coordinator._pending_quick_shower_traces = []
     coordinator._post_command_refresh_task = None
+    coordinator._max_age_refresh_task = None
+    coordinator._last_poll_unchanged = False
+    coordinator._payload_sizes = {}
+    coordinator._seed_values = None
+    coordinator.host = "192.0.2.10"
+    coordinator.resolver = HostResolver(None, coordinator.host)
+    coordinator._address = coordinator.host
     coordinator._selected_outlet_state = {1: 0, 2: 0}
     coordinator._target_temperature = None
     coordinator._values = {
@@ -53,14 +102,21 @@ def _build_command_test_coordinator() -> KohlerDataUpdateCoordinator:
     }
     coordinator._valve1_outlet_mappings = [1, 2, 3, 4]
     coordinator._valve2_outlet_mappings = []
+    coordinator.data = None
+    coordinator.fingerprints = {}
+    coordinator.freshness = FreshnessTracker()
+    coordinator.update_interval = timedelta(seconds=15)
+    coordinator._last_shower_on_time = 0
+    coordinator._freshness_check_unsub = None
+    coordinator._poll_listeners = []
     return coordinator
 
 
 @pytest.mark.asyncio
-async def test_open_outlet_debounces_to_latest_desired_state(monkeypatch):
+async def test_open_outlet_debounces_to_latest_desired_state():
     """Rapid outlet commands should collapse into one final quick_shower call."""
-    monkeypatch.setattr(coordinator_module, "QUICK_SHOWER_DEBOUNCE_SECONDS", 0)
     coordinator = _build_command_test_coordinator()
+    coordinator.profile = PerformanceProfile(quick_shower_debounce=0)
 
     await asyncio.gather(
         coordinator.openOutlet(1, 1),
@@ -77,10 +133,10 @@ async def test_open_outlet_debounces_to_latest_desired_state(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_set_target_temperature_uses_single_quick_shower_request(monkeypatch):
+async def test_set_target_temperature_uses_single_quick_shower_request():
     """Temperature changes while running should send one coalesced payload."""
-    monkeypatch.setattr(coordinator_module, "QUICK_SHOWER_DEBOUNCE_SECONDS", 0)
     coordinator = _build_command_test_coordinator()
+    coordinator.profile = PerformanceProfile(quick_shower_debounce=0)
     coordinator._sysInfo["valve1outlet1"] = True
 
     await coordinator.setTargetTemperature(102)
@@ -95,10 +151,10 @@ async def test_set_target_temperature_uses_single_quick_shower_request(monkeypat
 
 
 @pytest.mark.asyncio
-async def test_turn_on_shower_uses_default_control_outlet(monkeypatch):
+async def test_turn_on_shower_uses_default_control_outlet():
     """Starting the shower while off should use the configured default outlet."""
-    monkeypatch.setattr(coordinator_module, "QUICK_SHOWER_DEBOUNCE_SECONDS", 0)
     coordinator = _build_command_test_coordinator()
+    coordinator.profile = PerformanceProfile(quick_shower_debounce=0)
     coordinator._sysInfo["valve1_Currentstatus"] = "Off"
 
     await coordinator.turnOnShower()
@@ -113,10 +169,10 @@ async def test_turn_on_shower_uses_default_control_outlet(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_open_outlet_while_off_starts_only_requested_outlet(monkeypatch):
+async def test_open_outlet_while_off_starts_only_requested_outlet():
     """Opening one outlet while off should not inherit prior multi-outlet state."""
-    monkeypatch.setattr(coordinator_module, "QUICK_SHOWER_DEBOUNCE_SECONDS", 0)
     coordinator = _build_command_test_coordinator()
+    coordinator.profile = PerformanceProfile(quick_shower_debounce=0)
     coordinator._sysInfo["valve1_Currentstatus"] = "Off"
     coordinator._selected_outlet_state[1] = 234
 
@@ -132,10 +188,10 @@ async def test_open_outlet_while_off_starts_only_requested_outlet(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_turn_off_shower_clears_pending_quick_shower(monkeypatch):
+async def test_turn_off_shower_clears_pending_quick_shower():
     """Stopping the shower should win over any queued outlet change."""
-    monkeypatch.setattr(coordinator_module, "QUICK_SHOWER_DEBOUNCE_SECONDS", 0.05)
     coordinator = _build_command_test_coordinator()
+    coordinator.profile = PerformanceProfile(quick_shower_debounce=0.05)
 
     outlet_task = asyncio.create_task(coordinator.openOutlet(1, 1))
     await asyncio.sleep(0)
@@ -147,10 +203,10 @@ async def test_turn_off_shower_clears_pending_quick_shower(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_post_command_refresh_is_coalesced(monkeypatch):
+async def test_post_command_refresh_is_coalesced():
     """Multiple command refresh requests should collapse into one poll."""
-    monkeypatch.setattr(coordinator_module, "POST_COMMAND_REFRESH_DELAY_SECONDS", 0)
     coordinator = _build_command_test_coordinator()
+    coordinator.profile = PerformanceProfile(post_command_refresh_delay=0)
     coordinator.async_request_refresh = AsyncMock()
 
     await asyncio.gather(
@@ -160,3 +216,478 @@ async def test_post_command_refresh_is_coalesced(monkeypatch):
     )
 
     coordinator.async_request_refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_api_calls_record_endpoint_metrics(monkeypatch):
+    """Commands should record per-endpoint outcomes and lock waits."""
+    monkeypatch.setattr(coordinator_module, "retry_delay", lambda attempt: 0)
+    coordinator = _build_command_test_coordinator()
+    coordinator.profile = PerformanceProfile(quick_shower_debounce=0)
+    coordinator.api.stop_shower.side_effect = TimeoutError
+
+    await coordinator.openOutlet(1, 1)
+    with pytest.raises(HomeAssistantError):
+        await coordinator.turnOffShower()
+
+    assert coordinator.metrics.endpoint("quick_shower").success == 1
+    assert coordinator.metrics.endpoint("stop_shower").timeout == 3
+    assert coordinator.metrics.endpoint("stop_shower").retries == 2
+    assert coordinator.metrics.lock_wait.count == 2
+    assert coordinator.metrics.error_rate() == 0.75
+    assert coordinator.timeouts.endpoints["stop_shower"].consecutive_timeouts == 3
+
+
+@pytest.mark.asyncio
+async def test_only_idempotent_commands_are_retried(monkeypatch):
+    """Transient errors should be retried for safe commands but not toggles."""
+    monkeypatch.setattr(coordinator_module, "retry_delay", lambda attempt: 0)
+    coordinator = _build_command_test_coordinator()
+    coordinator.api.light_on.side_effect = [OSError("dropped"), None]
+    coordinator.api.massage_toggle.side_effect = OSError("dropped")
+
+    await coordinator.light_on(1, 50)
+    with pytest.raises(HomeAssistantError):
+        await coordinator.massage_toggle()
+
+    assert coordinator.api.light_on.await_count == 2
+    assert coordinator.api.massage_toggle.await_count == 1
+    assert coordinator.metrics.endpoint("light_on").retries == 1
+    assert coordinator.metrics.endpoint("massage_toggle").retries == 0
+
+
+@pytest.mark.asyncio
+async def test_polled_reads_are_retried_once(monkeypatch):
+    """A dropped poll read should get one quick retry, not the full backoff."""
+    monkeypatch.setattr(coordinator_module, "retry_delay", lambda attempt: 0)
+    coordinator = _build_command_test_coordinator()
+    coordinator.api.values.side_effect = [OSError("dropped"), {"MAC": "mac"}]
+    coordinator.api.system_info.side_effect = OSError("dropped")
+
+    assert await coordinator._async_call_api("values", coordinator.api.values) == {
+        "MAC": "mac"
+    }
+    with pytest.raises(OSError):
+        await coordinator._async_call_api("system_info", coordinator.api.system_info)
+
+    assert coordinator.metrics.endpoint("values").retries == 1
+    assert coordinator.api.system_info.await_count == 2
+    assert coordinator.metrics.endpoint("system_info").retries == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_at_the_total_deadline(monkeypatch):
+    """The retry budget should cover backoff sleeps, not just attempts."""
+    monkeypatch.setattr(coordinator_module, "retry_delay", lambda attempt: 5)
+    monkeypatch.setattr(coordinator_module, "RETRY_BUDGET_SECONDS", 0.01)
+    coordinator = _build_command_test_coordinator()
+    coordinator.api.light_on.side_effect = OSError("dropped")
+
+    with pytest.raises(HomeAssistantError):
+        await coordinator.light_on(1, 50)
+
+    assert coordinator.api.light_on.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_command_trace_spans_debounce_lock_and_call():
+    """Traced commands should record each stage of the coalesced send."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.profile = PerformanceProfile(quick_shower_debounce=0)
+
+    with coordinator.tracer.trace(
+        "valve.open", expect=lambda: coordinator.isOutletOn(1, 1)
+    ) as trace:
+        await coordinator.openOutlet(1, 1)
+
+    assert [span.name for span in trace.spans] == [
+        "debounce",
+        "api_lock_wait",
+        "quick_shower",
+    ]
+    assert trace.outcome == "pending"
+
+    coordinator._sysInfo["valve1outlet1"] = True
+    coordinator.tracer.check_pending(trace.command_done)
+
+    assert trace.outcome == "confirmed"
+    assert coordinator.tracer.as_dict()["recent"][0]["trace_id"] == trace.trace_id
+
+
+@pytest.mark.asyncio
+async def test_slow_reads_are_hedged_when_enabled():
+    """A read slower than its usual p95 should race a second request."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.config_entry = SimpleNamespace(options={CONF_HEDGE_READS: True})
+    coordinator.timeouts = AdaptiveTimeouts(min_samples=1)
+    coordinator.timeouts.record_success("values", 0.01)
+    responses = iter([3600, 0])
+
+    async def _values():
+        await asyncio.sleep(next(responses))
+        return {"MAC": "00:11:22:33:44:55"}
+
+    coordinator.api.values = _values
+
+    assert await coordinator._async_call_api("values", coordinator.api.values) == {
+        "MAC": "00:11:22:33:44:55"
+    }
+    assert coordinator.metrics.endpoint("values").hedges == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_request_until_a_command():
+    """Identical reads should share one request and be re-fetched after commands."""
+    coordinator = _build_command_test_coordinator()
+    release = asyncio.Event()
+
+    async def _values():
+        await release.wait()
+        return {"MAC": "00:11:22:33:44:55"}
+
+    coordinator.api.values = AsyncMock(side_effect=_values)
+
+    first = asyncio.create_task(
+        coordinator._async_call_api("values", coordinator.api.values)
+    )
+    second = asyncio.create_task(
+        coordinator._async_call_api("values", coordinator.api.values)
+    )
+    await asyncio.sleep(0)
+    release.set()
+    assert await first == await second
+    await coordinator._async_call_api("values", coordinator.api.values)
+
+    assert coordinator.api.values.await_count == 1
+    assert coordinator.reads.shared == {"values": 1}
+    assert coordinator.reads.cached == {"values": 1}
+
+    await coordinator.light_off(1)
+    await coordinator._async_call_api("values", coordinator.api.values)
+
+    assert coordinator.api.values.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_unchanged_poll_skips_mapping_and_fan_out():
+    """A poll matching the previous responses should return the same data."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.api.values.return_value = dict(coordinator._values)
+    coordinator.api.system_info.return_value = dict(coordinator._sysInfo)
+
+    coordinator.data = await coordinator._async_update_data()
+    coordinator.reads.invalidate()
+    coordinator._mapOutlets = lambda: pytest.fail("outlets remapped")
+
+    assert await coordinator._async_update_data() is coordinator.data
+    assert coordinator.metrics.unchanged_polls == 1
+    assert coordinator.api.values.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_values_keep_their_fingerprint_until_written():
+    """Reused values shouldn't be rehashed, and a local write should drop the hash."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.hass = SimpleNamespace(config=SimpleNamespace(time_zone="UTC"))
+    coordinator.fingerprints = {"values": "cached", "sysInfo": "cached"}
+
+    assert await coordinator._async_fingerprint("values", coordinator._values) == (
+        "cached"
+    )
+    assert (
+        await coordinator._async_fingerprint("values", dict(coordinator._values))
+        != "cached"
+    )
+
+    await coordinator.sync_time()
+
+    assert coordinator.fingerprints == {"sysInfo": "cached"}
+
+
+@pytest.mark.asyncio
+async def test_large_error_logs_are_decoded_in_the_executor():
+    """Error logs above the size threshold should be parsed off the event loop."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.hass = SimpleNamespace(
+        async_add_executor_job=AsyncMock(side_effect=lambda func, arg: func(arg))
+    )
+    large_log = "[" + ",".join(['{"code": 1}'] * 10000) + "]"
+    coordinator.api.controller_error_logs.return_value = large_log
+    coordinator.api.konnect_error_logs.return_value = "no errors"
+
+    controller_log = await coordinator.async_get_error_log("controller_error_logs")
+    konnect_log = await coordinator.async_get_error_log("konnect_error_logs")
+
+    assert controller_log[0] == {"code": 1}
+    assert konnect_log == "no errors"
+    coordinator.hass.async_add_executor_job.assert_awaited_once()
+    assert coordinator.metrics.endpoint("controller_error_logs").decode_offloaded == 1
+    assert coordinator.metrics.endpoint("konnect_error_logs").decode.count == 1
+
+
+@pytest.mark.asyncio
+async def test_seeded_values_replace_the_first_values_fetch():
+    """A setup probe's values should be used once instead of fetching again."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.api.system_info.return_value = dict(coordinator._sysInfo)
+    coordinator.async_seed_values({"MAC": "00:11:22:33:44:55"})
+
+    data = await coordinator._async_update_data()
+
+    assert data["values"] == {"MAC": "00:11:22:33:44:55"}
+    coordinator.api.values.assert_not_awaited()
+    assert coordinator._seed_values is None
+
+
+def test_apply_profile_updates_running_coordinator():
+    """A new profile should change timeouts and the poll interval in place."""
+    coordinator = _build_command_test_coordinator()
+    coordinator._sysInfo["valve1_Currentstatus"] = "Off"
+    coordinator._schedule_refresh = Mock()
+    profile = PerformanceProfile(idle_interval=30.0, request_timeout=4.0)
+
+    coordinator.async_apply_profile(profile)
+    coordinator.async_apply_profile(profile)
+
+    assert coordinator.profile is profile
+    assert coordinator.update_interval == timedelta(seconds=30)
+    assert coordinator.timeouts.timeout("values") == 4.0
+    coordinator._schedule_refresh.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_poll_learns_shower_starts():
+    """A poll that sees the shower turn on should record a usage start."""
+    coordinator = _build_command_test_coordinator()
+    coordinator._shower_was_on = False
+    coordinator.api.values.return_value = dict(coordinator._values)
+    coordinator.api.system_info.return_value = dict(coordinator._sysInfo)
+
+    coordinator.data = await coordinator._async_update_data()
+    coordinator.reads.invalidate()
+    await coordinator._async_update_data()
+
+    assert coordinator.usage.starts == 1
+    assert coordinator._shower_was_on is True
+    coordinator._usage_store.async_delay_save.assert_called_once()
+
+
+def test_phase_lock_option_schedules_probe_polls():
+    """With phase lock on, the next poll should follow the phase estimator."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.config_entry = SimpleNamespace(options={CONF_PHASE_LOCK: True})
+    coordinator.update_interval = timedelta(seconds=5)
+
+    coordinator._async_phase_lock_next_poll()
+
+    # Nothing has changed yet, so there is nothing to probe for.
+    assert coordinator._phase_period == 5
+    assert coordinator.update_interval == timedelta(seconds=5)
+
+    coordinator.freshness.phases[5].observe_window(0.0, 5.0, True)
+    coordinator._async_phase_lock_next_poll()
+
+    assert coordinator.update_interval == timedelta(seconds=1.5)
+
+
+@pytest.mark.asyncio
+async def test_purge_polls_system_info_fast_and_announces_hot_water():
+    """Purges should poll only system info quickly and fire hot water ready."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.hass = SimpleNamespace(bus=Mock())
+    coordinator._values["valve1_installed"] = True
+    coordinator._values["MAC"] = "00:11:22:33:44:55"
+    running = dict(coordinator._sysInfo)
+    coordinator.api.values.return_value = dict(coordinator._values)
+    coordinator.api.system_info.return_value = {
+        **running,
+        "valve1_Currentstatus": "PurgeActive",
+    }
+
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.lifecycle.state == ShowerState.PURGING
+    assert coordinator.update_interval == timedelta(seconds=1)
+
+    coordinator.reads.invalidate()
+    coordinator.api.system_info.return_value = running
+    coordinator.data = await coordinator._async_update_data()
+
+    assert coordinator.api.values.await_count == 1
+    assert coordinator.lifecycle.state == ShowerState.RUNNING
+    assert coordinator.update_interval == timedelta(seconds=5)
+    events = [call.args for call in coordinator.hass.bus.async_fire.call_args_list]
+    assert (
+        EVENT_HOT_WATER_READY,
+        {"mac": "00:11:22:33:44:55", "temperature": None, "warm_up_seconds": 0.0},
+    ) in [(event_type, {**data, "warm_up_seconds": 0.0}) for event_type, data in events]
+    assert (EVENT_KOHLER, "hot_water_ready") in [
+        (event_type, data.get("type")) for event_type, data in events
+    ]
+
+
+@pytest.mark.asyncio
+async def test_heating_polls_at_the_active_interval():
+    """Heating has no controller-side end, so it shouldn't poll every second."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.hass = SimpleNamespace(bus=Mock())
+    coordinator._values.update({"valve1_installed": True, "max_temp": 110})
+    coordinator.lifecycle.update(["Off"], 70, 100)
+    coordinator.api.values.return_value = dict(coordinator._values)
+    coordinator.api.system_info.return_value = {
+        **coordinator._sysInfo,
+        "valve1Temp": 80,
+        "valve1Setpoint": 100,
+    }
+
+    coordinator.data = await coordinator._async_update_data()
+
+    assert coordinator.lifecycle.state == ShowerState.HEATING
+    assert coordinator.update_interval == timedelta(seconds=5)
+
+    coordinator.reads.invalidate()
+    coordinator.api.system_info.return_value = {
+        **coordinator._sysInfo,
+        "valve1Setpoint": 120,
+    }
+    coordinator.data = await coordinator._async_update_data()
+
+    assert coordinator.lifecycle.state == ShowerState.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_changed_poll_fires_semantic_events():
+    """Snapshot diffs should fire typed events tagged with the device."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.hass = SimpleNamespace(bus=Mock())
+    stopped = {**coordinator._sysInfo, "valve1_Currentstatus": "Off"}
+    coordinator.api.values.return_value = dict(coordinator._values)
+    coordinator.api.system_info.return_value = stopped
+
+    coordinator.data = await coordinator._async_update_data()
+    coordinator.hass.bus.async_fire.assert_not_called()
+
+    coordinator.reads.invalidate()
+    coordinator.api.values.return_value = {
+        **coordinator._values,
+        "CurrentUser": "2",
+    }
+    await coordinator._async_update_data()
+
+    coordinator.hass.bus.async_fire.assert_called_once_with(
+        EVENT_KOHLER,
+        {"device_id": "device-1", "type": "user_changed", "user": "2", "previous": "0"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_if_older_coalesces_polls_for_stale_data():
+    """Only stale data should poll, and concurrent callers should share it."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.last_update_success = True
+    polled = asyncio.Event()
+
+    async def _async_refresh() -> None:
+        await polled.wait()
+        coordinator.freshness.fetched = time.monotonic()
+
+    coordinator.async_refresh = AsyncMock(side_effect=_async_refresh)
+
+    waiters = asyncio.gather(
+        coordinator.async_refresh_if_older(5),
+        coordinator.async_refresh_if_older(5),
+    )
+    await asyncio.sleep(0)
+    polled.set()
+
+    assert await waiters == [True, True]
+    coordinator.async_refresh.assert_awaited_once()
+
+    assert await coordinator.async_refresh_if_older(5)
+    coordinator.async_refresh.assert_awaited_once()
+
+    coordinator.last_update_success = False
+    assert not await coordinator.async_refresh_if_older(0)
+    assert coordinator.async_refresh.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_pushed_delta_updates_data_and_slows_polling():
+    """A pushed delta should merge into the cache and back polling off."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.hass = SimpleNamespace(bus=Mock())
+    coordinator.data = {"values": {}, "sysInfo": {}}
+    coordinator.async_set_updated_data = Mock()
+    coordinator._schedule_refresh = Mock()
+    poll_listener = Mock()
+    coordinator.async_add_poll_listener(poll_listener)
+
+    await coordinator.async_ingest_push(
+        None, {"valve1_Currentstatus": "Off"}, delta=True
+    )
+
+    assert coordinator._sysInfo["valve1_Currentstatus"] == "Off"
+    assert coordinator._sysInfo["valve1outlet1"] is False
+    assert coordinator._values["def_temp"] == 98
+    assert coordinator.push_active()
+    assert coordinator.update_interval == timedelta(
+        seconds=coordinator_module.PUSH_FALLBACK_INTERVAL_SECONDS
+    )
+    assert coordinator.freshness.pushes == 1
+    coordinator.async_set_updated_data.assert_called_once_with(
+        {"values": coordinator._values, "sysInfo": coordinator._sysInfo}
+    )
+
+    coordinator.data = coordinator.async_set_updated_data.call_args.args[0]
+    await coordinator.async_ingest_push(
+        None, {"valve1_Currentstatus": "Off"}, delta=True
+    )
+    coordinator.async_set_updated_data.assert_called_once()
+    coordinator._schedule_refresh.assert_called_once()
+    assert poll_listener.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_poll_listeners_see_the_applied_refresh(monkeypatch):
+    """Poll listeners should run after the refresh outcome is stored."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.last_update_success = True
+
+    async def _async_refresh(self, *args, **kwargs):
+        self.last_update_success = False
+
+    monkeypatch.setattr(DataUpdateCoordinator, "_async_refresh", _async_refresh)
+    seen = []
+    coordinator.async_add_poll_listener(
+        lambda: seen.append(coordinator.last_update_success)
+    )
+
+    await coordinator._async_refresh(log_failures=False)
+
+    assert seen == [False]
+
+
+@pytest.mark.asyncio
+async def test_polls_record_finished_shower_sessions():
+    """A poll that sees the shower stop should save the finished session."""
+    coordinator = _build_command_test_coordinator()
+    coordinator.hass = SimpleNamespace(bus=Mock())
+    running = dict(coordinator._sysInfo)
+    coordinator.api.values.return_value = {
+        **coordinator._values,
+        "valve1_installed": True,
+    }
+    coordinator.api.system_info.return_value = running
+
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.sessions.current is not None
+
+    coordinator.reads.invalidate()
+    coordinator.api.system_info.return_value = {
+        **running,
+        "valve1_Currentstatus": "Off",
+    }
+    await coordinator._async_update_data()
+
+    assert coordinator.sessions.current is None
+    assert coordinator.sessions.last_session["purge_seconds"] == 0.0
+    coordinator._sessions_store.async_delay_save.assert_called_once()
@@ -9,11 +9,43 @@ from kohler import KohlerError
 
 from custom_components.kohler.const import DOMAIN
 from custom_components.kohler.diagnostics import async_get_config_entry_diagnostics
+from custom_components.kohler.freshness import FreshnessTracker
+from custom_components.kohler.lifecycle import ShowerLifecycle
+from custom_components.kohler.metrics import ApiMetrics, LoopBudgetMonitor
+from custom_components.kohler.sessions import SessionTracker
+from custom_components.kohler.tracing import CommandTracer
+from custom_components.kohler.transport import (
+    AdaptiveTimeouts,
+    RequestBudget,
+    SingleFlight,
+)
+from custom_components.kohler.usage import UsageHistogram
+
+
+def _namespace_coordinator(api: SimpleNamespace, **kwargs) -> SimpleNamespace:
+    async def _async_get_error_log(endpoint):
+        return await getattr(api, endpoint)()
+
+    return SimpleNamespace(
+        metrics=ApiMetrics(),
+        tracer=CommandTracer(),
+        loop_monitor=LoopBudgetMonitor(),
+        freshness=FreshnessTracker(),
+        timeouts=AdaptiveTimeouts(),
+        budget=RequestBudget(),
+        reads=SingleFlight(),
+        usage=UsageHistogram(),
+        lifecycle=ShowerLifecycle(),
+        sessions=SessionTracker(),
+        api=api,
+        async_get_error_log=_async_get_error_log,
+        **kwargs,
+    )
 
 
 async def test_diagnostics_include_error_logs():
     """Diagnostics export should include controller and Konnect logs."""
-    coordinator = SimpleNamespace(
+    coordinator = _namespace_coordinator(
         _sysInfo={"status": "ok"},
         _values={"MAC": "00:11:22:33:44:55", "time": "3/18/2026 08:33 P -0600"},
         _valve1_outlet_mappings=[1, 2],
@@ -33,11 +65,12 @@ async def test_diagnostics_include_error_logs():
     assert diagnostics["values"]["MAC"] == "**REDACTED**"
     assert diagnostics["controller_error_log"] == "controller log"
     assert diagnostics["konnect_error_log"] == "konnect log"
+    assert diagnostics["api_metrics"]["endpoints"] == {}
 
 
 async def test_diagnostics_capture_log_fetch_errors():
     """Diagnostics export should degrade cleanly when a log fetch fails."""
-    coordinator = SimpleNamespace(
+    coordinator = _namespace_coordinator(
         _sysInfo={"status": "ok"},
         _values={"time": "3/18/2026 08:33 P -0600"},
         _valve1_outlet_mappings=[],
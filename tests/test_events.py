@@ -0,0 +1,69 @@
+"""Tests for semantic event derivation."""
+
+from custom_components.kohler.events import EventSnapshot, diff_snapshots
+
+
+def _snapshot(**changes) -> EventSnapshot:
+    fields = {
+        "shower_on": False,
+        "outlets": {},
+        "user": "0",
+        "lights": {1: 0},
+        "steam_running": False,
+        "connections": {"valve_1_con_string": "Connected"},
+    }
+    fields.update(changes)
+    return EventSnapshot(**fields)
+
+
+def test_identical_snapshots_have_no_events():
+    """Nothing should fire when nothing changed."""
+    assert diff_snapshots(_snapshot(), _snapshot()) == []
+
+
+def test_shower_start_reports_opened_outlets_by_name():
+    """Starting a shower should fire the start and each opened outlet."""
+    events = diff_snapshots(
+        _snapshot(),
+        _snapshot(
+            shower_on=True,
+            outlets={(1, 2): "Hand Shower", (1, 1): "Shower Head 1"},
+        ),
+    )
+
+    assert events == [
+        ("shower_started", {}),
+        ("outlet_opened", {"valve": 1, "outlet": 1, "name": "Shower Head 1"}),
+        ("outlet_opened", {"valve": 1, "outlet": 2, "name": "Hand Shower"}),
+    ]
+
+
+def test_setting_changes_carry_previous_values():
+    """User, light, steam, and connection changes should report both sides."""
+    events = diff_snapshots(
+        _snapshot(outlets={(1, 1): "Shower Head 1"}),
+        _snapshot(
+            user="2",
+            lights={1: 40, 2: 10},
+            steam_running=True,
+            connections={
+                "valve_1_con_string": "Disconnected",
+                "steam_con_string": "Connected",
+            },
+        ),
+    )
+
+    assert events == [
+        ("outlet_closed", {"valve": 1, "outlet": 1, "name": "Shower Head 1"}),
+        ("user_changed", {"user": "2", "previous": "0"}),
+        ("light_level_changed", {"light": 1, "level": 40, "previous": 0}),
+        ("steam_started", {}),
+        (
+            "connection_changed",
+            {
+                "connection": "valve_1_con_string",
+                "status": "Disconnected",
+                "previous": "Connected",
+            },
+        ),
+    ]
@@ -0,0 +1,94 @@
+"""Tests for data freshness tracking."""
+
+from __future__ import annotations
+
+from custom_components.kohler import freshness as freshness_module
+from custom_components.kohler.freshness import (
+    PHASE_BINS,
+    PHASE_FREE_RUNNING,
+    PHASE_LOCKED,
+    PHASE_MAX_PROBES,
+    FreshnessTracker,
+    PhaseEstimator,
+)
+
+
+def test_record_snapshot_tracks_key_changes(monkeypatch):
+    """Only keys whose values changed should get a new change time."""
+    tracker = FreshnessTracker()
+    clock = iter([100.0, 105.0])
+    monkeypatch.setattr(freshness_module.time, "monotonic", lambda: next(clock))
+
+    tracker.record_snapshot(99.5, 15, {"values": {"a": 1, "b": 2}})
+    first_b = tracker.last_changed("b")
+    tracker.record_snapshot(104.8, 5, {"values": {"a": 2, "b": 2}})
+
+    assert tracker.last_changed("b") == first_b
+    assert tracker.last_changed("a") >= first_b
+    assert tracker.fetch_lag.max == 0.5
+
+
+def test_cadence_counts_late_polls(monkeypatch):
+    """Gaps well past the scheduled interval should count as late polls."""
+    tracker = FreshnessTracker()
+    clock = iter([0.0, 5.0, 15.0])
+    monkeypatch.setattr(freshness_module.time, "monotonic", lambda: next(clock))
+
+    for _ in range(3):
+        tracker.record_snapshot(0.0, 5, {"values": {}})
+
+    cadence = tracker.cadence_summary()["5s"]
+    assert cadence["count"] == 2
+    assert cadence["max_ms"] == 10000
+    assert cadence["late"] == 1
+
+
+def test_phase_estimator_locks_onto_controller_updates():
+    """Probing polls should find the controller's update phase and follow it."""
+    period, controller_phase = 5.0, 2.0
+    estimator = PhaseEstimator(period)
+    for free_running in (0.3, 5.3, 10.3):
+        estimator.record_poll(free_running, False)
+
+    poll = 10.3
+    for step in range(60):
+        following = poll + estimator.next_delay(poll) + (step * 0.13) % 0.4
+        last_update = (following - controller_phase) // period * period
+        estimator.observe_window(poll, following, controller_phase + last_update > poll)
+        estimator.record_poll(following, True)
+        poll = following
+
+    assert abs(estimator.phase() - controller_phase) < period / PHASE_BINS * 1.5
+    locked = estimator.staleness(PHASE_LOCKED)
+    assert locked.count > 20
+    assert locked.mean < estimator.staleness(PHASE_FREE_RUNNING).mean
+
+
+def test_unchanged_data_never_locks():
+    """An idle controller gives no phase to lock onto, so polls aren't shifted."""
+    estimator = PhaseEstimator(5.0)
+    poll = 0.0
+    for _ in range(40):
+        delay = estimator.next_delay(poll)
+        assert delay == 5.0
+        estimator.observe_window(poll, poll + delay, False)
+        poll += delay
+
+    assert estimator.phase() is None
+
+
+def test_probing_stops_without_a_lock():
+    """Data that changes in every window should only be probed a bounded time."""
+    estimator = PhaseEstimator(5.0)
+    poll = 0.0
+    delays = []
+    for _ in range(PHASE_MAX_PROBES + 11):
+        delay = estimator.next_delay(poll)
+        delays.append(delay)
+        estimator.observe_window(poll, poll + delay, True)
+        poll += delay
+
+    assert estimator.phase() is None
+    assert delays[0] == 5.0
+    assert delays[1] != 5.0
+    assert delays[-10:] == [5.0] * 10
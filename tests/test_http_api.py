@@ -0,0 +1,92 @@
+"""Tests for the Kohler HTTP cache view."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from custom_components.kohler.const import DATA_KOHLER
+from custom_components.kohler.coordinator import KohlerDataUpdateCoordinator
+from custom_components.kohler.freshness import FreshnessTracker
+from custom_components.kohler.http_api import KohlerCacheView, etag_matches
+from custom_components.kohler.transport import payload_fingerprint
+
+
+def _build_view() -> tuple[KohlerCacheView, KohlerDataUpdateCoordinator]:
+    coordinator = object.__new__(KohlerDataUpdateCoordinator)
+    coordinator.config_entry = SimpleNamespace(entry_id="entry-1")
+    coordinator.freshness = FreshnessTracker()
+    coordinator.freshness.fetched = time.monotonic() - 3
+    coordinator._values = {"CurrentUser": "1"}
+    coordinator._sysInfo = {"valve1_Currentstatus": "Off"}
+    coordinator.async_refresh_if_older = AsyncMock(return_value=True)
+    hass = SimpleNamespace(data={DATA_KOHLER: coordinator})
+    return KohlerCacheView(hass), coordinator
+
+
+def _request(query=None, headers=None) -> SimpleNamespace:
+    return SimpleNamespace(query=query or {}, headers=headers or {})
+
+
+def test_etag_matches_lists_weak_tags_and_wildcards():
+    """If-None-Match should use weak comparison over a list of tags."""
+    assert etag_matches('"x", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"x"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+async def test_view_serves_cached_payload_with_etag_and_age():
+    """The view should serve cached data without polling the controller."""
+    view, coordinator = _build_view()
+
+    response = await view.get(_request(), "entry-1", "system_info")
+
+    assert response.status == HTTPStatus.OK
+    assert json.loads(response.body) == {"valve1_Currentstatus": "Off"}
+    assert (
+        response.headers["ETag"] == f'"{payload_fingerprint(coordinator._sysInfo)[0]}"'
+    )
+    assert response.headers["Age"] == "3"
+    coordinator.async_refresh_if_older.assert_not_awaited()
+
+
+async def test_view_revalidates_and_refreshes_stale_data():
+    """Matching tags should get a 304 and max_age should refresh first."""
+    view, coordinator = _build_view()
+    etag = (await view.get(_request(), "entry-1", "values")).headers["ETag"]
+
+    response = await view.get(
+        _request({"max_age": "1"}, {"If-None-Match": etag}), "entry-1", "values"
+    )
+
+    assert response.status == HTTPStatus.NOT_MODIFIED
+    coordinator.async_refresh_if_older.assert_awaited_once_with(1.0)
+
+    coordinator.async_refresh_if_older.return_value = False
+    response = await view.get(_request({"max_age": "1"}), "entry-1", "values")
+    assert response.status == HTTPStatus.SERVICE_UNAVAILABLE
+
+    response = await view.get(_request({"max_age": "soon"}), "entry-1", "values")
+    assert response.status == HTTPStatus.BAD_REQUEST
+
+    response = await view.get(_request(), "entry-2", "values")
+    assert response.status == HTTPStatus.NOT_FOUND
+
+
+async def test_etag_follows_local_writes_to_the_cache():
+    """A local write to the cached payload should change its entity tag."""
+    view, coordinator = _build_view()
+    etag = (await view.get(_request(), "entry-1", "values")).headers["ETag"]
+
+    coordinator._values["time"] = "12:00"
+    response = await view.get(
+        _request(headers={"If-None-Match": etag}), "entry-1", "values"
+    )
+
+    assert response.status == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+    assert json.loads(response.body)["time"] == "12:00"
@@ -0,0 +1,48 @@
+"""Tests for the shower lifecycle state machine."""
+
+from custom_components.kohler.lifecycle import ShowerLifecycle, ShowerState
+
+
+def test_purge_end_is_hot_water_ready():
+    """The end of a purge should mark the water as ready."""
+    lifecycle = ShowerLifecycle()
+
+    assert lifecycle.update(["Off"], 70, 100).state == ShowerState.OFF
+    purging = lifecycle.update(["PurgeActive", "Off"], 70, 100)
+    assert purging.state == ShowerState.PURGING
+    assert lifecycle.purging
+    assert lifecycle.update(["PurgeActive"], 80, 100) is None
+
+    ready = lifecycle.update(["On"], 99, 100)
+
+    assert ready.previous == ShowerState.PURGING
+    assert ready.state == ShowerState.RUNNING
+    assert ready.hot_water_ready
+    assert ready.warm_up_seconds is not None
+    assert lifecycle.hot_water_ready_at == lifecycle.state_since
+    assert not lifecycle.purging
+
+
+def test_start_without_purge_heats_to_setpoint():
+    """Without a purge, the water is ready once it nears the setpoint."""
+    lifecycle = ShowerLifecycle()
+    lifecycle.update(["Off"], 70, 100)
+
+    assert lifecycle.update(["On"], 80, 100).state == ShowerState.HEATING
+    assert not lifecycle.purging
+    assert lifecycle.update(["On"], 99.5, 100).hot_water_ready
+
+
+def test_first_snapshot_and_unknown_temperatures_do_not_announce():
+    """Only an observed warm-up should fire hot water ready."""
+    lifecycle = ShowerLifecycle()
+
+    first = lifecycle.update(["On"], 100, 100)
+    assert first.previous is None
+    assert not first.hot_water_ready
+
+    lifecycle.update(["Off"], None, None)
+    started = lifecycle.update(["On"], None, None)
+    assert started.state == ShowerState.RUNNING
+    assert not started.hot_water_ready
+    assert lifecycle.hot_water_ready_at is None
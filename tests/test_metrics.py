@@ -0,0 +1,88 @@
+"""Tests for Kohler API metrics."""
+
+from __future__ import annotations
+
+from kohler import KohlerError
+
+from custom_components.kohler.metrics import (
+    POLL_ENDPOINT,
+    ApiMetrics,
+    LatencyHistogram,
+    LoopBudgetMonitor,
+)
+
+
+def test_latency_histogram_percentiles_use_bucket_bounds():
+    """Percentiles should resolve to the containing bucket's upper bound."""
+    histogram = LatencyHistogram(buckets=(0.1, 0.5, 1.0))
+    for duration in (0.05, 0.07, 0.08, 0.3, 0.9):
+        histogram.observe(duration)
+
+    assert histogram.percentile(50) == 0.1
+    assert histogram.percentile(95) == 0.9
+    assert histogram.as_dict()["buckets"] == {
+        "le_0.1": 3,
+        "le_0.5": 1,
+        "le_1.0": 1,
+        "le_inf": 0,
+    }
+
+
+def test_latency_histogram_overflow_reports_max():
+    """Durations beyond the last bucket should report the observed maximum."""
+    histogram = LatencyHistogram(buckets=(0.1,))
+    histogram.observe(12.5)
+
+    assert histogram.percentile(99) == 12.5
+
+
+def test_api_metrics_classify_failures_and_summarize():
+    """Failures should be classified and summarized for diagnostic sensors."""
+    metrics = ApiMetrics()
+    metrics.record_success("values", 0.2)
+    metrics.record_failure("system_info", 10.0, TimeoutError())
+    metrics.record_failure("system_info", 0.1, KohlerError("boom"))
+    metrics.record_failure("system_info", 0.1, ConnectionResetError())
+    metrics.record_success(POLL_ENDPOINT, 0.4)
+
+    system_info = metrics.endpoint("system_info")
+    assert (system_info.timeout, system_info.kohler_error, system_info.os_error) == (
+        1,
+        1,
+        1,
+    )
+    summary = metrics.summary()
+    assert summary["poll_latency_p50"] == 400
+    assert summary["api_error_rate"] == 75.0
+    assert summary["last_success_age"] == 0
+
+
+def test_loop_budget_monitor_names_slowest_entities():
+    """Diagnostics should rank entities by their mean update time."""
+    monitor = LoopBudgetMonitor()
+    monitor.record_entity("valve.shower_head_1", 0.002)
+    monitor.record_entity("climate.kohler_shower", 0.004)
+    monitor.record_entity("climate.kohler_shower", 0.006)
+    monitor.record_fanout(0.012)
+
+    report = monitor.as_dict()
+
+    assert list(report["slowest_entities"]) == [
+        "climate.kohler_shower",
+        "valve.shower_head_1",
+    ]
+    assert report["slowest_entities"]["climate.kohler_shower"]["mean_ms"] == 5.0
+    assert report["fanout_over_budget"] == 0
+
+
+def test_loop_budget_monitor_warns_once_per_interval(caplog):
+    """Budget overruns should be counted every time but logged sparingly."""
+    monitor = LoopBudgetMonitor(fanout_budget=0.01, entity_budget=0.001)
+
+    monitor.record_entity("water_heater.kohler_shower", 0.02)
+    monitor.record_entity("water_heater.kohler_shower", 0.03)
+    monitor.record_fanout(0.05)
+
+    assert monitor.entity_over_budget == 2
+    assert monitor.fanout_over_budget == 1
+    assert caplog.text.count("water_heater.kohler_shower took") == 1
@@ -0,0 +1,34 @@
+"""Tests for performance profiles."""
+
+from custom_components.kohler.const import CONF_PERFORMANCE_PROFILE
+from custom_components.kohler.performance import (
+    PROFILE_CUSTOM,
+    PROFILE_RESPONSIVE,
+    PROFILES,
+    PerformanceProfile,
+    profile_from_options,
+)
+
+
+def test_named_profile_ignores_custom_values():
+    """Named profiles should not pick up leftover custom values."""
+    options = {CONF_PERFORMANCE_PROFILE: PROFILE_RESPONSIVE, "idle_interval": 99}
+
+    assert profile_from_options(options) == PROFILES[PROFILE_RESPONSIVE]
+
+
+def test_missing_or_unknown_profile_uses_defaults():
+    """Entries without a profile keep the original hard-coded behavior."""
+    assert profile_from_options({}) == PerformanceProfile()
+    assert profile_from_options({CONF_PERFORMANCE_PROFILE: "turbo"}) == (
+        PerformanceProfile()
+    )
+
+
+def test_custom_profile_fills_missing_values_from_defaults():
+    """Custom profiles should coerce their values and default the rest."""
+    profile = profile_from_options(
+        {CONF_PERFORMANCE_PROFILE: PROFILE_CUSTOM, "active_interval": "3"}
+    )
+
+    assert profile == PerformanceProfile(active_interval=3.0)
@@ -0,0 +1,70 @@
+"""Tests for Kohler profiling output."""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import tracemalloc
+
+from custom_components.kohler.entity_helpers import normalize_mac_address
+from custom_components.kohler.profiling import (
+    _take_snapshot,
+    _top_growth_sites,
+    _write_profile,
+    deep_sizeof,
+)
+
+
+def _unrelated_work() -> int:
+    return sum(range(1000))
+
+
+def test_write_profile_scopes_stats_to_integration(tmp_path):
+    """Written stats should only contain integration and client functions."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    normalize_mac_address("00-11-22-33-44-55")
+    _unrelated_work()
+    profiler.disable()
+
+    pstats_path = tmp_path / "kohler.pstats"
+    summary_path = tmp_path / "kohler.txt"
+    functions = _write_profile(profiler, str(pstats_path), str(summary_path), 10)
+
+    stats = pstats.Stats(str(pstats_path))
+    function_names = {name for _, _, name in stats.stats}
+    assert functions == len(stats.stats)
+    assert "normalize_mac_address" in function_names
+    assert "_unrelated_work" not in function_names
+    assert "normalize_mac_address" in summary_path.read_text()
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    """Retained size should follow containers without double counting."""
+    shared = ["x" * 100]
+    payload = {"a": shared, "b": shared}
+
+    assert deep_sizeof(payload) == (
+        sys.getsizeof(payload)
+        + sys.getsizeof("a")
+        + sys.getsizeof("b")
+        + deep_sizeof(shared)
+    )
+
+
+def test_top_growth_sites_attribute_integration_allocations():
+    """Growth sites should come from allocations made by integration code."""
+    tracemalloc.start(10)
+    try:
+        before = _take_snapshot()
+        macs = [normalize_mac_address(f"00-11-22-33-44-{i:02x}") for i in range(200)]
+        after = _take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    sites = _top_growth_sites(before, after, 5)
+    assert macs
+    assert sites
+    assert sites[0]["size_diff"] > 0
+    assert "entity_helpers.py" in sites[0]["origin"]
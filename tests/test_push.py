@@ -0,0 +1,123 @@
+"""Tests for webhook push ingest."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from homeassistant.const import CONF_WEBHOOK_ID
+
+from custom_components.kohler import push
+from custom_components.kohler.const import CONF_PUSH_INGEST, CONF_PUSH_SECRET
+
+SECRET = "relay-secret"
+
+
+def _request(payload: dict, signature: str | None = None) -> SimpleNamespace:
+    body = json.dumps(payload).encode()
+    if signature is None:
+        signature = push.sign_payload(SECRET, body)
+    return SimpleNamespace(
+        read=AsyncMock(return_value=body),
+        headers={push.SIGNATURE_HEADER: signature},
+    )
+
+
+def _setup_handler(monkeypatch) -> tuple[object, SimpleNamespace, tuple]:
+    handlers = {}
+
+    def _async_register(hass, domain, name, webhook_id, handler, **kwargs):
+        handlers[webhook_id] = handler
+
+    monkeypatch.setattr(push.webhook, "async_register", _async_register)
+    hass = SimpleNamespace(data={})
+    entry = SimpleNamespace(
+        entry_id="entry-1",
+        options={
+            CONF_PUSH_INGEST: True,
+            CONF_WEBHOOK_ID: "hook",
+            CONF_PUSH_SECRET: SECRET,
+        },
+    )
+    coordinator = SimpleNamespace(
+        async_ingest_push=AsyncMock(), last_push_timestamp=None
+    )
+    push.async_setup_push(hass, entry, coordinator)
+    return handlers["hook"], coordinator, (hass, entry)
+
+
+def test_signature_round_trip():
+    """Only the signature of the exact body with the right key should verify."""
+    signature = push.sign_payload(SECRET, b"{}")
+
+    assert signature.startswith("sha256=")
+    assert push.verify_signature(SECRET, b"{}", signature)
+    assert not push.verify_signature(SECRET, b"{ }", signature)
+    assert not push.verify_signature("other", b"{}", signature)
+    assert not push.verify_signature(SECRET, b"{}", None)
+
+
+async def test_push_feeds_signed_deltas_to_the_coordinator(monkeypatch):
+    """A signed delta should reach the coordinator once and not be replayed."""
+    handler, coordinator, _ = _setup_handler(monkeypatch)
+    payload = {
+        "timestamp": time.time(),
+        "type": "delta",
+        "system_info": {"valve1_Currentstatus": "On"},
+    }
+
+    response = await handler(None, "hook", _request(payload))
+    assert response.status == HTTPStatus.NO_CONTENT
+    coordinator.async_ingest_push.assert_awaited_once_with(
+        None, {"valve1_Currentstatus": "On"}, delta=True
+    )
+
+    response = await handler(None, "hook", _request(payload))
+    assert response.status == HTTPStatus.CONFLICT
+    coordinator.async_ingest_push.assert_awaited_once()
+
+
+async def test_push_replay_check_survives_reregistration(monkeypatch):
+    """Re-registering the webhook on an options update shouldn't allow replays."""
+    handler, coordinator, (hass, entry) = _setup_handler(monkeypatch)
+    payload = {"timestamp": time.time(), "values": {"CurrentUser": "1"}}
+    assert (await handler(None, "hook", _request(payload))).status == (
+        HTTPStatus.NO_CONTENT
+    )
+
+    handlers = {}
+
+    def _async_register(hass, domain, name, webhook_id, handler, **kwargs):
+        handlers[webhook_id] = handler
+
+    monkeypatch.setattr(push.webhook, "async_register", _async_register)
+    monkeypatch.setattr(push.webhook, "async_unregister", Mock())
+    push.async_setup_push(hass, entry, coordinator)
+
+    response = await handlers["hook"](None, "hook", _request(payload))
+    assert response.status == HTTPStatus.CONFLICT
+    coordinator.async_ingest_push.assert_awaited_once()
+
+
+async def test_push_rejects_bad_signatures_and_payloads(monkeypatch):
+    """Unsigned or malformed pushes should never reach the coordinator."""
+    handler, coordinator, _ = _setup_handler(monkeypatch)
+
+    response = await handler(
+        None, "hook", _request({"timestamp": time.time()}, signature="sha256=00")
+    )
+    assert response.status == HTTPStatus.UNAUTHORIZED
+
+    response = await handler(None, "hook", _request({"timestamp": time.time()}))
+    assert response.status == HTTPStatus.BAD_REQUEST
+
+    response = await handler(
+        None, "hook", _request({"timestamp": "nan", "values": {"CurrentUser": "1"}})
+    )
+    assert response.status == HTTPStatus.BAD_REQUEST
+    assert coordinator.last_push_timestamp is None
+
+    coordinator.async_ingest_push.assert_not_awaited()
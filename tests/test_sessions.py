@@ -0,0 +1,87 @@
+"""Tests for incremental shower session tracking."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import math
+import statistics
+
+from custom_components.kohler.lifecycle import ShowerState
+from custom_components.kohler.sessions import (
+    HISTORY_SIZE,
+    SessionTracker,
+    WelfordStats,
+)
+
+MORNING = datetime(2026, 3, 18, 7, 0)
+
+
+def test_welford_stats_match_batch_statistics():
+    """Running statistics should match the batch results."""
+    samples = [100.5, 101.0, 99.0, 102.5, 100.0]
+    stats = WelfordStats()
+    for sample in samples:
+        stats.observe(sample)
+
+    assert stats.count == 5
+    assert math.isclose(stats.mean, statistics.mean(samples))
+    assert math.isclose(stats.stdev, statistics.stdev(samples))
+    assert (stats.minimum, stats.maximum) == (99.0, 102.5)
+    assert WelfordStats().as_dict()["mean"] is None
+
+
+def test_session_records_purge_outlets_and_running_temperature():
+    """A session should credit time to what each snapshot showed."""
+    tracker = SessionTracker()
+
+    def _update(offset, state, outlets=(), temperature=None):
+        return tracker.update(
+            offset,
+            MORNING + timedelta(seconds=offset),
+            state,
+            outlets,
+            temperature,
+        )
+
+    assert _update(0, ShowerState.OFF) is None
+    assert _update(10, ShowerState.PURGING, ["Shower Head"], 60.0) is None
+    assert _update(40, ShowerState.RUNNING, ["Shower Head"], 100.0) is None
+    assert (
+        _update(100, ShowerState.RUNNING, ["Shower Head", "Hand Shower"], 102.0) is None
+    )
+    session = _update(130, ShowerState.OFF)
+
+    assert session == {
+        "started_at": (MORNING + timedelta(seconds=10)).isoformat(),
+        "ended_at": (MORNING + timedelta(seconds=130)).isoformat(),
+        "duration": 120.0,
+        "purge_seconds": 30.0,
+        "outlets": {"Hand Shower": 30.0, "Shower Head": 120.0},
+        "temperature": {
+            "count": 2,
+            "min": 100.0,
+            "mean": 101.0,
+            "max": 102.0,
+            "stdev": 1.41,
+        },
+    }
+    assert tracker.current is None
+    assert tracker.today(MORNING.date()) == (1, 120.0)
+    assert tracker.today(MORNING.date() + timedelta(days=1)) == (0, 0.0)
+
+
+def test_history_is_bounded_and_survives_a_restore():
+    """History should keep only the newest sessions and round-trip to storage."""
+    tracker = SessionTracker()
+    for index in range(HISTORY_SIZE + 5):
+        start = index * 100
+        tracker.update(start, MORNING, ShowerState.RUNNING, [], 100.0)
+        tracker.update(start + 60, MORNING, ShowerState.OFF, [], None)
+
+    assert len(tracker.history) == HISTORY_SIZE
+    restored = SessionTracker.from_dict(tracker.as_dict())
+    assert list(restored.history) == list(tracker.history)
+    assert restored.today(MORNING.date()) == (
+        HISTORY_SIZE + 5,
+        60.0 * (HISTORY_SIZE + 5),
+    )
@@ -0,0 +1,79 @@
+"""Tests for typed controller snapshots."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from custom_components.kohler.coordinator import KohlerDataUpdateCoordinator
+from custom_components.kohler.freshness import FreshnessTracker
+from custom_components.kohler.lifecycle import ShowerLifecycle
+from custom_components.kohler.metrics import ApiMetrics
+from custom_components.kohler.snapshot import build_snapshot, diff_snapshot
+
+
+def _build_snapshot_coordinator() -> KohlerDataUpdateCoordinator:
+    coordinator = object.__new__(KohlerDataUpdateCoordinator)
+    coordinator.lifecycle = ShowerLifecycle()
+    coordinator.freshness = FreshnessTracker()
+    coordinator.metrics = ApiMetrics()
+    coordinator.update_interval = timedelta(seconds=15)
+    coordinator.last_update_success = True
+    coordinator._target_temperature = None
+    coordinator._values = {
+        "valve1_installed": True,
+        "valve1PortsAvailable": 2,
+        "valve1_outlet1_func": {"id": 1, "func": 5},
+        "valve1_outlet2_func": {"id": 2, "func": 7},
+        "valve2PortsAvailable": 0,
+        "def_temp": 100,
+        "CurrentUser": "1",
+        "light1_installed": True,
+        "light1_level": 30,
+        "valve1_con_string": "Connected",
+    }
+    coordinator._sysInfo = {
+        "valve1_Currentstatus": "On",
+        "valve1Temp": 99.5,
+        "valve1Setpoint": 101,
+        "valve1outlet1": True,
+        "valve1outlet2": False,
+    }
+    coordinator._valve1_outlet_mappings = [1, 2]
+    coordinator._valve2_outlet_mappings = []
+    return coordinator
+
+
+def test_build_snapshot_groups_state_by_topic():
+    """A snapshot should hold typed values for only the requested topics."""
+    snapshot = build_snapshot(_build_snapshot_coordinator(), ("live", "outlets"))
+
+    assert set(snapshot) == {"live", "outlets"}
+    assert snapshot["live"]["shower_on"] is True
+    assert snapshot["live"]["current_temperature"] == 99.5
+    assert snapshot["live"]["target_temperature"] == 101.0
+    assert snapshot["live"]["user"] == "1"
+    assert snapshot["live"]["valve1_status"] == "On"
+    assert snapshot["live"]["light1_level"] == 30
+    assert snapshot["outlets"] == {
+        "valve1_outlet1": {"name": "Shower Head", "open": True},
+        "valve1_outlet2": {"name": "Hand Shower", "open": False},
+    }
+
+
+def test_diff_snapshot_reports_only_changed_keys():
+    """Diffs should carry changed and removed keys, and skip quiet topics."""
+    coordinator = _build_snapshot_coordinator()
+    previous = build_snapshot(coordinator, ("live", "outlets", "connections"))
+    assert diff_snapshot(previous, previous) == {}
+
+    coordinator._sysInfo["valve1outlet2"] = True
+    del coordinator._values["light1_installed"]
+    current = build_snapshot(coordinator, ("live", "outlets", "connections"))
+
+    assert diff_snapshot(previous, current) == {
+        "live": {"changed": {}, "removed": ["light1_level"]},
+        "outlets": {
+            "changed": {"valve1_outlet2": {"name": "Hand Shower", "open": True}},
+            "removed": [],
+        },
+    }
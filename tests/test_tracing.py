@@ -0,0 +1,62 @@
+"""Tests for Kohler command tracing."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from custom_components.kohler import tracing
+from custom_components.kohler.tracing import CommandTracer, record_span
+
+
+def test_trace_without_command_completes_on_exit():
+    """Actions that never reach the controller should not wait for a poll."""
+    tracer = CommandTracer()
+
+    with tracer.trace("valve.close", expect=lambda: False) as trace:
+        record_span("noop", time.monotonic(), time.monotonic())
+
+    assert trace.outcome == "completed"
+    assert [span.name for span in trace.spans] == ["noop"]
+
+
+def test_trace_ignores_polls_started_before_command():
+    """Only polls issued after the command can confirm it."""
+    tracer = CommandTracer()
+
+    with tracer.trace("light.turn_on", expect=lambda: True) as trace:
+        tracing.mark_command_done(time.monotonic())
+
+    tracer.check_pending(trace.command_done - 1)
+    assert trace.outcome == "pending"
+
+    tracer.check_pending(trace.command_done)
+    assert trace.outcome == "confirmed"
+
+
+def test_trace_records_failures_and_keeps_bounded_history():
+    """Failed actions should be recorded and history should stay bounded."""
+    tracer = CommandTracer(history_size=2)
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError), tracer.trace("button.massage_toggle"):
+            raise RuntimeError("boom")
+
+    recent = tracer.as_dict()["recent"]
+    assert len(recent) == 2
+    assert recent[0]["outcome"] == "failed"
+    assert recent[0]["error"] == "boom"
+
+
+def test_unconfirmed_traces_expire(monkeypatch):
+    """Traces that are never confirmed should expire into the history."""
+    monkeypatch.setattr(tracing, "TRACE_CONFIRM_TIMEOUT_SECONDS", 0)
+    tracer = CommandTracer()
+
+    with tracer.trace("switch.steam_on", expect=lambda: False) as trace:
+        tracing.mark_command_done(time.monotonic())
+
+    tracer.check_pending(None)
+
+    assert trace.outcome == "unconfirmed"
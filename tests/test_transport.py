@@ -0,0 +1,129 @@
+"""Tests for Kohler request policies."""
+
+from __future__ import annotations
+
+import socket
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.kohler import transport as transport_module
+from custom_components.kohler.const import DATA_PROBE_CACHE
+from custom_components.kohler.transport import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    AdaptiveTimeouts,
+    HostResolver,
+    RequestBudget,
+    async_cache_probe,
+    async_drop_request_budget,
+    async_get_probe,
+    async_get_request_budget,
+    decode_text_payload,
+)
+
+
+def test_adaptive_timeouts_track_each_endpoint():
+    """Each endpoint should get its own clamped timeout once it has samples."""
+    timeouts = AdaptiveTimeouts(floor=1.0, ceiling=10.0, multiplier=3.0, min_samples=5)
+
+    assert timeouts.timeout("values") == 10.0
+    for _ in range(5):
+        timeouts.record_success("values", 0.8)
+        timeouts.record_success("system_info", 0.05)
+
+    assert timeouts.timeout("values") == pytest.approx(2.4)
+    assert timeouts.timeout("system_info") == 1.0
+    assert timeouts.timeout("quick_shower") == 10.0
+
+
+def test_adaptive_timeouts_back_off_after_timeouts():
+    """Consecutive timeouts should widen the timeout until a success."""
+    timeouts = AdaptiveTimeouts(floor=1.0, ceiling=10.0, multiplier=3.0, min_samples=1)
+    timeouts.record_success("values", 1.0)
+
+    timeouts.record_timeout("values")
+    assert timeouts.timeout("values") == 6.0
+    timeouts.record_timeout("values")
+    assert timeouts.timeout("values") == 10.0
+
+    timeouts.record_success("values", 1.0)
+    assert timeouts.timeout("values") == 3.0
+
+
+@pytest.mark.asyncio
+async def test_request_budget_reserves_tokens_for_commands():
+    """Background requests should wait once only the reserve is left."""
+    budget = RequestBudget(rate=1000, burst=3, reserve=2)
+
+    await budget.async_acquire(PRIORITY_BACKGROUND)
+    assert not budget.try_acquire(PRIORITY_BACKGROUND)
+    assert budget.try_acquire(PRIORITY_COMMAND)
+
+    await budget.async_acquire(PRIORITY_BACKGROUND)
+
+    assert budget.granted == {PRIORITY_COMMAND: 1, PRIORITY_BACKGROUND: 2}
+    assert budget.throttled == {PRIORITY_COMMAND: 0, PRIORITY_BACKGROUND: 1}
+    assert budget.skipped == 1
+
+
+def test_request_budgets_are_shared_per_host_until_dropped():
+    """A host's budget should be shared and forgotten once it is dropped."""
+    hass = SimpleNamespace(data={})
+
+    budget = async_get_request_budget(hass, "10.0.0.2")
+    assert async_get_request_budget(hass, "10.0.0.2") is budget
+
+    async_drop_request_budget(hass, "10.0.0.2")
+    async_drop_request_budget(hass, "10.0.0.3")
+
+    assert async_get_request_budget(hass, "10.0.0.2") is not budget
+
+
+def test_caching_a_probe_prunes_expired_probes(monkeypatch):
+    """Probes past their TTL should be evicted when another is cached."""
+    hass = SimpleNamespace(data={})
+    now = 1000.0
+    monkeypatch.setattr(
+        transport_module, "time", SimpleNamespace(monotonic=lambda: now)
+    )
+    async_cache_probe(hass, "10.0.0.2", {"a": 1})
+
+    now += transport_module.PROBE_CACHE_TTL_SECONDS + 1
+    async_cache_probe(hass, "10.0.0.3", {"b": 2})
+
+    assert set(hass.data[DATA_PROBE_CACHE]) == {"10.0.0.3"}
+    assert async_get_probe(hass, "10.0.0.3", pop=True) == {"b": 2}
+    assert hass.data[DATA_PROBE_CACHE] == {}
+
+
+def test_decode_text_payload_parses_json_and_keeps_text():
+    """JSON-looking text should be parsed while plain text is returned as is."""
+    assert decode_text_payload(b' {"errors": []}') == {"errors": []}
+    assert decode_text_payload("[not json") == "[not json"
+    assert decode_text_payload("E12 valve fault") == "E12 valve fault"
+
+
+@pytest.mark.asyncio
+async def test_host_resolver_caches_and_survives_lookup_failures():
+    """Hostnames should be looked up once per TTL and keep the last good address."""
+    getaddrinfo = AsyncMock(
+        return_value=[(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.5", 0))]
+    )
+    hass = SimpleNamespace(loop=SimpleNamespace(getaddrinfo=getaddrinfo))
+    resolver = HostResolver(hass, "kohler.local", ttl=0)
+
+    assert await resolver.async_resolve() == "192.0.2.5"
+    getaddrinfo.side_effect = OSError("no DNS")
+    assert await resolver.async_resolve() == "192.0.2.5"
+    getaddrinfo.side_effect = UnicodeError("label too long")
+    assert await resolver.async_resolve() == "192.0.2.5"
+    getaddrinfo.side_effect = None
+    getaddrinfo.return_value = []
+    assert await resolver.async_resolve() == "192.0.2.5"
+    assert resolver.failures == 3
+
+    ip_resolver = HostResolver(hass, "192.0.2.9")
+    assert await ip_resolver.async_resolve() == "192.0.2.9"
+    assert getaddrinfo.await_count == 4
@@ -0,0 +1,70 @@
+"""Tests for learned shower usage patterns."""
+
+from datetime import datetime, timedelta
+
+from custom_components.kohler.usage import (
+    QUIET_INTERVAL_SECONDS,
+    UsageHistogram,
+    usage_slot,
+)
+
+MONDAY_7AM = datetime(2026, 3, 2, 7, 10)
+
+
+def _trained_histogram() -> UsageHistogram:
+    histogram = UsageHistogram()
+    histogram.since = MONDAY_7AM - timedelta(weeks=4)
+    for week in range(4):
+        histogram.record_start(MONDAY_7AM - timedelta(weeks=3 - week))
+    histogram.record_start(MONDAY_7AM + timedelta(hours=12))
+    return histogram
+
+
+def test_usage_slot_is_weekday_and_half_hour():
+    """Slots should split the week into half hours starting Monday."""
+    assert usage_slot(datetime(2026, 3, 2, 0, 0)) == 0
+    assert usage_slot(datetime(2026, 3, 2, 7, 45)) == 15
+    assert usage_slot(datetime(2026, 3, 8, 23, 59)) == 335
+
+
+def test_untrained_histogram_keeps_idle_interval():
+    """Predictions should wait for a week of history."""
+    histogram = UsageHistogram()
+    histogram.since = MONDAY_7AM - timedelta(days=2)
+    for _ in range(10):
+        histogram.record_start(MONDAY_7AM)
+
+    assert histogram.suggest_interval(MONDAY_7AM, 15, 5) == 15
+
+
+def test_likely_window_polls_ahead_at_active_interval():
+    """Polling should speed up in and just before a usual start time."""
+    histogram = _trained_histogram()
+    now = MONDAY_7AM + timedelta(weeks=1)
+
+    assert histogram.suggest_interval(now - timedelta(minutes=30), 15, 5) == 5
+    assert histogram.suggest_interval(now, 15, 5) == 5
+    assert histogram.likely_windows(now) == ["Mon 07:00"]
+
+
+def test_quiet_stretches_slow_polling():
+    """Nights without history and long absences should poll slowly."""
+    histogram = _trained_histogram()
+    night = datetime(2026, 3, 10, 3, 0)
+    vacation = MONDAY_7AM + timedelta(weeks=1, days=3)
+
+    assert histogram.suggest_interval(night, 15, 5) == QUIET_INTERVAL_SECONDS
+    assert histogram.suggest_interval(vacation, 15, 5) == QUIET_INTERVAL_SECONDS
+    assert histogram.suggest_interval(MONDAY_7AM + timedelta(hours=10), 15, 5) == 15
+
+
+def test_histogram_round_trips_through_storage():
+    """A saved histogram should restore its counts and timestamps."""
+    histogram = _trained_histogram()
+
+    restored = UsageHistogram.from_dict(histogram.as_dict())
+
+    assert restored.counts == histogram.counts
+    assert restored.starts == 5
+    assert restored.since == histogram.since
+    assert restored.last_start == histogram.last_start